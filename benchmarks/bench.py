@@ -0,0 +1,210 @@
+"""Benchmarks for wbkit hot paths.
+
+Usage:
+    python benchmarks/bench.py [--full] [--output results.json]
+                               [--baseline baseline.json] [--threshold 0.1]
+                               [--filter substring] [--repeat 5]
+
+Synthetic data is generated from fixed seed, so results are comparable
+between runs on the same machine. With --baseline, every case slower than
+baseline by more than threshold is reported and exit status is 1.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from array import array
+from pathlib import Path
+from typing import Callable, Iterator, NamedTuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from wbkit.basic import WBCalculator  # noqa: E402
+from wbkit.cglimits import CG, CGLimits  # noqa: E402
+from wbkit.occupancy import OccupancyGrid  # noqa: E402
+from wbkit.plfunc import PLFunction, interp  # noqa: E402
+
+QUICK_BREAKPOINTS = (4, 100, 10_000)
+QUICK_QUERIES = (1_000, 100_000)
+FULL_BREAKPOINTS = (4, 10, 100, 1_000, 10_000)
+FULL_QUERIES = (1_000, 100_000, 1_000_000, 10_000_000)
+MIN_WEIGHT = 10_000.0
+MAX_WEIGHT = 80_000.0
+
+
+class Case(NamedTuple):
+    name: str
+    ops: int
+    run: Callable[[], object]
+
+
+def make_line(n: int, rng: random.Random, offset: float) -> PLFunction:
+    """Make limit line with n breakpoints spanning whole weight range."""
+    inner = sorted(rng.uniform(MIN_WEIGHT, MAX_WEIGHT) for _ in range(n - 2))
+    xs = [MIN_WEIGHT, *inner, MAX_WEIGHT]
+    return PLFunction([(x, offset + rng.uniform(-5, 5)) for x in xs])
+
+
+def make_queries(q: int, rng: random.Random) -> array:
+    return array("d", (rng.uniform(MIN_WEIGHT, MAX_WEIGHT) for _ in range(q)))
+
+
+def make_values(q: int, rng: random.Random) -> array:
+    """Make CG values around, inside and outside of limits made by make_line."""
+    return array("d", (rng.uniform(10, 90) for _ in range(q)))
+
+
+def check_exact(limits: CGLimits, values: array, weights: array) -> list[bool]:
+    """Batched exact limits check, the baseline for OccupancyGrid."""
+    return [
+        r is not None and not (v < r[0] or v > r[1])
+        for v, r in zip(values, limits.limit_ranges(weights))
+    ]
+
+
+def cases(breakpoints: tuple[int, ...], queries: tuple[int, ...]) -> Iterator[Case]:
+    rng = random.Random(0)
+    calc = WBCalculator(13.2, 280, 50, 2.526, 12.542)
+    query_sets = {q: make_queries(q, rng) for q in queries}
+    value_sets = {q: make_values(q, rng) for q in queries}
+    for n in breakpoints:
+        fwd = make_line(n, rng, 20)
+        aft = make_line(n, rng, 80)
+        limits = CGLimits(fwd, aft)
+        xp, fp = fwd.xp, fwd.fp
+        yield Case(
+            f"PLFunction.intersects[n={n}]",
+            1,
+            lambda fwd=fwd, aft=aft: fwd.intersects(aft),
+        )
+        yield Case(
+            f"PLFunction.cut[n={n}]",
+            1,
+            lambda fwd=fwd: fwd.cut(MIN_WEIGHT + 1000, MAX_WEIGHT - 1000),
+        )
+        for q, ws in query_sets.items():
+            yield Case(
+                f"interp[n={n},q={q}]",
+                q,
+                lambda ws=ws, xp=xp, fp=fp: [interp(w, xp, fp) for w in ws],
+            )
+            yield Case(
+                f"PLFunction.__getitem__[n={n},q={q}]",
+                q,
+                lambda ws=ws, fwd=fwd: [fwd[w] for w in ws],
+            )
+            yield Case(
+                f"CGLimits.limit_range[n={n},q={q}]",
+                q,
+                lambda ws=ws, limits=limits: [limits.limit_range(w) for w in ws],
+            )
+            vs = value_sets[q]
+            yield Case(
+                f"CGLimits.__contains__[n={n},q={q}]",
+                q,
+                lambda ws=ws, vs=vs, limits=limits: [
+                    CG(v, w) in limits for v, w in zip(vs, ws)
+                ],
+            )
+            yield Case(
+                f"CGLimits.limit_ranges check[n={n},q={q}]",
+                q,
+                lambda ws=ws, vs=vs, limits=limits: check_exact(limits, vs, ws),
+            )
+            yield Case(
+                f"OccupancyGrid.contains_many[n={n},q={q}]",
+                q,
+                lambda ws=ws, vs=vs, grid=OccupancyGrid(limits): grid.contains_many(
+                    vs, ws
+                ),
+            )
+    for q, ws in query_sets.items():
+        yield Case(
+            f"WBCalculator.calc_idx[q={q}]",
+            q,
+            lambda ws=ws: [calc.calc_idx(w, 15.0) for w in ws],
+        )
+        yield Case(
+            f"WBCalculator.mac_to_idx[q={q}]",
+            q,
+            lambda ws=ws: [calc.mac_to_idx(25.0, w) for w in ws],
+        )
+        yield Case(
+            f"WBCalculator.mac_from_idx[q={q}]",
+            q,
+            lambda ws=ws: [calc.mac_from_idx(40.0, w) for w in ws],
+        )
+
+
+def measure(case: Case, repeat: int) -> dict:
+    """Run case `repeat` times and keep the best time."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        case.run()
+        best = min(best, time.perf_counter() - start)
+    return {"ops": case.ops, "best_s": best, "per_op_ns": best / case.ops * 1e9}
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Get descriptions of cases slower than baseline by more than threshold."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        ratio = result["per_op_ns"] / base["per_op_ns"]
+        if ratio > 1 + threshold:
+            regressions.append(f"{name}: {ratio:.2f}x baseline")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--full", action="store_true", help="run fleet-scale sizes")
+    parser.add_argument("--output", type=Path, help="write JSON results to file")
+    parser.add_argument("--baseline", type=Path, help="compare with JSON results")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    parser.add_argument("--filter", default="", help="run cases containing text")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    sizes = (
+        (FULL_BREAKPOINTS, FULL_QUERIES)
+        if args.full
+        else (QUICK_BREAKPOINTS, QUICK_QUERIES)
+    )
+    results = {}
+    for case in cases(*sizes):
+        if args.filter not in case.name:
+            continue
+        results[case.name] = measure(case, args.repeat)
+        print(f"{case.name:<55} {results[case.name]['per_op_ns']:>14.1f} ns/op")
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2))
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text())["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -24,5 +24,6 @@ setuptools.setup(
     package_dir={"": "src"},
     packages=setuptools.find_packages(where="src", exclude=["tests"]),
     package_data={"wbkit": ["py.typed"]},
+    entry_points={"console_scripts": ["wbkit = wbkit.cli:main"]},
     python_requires=">=3.10",
 )
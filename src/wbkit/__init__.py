@@ -1,5 +1,20 @@
 from wbkit.basic import WBCalculator
 from wbkit.cglimits import CG, CGLimits
-from wbkit.plfunc import PLFunction
+from wbkit.plfunc import (
+    FrozenPLFunction,
+    NearestTable,
+    PLFunction,
+    PLSurface,
+    SlopeTable,
+)
 
-__all__ = ["CG", "CGLimits", "PLFunction", "WBCalculator"]
+__all__ = [
+    "CG",
+    "CGLimits",
+    "FrozenPLFunction",
+    "NearestTable",
+    "PLFunction",
+    "PLSurface",
+    "SlopeTable",
+    "WBCalculator",
+]
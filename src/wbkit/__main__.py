@@ -0,0 +1,5 @@
+import sys
+
+from wbkit.cli import main
+
+sys.exit(main())
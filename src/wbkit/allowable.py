@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from itertools import chain
+from typing import Literal, NamedTuple, Sequence
+
+from wbkit.basic import WBCalculator
+from wbkit.cglimits import CG, CGLimits
+
+
+class AllowableLoad(NamedTuple):
+    weight: float
+    limit: Literal["fwd", "aft", "weight"]
+
+
+def _profile(
+    cg: CG, limits: CGLimits, max_weight: float | None
+) -> list[tuple[float, float, float]]:
+    """Get (weight, fwd, aft) triples at every limit breakpoint
+    between CG weight and maximum weight.
+
+    Args:
+        cg (CG): initial CG
+        limits (CGLimits): limits
+        max_weight (float | None): maximum weight
+
+    Raises:
+        ValueError: if initial CG is out of limits
+        ValueError: if initial CG weight exceeds maximum weight
+
+    Returns:
+        list[tuple[float, float, float]]: ascending by weight
+    """
+    if cg not in limits:
+        raise ValueError("initial CG is out of limits")
+    start = cg.weight
+    end = (
+        limits.max_weight if max_weight is None else min(max_weight, limits.max_weight)
+    )
+    if end < start:
+        raise ValueError("initial CG weight exceeds maximum weight")
+    fwd, aft = limits.fwd, limits.aft
+    weights = sorted(
+        {start, end, *(x for x in chain(fwd.xp, aft.xp) if start < x < end)}
+    )
+    return [(w, fwd[w], aft[w]) for w in weights]
+
+
+def _walk(
+    profile: list[tuple[float, float, float]], idx: float, arm: float
+) -> AllowableLoad:
+    """Follow straight CG path through limit profile until it leaves limits.
+
+    Args:
+        profile (list[tuple[float, float, float]]): see `_profile`
+        idx (float): initial index
+        arm (float): index change per unit of added weight
+
+    Returns:
+        AllowableLoad: allowable weight and binding limit
+    """
+    start, fwd, aft = profile[0]
+    prev_weight, prev_fwd_gap, prev_aft_gap = start, idx - fwd, aft - idx
+    for weight, fwd, aft in profile[1:]:
+        path_idx = idx + arm * (weight - start)
+        fwd_gap, aft_gap = path_idx - fwd, aft - path_idx
+        if fwd_gap < 0 or aft_gap < 0:
+            # gaps are linear between breakpoints, so crossing is exact
+            fwd_t = prev_fwd_gap / (prev_fwd_gap - fwd_gap) if fwd_gap < 0 else 1.0
+            aft_t = prev_aft_gap / (prev_aft_gap - aft_gap) if aft_gap < 0 else 1.0
+            crossing = prev_weight + min(fwd_t, aft_t) * (weight - prev_weight)
+            return AllowableLoad(crossing - start, "fwd" if fwd_t <= aft_t else "aft")
+        prev_weight, prev_fwd_gap, prev_aft_gap = weight, fwd_gap, aft_gap
+    return AllowableLoad(prev_weight - start, "weight")
+
+
+def allowable_loads(
+    cg: CG,
+    stations: Sequence[float],
+    calc: WBCalculator,
+    limits: CGLimits,
+    max_weight: float | None = None,
+) -> list[AllowableLoad]:
+    """Get maximum weight that can be added at each of given stations
+    without CG leaving limits. Weight is added at one station at a time.
+
+    Args:
+        cg (CG): initial CG
+        stations (Sequence[float]): stations
+        calc (WBCalculator): calculator used for index calculation
+        limits (CGLimits): limits
+        max_weight (float | None, optional): maximum weight (e.g. MTOW),
+        if lower than limits maximum weight. Defaults to None.
+
+    Raises:
+        ValueError: if initial CG is out of limits
+        ValueError: if initial CG weight exceeds maximum weight
+
+    Returns:
+        list[AllowableLoad]: allowable weight and binding limit for each station
+    """
+    profile = _profile(cg, limits, max_weight)
+    return [_walk(profile, cg.value, calc.calc_idx(1, st) - calc.k) for st in stations]
+
+
+def allowable_load(
+    cg: CG,
+    station: float,
+    calc: WBCalculator,
+    limits: CGLimits,
+    max_weight: float | None = None,
+) -> AllowableLoad:
+    """Get maximum weight that can be added at given station
+    without CG leaving limits.
+
+    Args:
+        cg (CG): initial CG
+        station (float): station
+        calc (WBCalculator): calculator used for index calculation
+        limits (CGLimits): limits
+        max_weight (float | None, optional): maximum weight (e.g. MTOW),
+        if lower than limits maximum weight. Defaults to None.
+
+    Raises:
+        ValueError: if initial CG is out of limits
+        ValueError: if initial CG weight exceeds maximum weight
+
+    Returns:
+        AllowableLoad: allowable weight and binding limit
+    """
+    return allowable_loads(cg, [station], calc, limits, max_weight)[0]
@@ -1,3 +1,6 @@
+from typing import Sequence
+
+
 class WBCalculator:
     def __init__(
         self, ref_st: float, c: int, k: int, macrc: float, lemac_at: float
@@ -79,12 +82,12 @@ class WBCalculator:
         """
         return self.to_idx(self.calc_moment(weight, station))
 
-    def mac_from_moment(self, moment: float, weight: int) -> float:
+    def mac_from_moment(self, moment: float, weight: float) -> float:
         """Get %MAC for given moment and weight.
 
         Args:
             moment (float): moment
-            weight (int): weight
+            weight (float): weight
 
         Returns:
             float: %MAC
@@ -94,38 +97,93 @@ class WBCalculator:
         except ZeroDivisionError:
             raise ValueError("weight must not be equal to 0")
 
-    def mac_to_moment(self, mac: float, weight: int) -> float:
+    def mac_to_moment(self, mac: float, weight: float) -> float:
         """Get moment for given %MAC and weight.
 
         Args:
             mac (float): %MAC
-            weight (int): weight
+            weight (float): weight
 
         Returns:
             float: moment
         """
         return ((mac * (self.macrc / 100)) - self.ref_st + self.lemac_at) * weight
 
-    def mac_from_idx(self, idx: float, weight: int) -> float:
+    def mac_from_idx(self, idx: float, weight: float) -> float:
         """Get %MAC for given index and weight.
 
         Args:
             idx (float): index
-            weight (int): weight
+            weight (float): weight
 
         Returns:
             float: %MAC
         """
         return self.mac_from_moment(self.to_moment(idx), weight)
 
-    def mac_to_idx(self, mac: float, weight: int) -> float:
+    def mac_to_idx(self, mac: float, weight: float) -> float:
         """Get index for given %MAC and weight.
 
         Args:
             mac (float): %MAC
-            weight (int): weight
+            weight (float): weight
 
         Returns:
             float: index
         """
         return self.to_idx(self.mac_to_moment(mac, weight))
+
+    def idx_sensitivity(self, station: float) -> float:
+        """Get index change per unit of weight added at given station.
+
+        Args:
+            station (float): station
+
+        Returns:
+            float: d index / d weight
+        """
+        return (station - self.ref_st) / self.c
+
+    def idx_sensitivities(self, stations: Sequence[float]) -> list[float]:
+        """Get index change per unit of weight added at each of given stations.
+
+        Args:
+            stations (Sequence[float]): stations
+
+        Returns:
+            list[float]: d index / d weight for each station
+        """
+        ref_st, c = self.ref_st, self.c
+        return [(station - ref_st) / c for station in stations]
+
+    def mac_sensitivity(self, weight: float) -> float:
+        """Get %MAC change per unit of index at given weight.
+
+        Args:
+            weight (float): weight
+
+        Raises:
+            ValueError: if weight is equal to 0
+
+        Returns:
+            float: d %MAC / d index
+        """
+        return self.mac_sensitivities([weight])[0]
+
+    def mac_sensitivities(self, weights: Sequence[float]) -> list[float]:
+        """Get %MAC change per unit of index at each of given weights.
+
+        Args:
+            weights (Sequence[float]): weights
+
+        Raises:
+            ValueError: if any weight is equal to 0
+
+        Returns:
+            list[float]: d %MAC / d index for each weight
+        """
+        scale = self.c / (self.macrc / 100)
+        try:
+            return [scale / weight for weight in weights]
+        except ZeroDivisionError:
+            raise ValueError("weight must not be equal to 0")
@@ -0,0 +1,370 @@
+"""Incrementally editable limit lines for envelope authoring.
+
+`PLFunctionBuilder` keeps breakpoints in sorted lists, so an edit finds
+its place with bisect instead of validating and sorting all points again
+like `PLFunction` does. `CGLimitsBuilder` tracks whether forward and aft
+lines overlap by rechecking only the segment changed by an edit. Both
+freeze into regular objects without any further validation.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from typing import Callable, Sequence
+
+from wbkit.cglimits import CGLimits
+from wbkit.plfunc import PLFunction, _validated_points, interp
+
+# listener(lower, upper, added, removed) is called after every edit,
+# line values changed only within [lower, upper]
+Listener = Callable[[float, float, "float | None", "float | None"], None]
+
+
+class PLFunctionBuilder:
+    """Mutable piecewise linear function.
+
+    Edits locate breakpoints with bisect. Points are kept in Python lists,
+    so inserting or deleting shifts list items, which is a fast memory move
+    even for large tables.
+    """
+
+    def __init__(self, points: Sequence[tuple[float, float]] = ()) -> None:
+        """Create PLFunctionBuilder object.
+
+        Args:
+            points (Sequence[tuple[float, float]], optional): initial
+            (x, f(x)) tuples. Defaults to ().
+
+        Raises:
+            ValueError: if points contain duplicate values for x
+        """
+        points = _validated_points(points) if points else ()
+        self._xs = [x for x, _ in points]
+        self._fs = [f for _, f in points]
+        self._sorted_fs = sorted(self._fs)
+        self._listeners: list[Listener] = []
+
+    @classmethod
+    def from_plfunction(cls, line: PLFunction) -> PLFunctionBuilder:
+        """Create builder with points of existing PLFunction.
+
+        Args:
+            line (PLFunction): line
+
+        Returns:
+            PLFunctionBuilder: builder
+        """
+        builder = cls()
+        builder._xs = list(line.xp)
+        builder._fs = list(line.fp)
+        builder._sorted_fs = sorted(builder._fs)
+        return builder
+
+    def subscribe(self, listener: Listener) -> None:
+        """Call `listener(lower, upper, added, removed)` after every edit.
+        Line values changed only within [lower, upper], `added` and `removed`
+        are x of added and removed breakpoints, if any.
+
+        Args:
+            listener (Listener): callback
+        """
+        self._listeners.append(listener)
+
+    def _notify(
+        self, lower: float, upper: float, added: float | None, removed: float | None
+    ) -> None:
+        for listener in self._listeners:
+            listener(lower, upper, added, removed)
+
+    def _span(self, pos: int) -> tuple[float, float]:
+        """x range of segments adjacent to breakpoint at `pos`."""
+        xs = self._xs
+        return xs[max(pos - 1, 0)], xs[min(pos + 1, len(xs) - 1)]
+
+    def _index(self, x: float) -> int:
+        pos = bisect_left(self._xs, x)
+        if pos == len(self._xs) or self._xs[pos] != x:
+            raise KeyError(f"no breakpoint at x = {x}")
+        return pos
+
+    def insert(self, x: float, f: float) -> None:
+        """Add breakpoint.
+
+        Args:
+            x (float): x value
+            f (float): f(x) value
+
+        Raises:
+            ValueError: if there is a breakpoint at x already
+        """
+        pos = bisect_left(self._xs, x)
+        if pos < len(self._xs) and self._xs[pos] == x:
+            raise ValueError("duplicate x values are not allowed.")
+        self._xs.insert(pos, x)
+        self._fs.insert(pos, f)
+        insort(self._sorted_fs, f)
+        self._notify(*self._span(pos), x, None)
+
+    def delete(self, x: float) -> float:
+        """Remove breakpoint.
+
+        Args:
+            x (float): x value of breakpoint
+
+        Raises:
+            KeyError: if there is no breakpoint at x
+
+        Returns:
+            float: f(x) of removed breakpoint
+        """
+        pos = self._index(x)
+        lower, upper = self._span(pos)
+        del self._xs[pos]
+        f = self._fs.pop(pos)
+        del self._sorted_fs[bisect_left(self._sorted_fs, f)]
+        self._notify(lower, upper, None, x)
+        return f
+
+    def update(self, x: float, f: float) -> None:
+        """Change f(x) of breakpoint.
+
+        Args:
+            x (float): x value of breakpoint
+            f (float): new f(x) value
+
+        Raises:
+            KeyError: if there is no breakpoint at x
+        """
+        pos = self._index(x)
+        del self._sorted_fs[bisect_left(self._sorted_fs, self._fs[pos])]
+        insort(self._sorted_fs, f)
+        self._fs[pos] = f
+        self._notify(*self._span(pos), None, None)
+
+    def move(self, x: float, new_x: float, new_f: float | None = None) -> None:
+        """Move breakpoint, possibly past its neighbours.
+
+        Args:
+            x (float): x value of breakpoint
+            new_x (float): new x value
+            new_f (float | None, optional): new f(x) value. Defaults to None,
+            which keeps f(x).
+
+        Raises:
+            KeyError: if there is no breakpoint at x
+            ValueError: if there is another breakpoint at new x
+        """
+        self._index(x)
+        if new_x != x:
+            other = bisect_left(self._xs, new_x)
+            if other < len(self._xs) and self._xs[other] == new_x:
+                raise ValueError("duplicate x values are not allowed.")
+        f = self.delete(x)
+        self.insert(new_x, f if new_f is None else new_f)
+
+    def __len__(self) -> int:
+        return len(self._xs)
+
+    @property
+    def points(self) -> tuple[tuple[float, float], ...]:
+        """Tuple of (x, f(x)) points.
+
+        Returns:
+            tuple[tuple[float, float], ...]: all points
+        """
+        return tuple(zip(self._xs, self._fs))
+
+    @property
+    def min_x(self) -> float:
+        """Minimum x value.
+
+        Returns:
+            float: minimum x
+        """
+        return self._xs[0]
+
+    @property
+    def max_x(self) -> float:
+        """Maximum x value.
+
+        Returns:
+            float: maximum x
+        """
+        return self._xs[-1]
+
+    @property
+    def min_f(self) -> float:
+        """Minimum f(x) value.
+
+        Returns:
+            float: minimum f(x)
+        """
+        return self._sorted_fs[0]
+
+    @property
+    def max_f(self) -> float:
+        """Maximum f(x) value.
+
+        Returns:
+            float: maximum f(x)
+        """
+        return self._sorted_fs[-1]
+
+    def __contains__(self, x: float) -> bool:
+        return bool(self._xs) and self._xs[0] <= x <= self._xs[-1]
+
+    def __getitem__(self, x: float) -> float:
+        """Get interpolated f(x) of current points.
+
+        Args:
+            x (float): x value
+
+        Raises:
+            KeyError: if x is outside of x range
+
+        Returns:
+            float: interpolated f(x)
+        """
+        if x not in self:
+            raise KeyError(f"x should be in range {self.min_x} - {self.max_x}")
+        return interp(x, self._xs, self._fs)
+
+    def freeze(self) -> PLFunction:
+        """Get PLFunction with current points, without validating them again.
+
+        Raises:
+            ValueError: if there are no points
+
+        Returns:
+            PLFunction: PLFunction
+        """
+        if not self._xs:
+            raise ValueError("at least one point is required.")
+        return PLFunction._trusted(
+            tuple(self._xs), tuple(self._fs), self.min_f, self.max_f
+        )
+
+
+class CGLimitsBuilder:
+    """Mutable CG limits for interactive editing.
+
+    Edit lines through `fwd` and `aft` builders. Validity is kept up to date
+    by rechecking only breakpoints within the edited segment: limits are
+    valid when both lines have the same weight range and forward line is
+    not after aft line at any breakpoint of either line.
+    """
+
+    def __init__(self, fwd: PLFunctionBuilder, aft: PLFunctionBuilder) -> None:
+        """Create CGLimitsBuilder object.
+
+        Args:
+            fwd (PLFunctionBuilder): forward CG limit line
+            aft (PLFunctionBuilder): aft CG limit line
+        """
+        self.fwd = fwd
+        self.aft = aft
+        # breakpoint x of either line -> number of lines having it
+        self._weights: list[float] = []
+        self._counts: dict[float, int] = {}
+        # breakpoints where lines overlap or only one line is defined
+        self._bad: set[float] = set()
+        for x in (*fwd._xs, *aft._xs):
+            self._add_weight(x)
+        self._recheck(self._weights)
+        fwd.subscribe(self._changed)
+        aft.subscribe(self._changed)
+
+    @classmethod
+    def from_cglimits(cls, limits: CGLimits) -> CGLimitsBuilder:
+        """Create builder with lines of existing CGLimits.
+
+        Args:
+            limits (CGLimits): limits
+
+        Returns:
+            CGLimitsBuilder: builder
+        """
+        return cls(
+            PLFunctionBuilder.from_plfunction(limits.fwd),
+            PLFunctionBuilder.from_plfunction(limits.aft),
+        )
+
+    def _add_weight(self, x: float) -> None:
+        if x in self._counts:
+            self._counts[x] += 1
+        else:
+            self._counts[x] = 1
+            insort(self._weights, x)
+
+    def _remove_weight(self, x: float) -> None:
+        self._counts[x] -= 1
+        if not self._counts[x]:
+            del self._counts[x]
+            del self._weights[bisect_left(self._weights, x)]
+            self._bad.discard(x)
+
+    def _recheck(self, weights: Sequence[float]) -> None:
+        fwd, aft, bad = self.fwd, self.aft, self._bad
+        for x in weights:
+            if x in fwd and x in aft and fwd[x] <= aft[x]:
+                bad.discard(x)
+            else:
+                bad.add(x)
+
+    def _changed(
+        self, lower: float, upper: float, added: float | None, removed: float | None
+    ) -> None:
+        if added is not None:
+            self._add_weight(added)
+        if removed is not None:
+            self._remove_weight(removed)
+        weights = self._weights
+        self._recheck(
+            weights[bisect_left(weights, lower) : bisect_right(weights, upper)]
+        )
+
+    @property
+    def overlap(self) -> tuple[float, ...]:
+        """Weights of breakpoints where lines overlap or only one line
+        is defined.
+
+        Returns:
+            tuple[float, ...]: ascending weights, empty for valid limits
+        """
+        return tuple(sorted(self._bad))
+
+    def _same_range(self) -> bool:
+        fwd, aft = self.fwd, self.aft
+        return (
+            len(fwd) > 0
+            and len(aft) > 0
+            and fwd.min_x == aft.min_x
+            and fwd.max_x == aft.max_x
+        )
+
+    @property
+    def valid(self) -> bool:
+        """Whether current lines form valid CGLimits.
+
+        Returns:
+            bool: True if lines are valid
+        """
+        return not self._bad and self._same_range()
+
+    def freeze(self) -> CGLimits:
+        """Get CGLimits with current lines, without validating them again.
+
+        Raises:
+            ValueError: if forward and aft lines have different min and max x
+            ValueError: if lines overlap
+
+        Returns:
+            CGLimits: CGLimits object
+        """
+        if not self._same_range():
+            raise ValueError(
+                "fwd_line and aft_line min and max weights should be equal"
+            )
+        if self._bad:
+            raise ValueError("fwd_line and aft_line should not overlap")
+        return CGLimits._trusted(self.fwd.freeze(), self.aft.freeze())
@@ -0,0 +1,120 @@
+"""Cache of envelopes cut to per-flight weight limits.
+
+Flights of a fleet use only a few distinct combinations of operational
+weight limits, so cut envelopes are cached by envelope identity and
+effective weight range. Lines of a valid envelope cut to a narrower
+range are valid too, so cached envelopes are built without validation,
+and their breakpoints are the same tuple objects as in the parent lines.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from threading import Lock
+from typing import NamedTuple
+
+from wbkit.cglimits import CGLimits
+from wbkit.instrument import CACHE_HIT, CACHE_MISS, record_event
+
+# `min` and `max` are parameter names of `CutCache.cut`, as in `cut_weight_range`
+_min, _max = min, max
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+
+class CutCache:
+    """Size-bounded LRU cache of `CGLimits.cut_weight_range` results."""
+
+    def __init__(self, max_size: int = 256) -> None:
+        """Create CutCache object.
+
+        Args:
+            max_size (int, optional): maximum number of cached envelopes.
+            Defaults to 256.
+
+        Raises:
+            ValueError: if max size is not > 0
+        """
+        if not max_size > 0:
+            raise ValueError("max size must be > 0")
+        self.max_size = max_size
+        self._lock = Lock()
+        # values keep parent envelope alive, so its id is not reused
+        self._cache: OrderedDict[
+            tuple[int, float, float], tuple[CGLimits, CGLimits]
+        ] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def cut(
+        self, limits: CGLimits, min: float | None = None, max: float | None = None
+    ) -> CGLimits:
+        """Get limits with weight range cut to min and max, same as
+        `limits.cut_weight_range(min, max)`.
+
+        Args:
+            limits (CGLimits): envelope
+            min (float | None, optional): minimum weight. Defaults to None.
+            max (float | None, optional): maximum weight. Defaults to None.
+
+        Raises:
+            ValueError: if cutting range bounds are equal or in reverse order
+
+        Returns:
+            CGLimits: cut envelope, shared between callers
+        """
+        # same bounds as PLFunction.cut, so equivalent requests share entry
+        lower = limits.min_weight if min is None else _max(min, limits.min_weight)
+        upper = limits.max_weight if max is None else _min(max, limits.max_weight)
+        key = (id(limits), lower, upper)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+        if entry is not None:
+            record_event(limits, CACHE_HIT)
+            return entry[1]
+        record_event(limits, CACHE_MISS)
+        if lower == limits.min_weight and upper == limits.max_weight:
+            cut = limits
+        else:
+            cut = CGLimits._trusted(
+                limits.fwd.cut(lower, upper), limits.aft.cut(lower, upper)
+            )
+        with self._lock:
+            self._misses += 1
+            self._cache[key] = limits, cut
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+                self._evictions += 1
+        return cut
+
+    def clear(self) -> None:
+        """Drop all cached envelopes. Statistics are kept."""
+        with self._lock:
+            self._evictions += len(self._cache)
+            self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @property
+    def stats(self) -> CacheStats:
+        """Cache statistics.
+
+        Returns:
+            CacheStats: hit, miss and eviction counts and number of
+            cached envelopes
+        """
+        with self._lock:
+            return CacheStats(
+                self._hits, self._misses, self._evictions, len(self._cache)
+            )
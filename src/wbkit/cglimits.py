@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from typing import NamedTuple
+from itertools import chain, pairwise
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Sequence
 
-from wbkit.plfunc import PLFunction
+from wbkit.plfunc import PLCursor, PLFunction, _record_out_of_range, interp
 
 
 class CG(NamedTuple):
@@ -45,6 +46,97 @@ class CG(NamedTuple):
         return self.__limits.cg_exceeds_aft(self)
 
 
+def _combine(
+    f: PLFunction,
+    g: PLFunction,
+    lower: float,
+    upper: float,
+    pick: Callable[[float, float], float],
+) -> PLFunction:
+    """Pointwise max or min of two lines on [lower, upper], with points
+    inserted where lines cross.
+
+    Args:
+        f (PLFunction): first line
+        g (PLFunction): second line
+        lower (float): lower x bound, within both lines
+        upper (float): upper x bound, within both lines
+        pick (Callable[[float, float], float]): max or min
+
+    Returns:
+        PLFunction: combined line
+    """
+    xs = sorted({lower, upper, *(x for x in chain(f.xp, g.xp) if lower < x < upper)})
+    points = []
+    for x1, x2 in pairwise(xs):
+        d1, d2 = f[x1] - g[x1], f[x2] - g[x2]
+        points.append((x1, pick(f[x1], g[x1])))
+        if d1 * d2 < 0:
+            x = x1 + (x2 - x1) * (d1 / (d1 - d2))
+            if x1 < x < x2:
+                points.append((x, f[x]))
+    points.append((xs[-1], pick(f[xs[-1]], g[xs[-1]])))
+    return PLFunction(points)
+
+
+def _below(fwd: PLFunction, aft: PLFunction) -> PLFunction:
+    """Lower forward line ends which rounding of computed crossing
+    weights has put after aft line.
+
+    Args:
+        fwd (PLFunction): forward CG limit line
+        aft (PLFunction): aft CG limit line, same weight range as fwd
+
+    Returns:
+        PLFunction: forward line with ends not after aft line
+    """
+    points = list(fwd.points)
+    for i in (0, -1):
+        x, f = points[i]
+        if f > aft[x]:
+            points[i] = x, aft[x]
+    return PLFunction(points)
+
+
+def _feasible_range(fwd: PLFunction, aft: PLFunction) -> tuple[float, float]:
+    """Weight range where fwd line is not after aft line.
+
+    Args:
+        fwd (PLFunction): forward CG limit line
+        aft (PLFunction): aft CG limit line, same weight range as fwd
+
+    Raises:
+        ValueError: if fwd line is after aft line at every weight
+        ValueError: if such weights do not form a single range
+
+    Returns:
+        tuple[float, float]: min and max weight
+    """
+    xs = sorted({*fwd.xp, *aft.xp})
+    runs: list[list[float]] = []
+    prev: tuple[float, float] | None = None
+    for x in xs:
+        d = aft[x] - fwd[x]
+        if prev is not None and prev[1] * d < 0:
+            px, pd = prev
+            cross = px + (x - px) * (pd / (pd - d))
+            if d > 0:
+                runs.append([cross, x])
+            else:
+                runs[-1][1] = cross
+        elif d >= 0:
+            if prev is not None and prev[1] >= 0:
+                runs[-1][1] = x
+            else:
+                runs.append([x, x])
+        prev = x, d
+    if not runs:
+        raise ValueError("envelopes have no common CG range")
+    if len(runs) > 1:
+        raise ValueError("common CG range of envelopes is not a single weight range")
+    return runs[0][0], runs[0][1]
+
+
 class CGLimits:
     def __init__(self, fwd_line: PLFunction, aft_line: PLFunction):
         """Create new CGLimits object.
@@ -55,20 +147,43 @@ class CGLimits:
 
         Raises:
             ValueError: if forward and aft lines have different min and max x
-            ValueError: if lines overlap
+            ValueError: if lines overlap, lines that only touch are allowed
             ValueError: if lines are passed in wrong order
         """
         if not (fwd_line.min_x == aft_line.min_x and fwd_line.max_x == aft_line.max_x):
             raise ValueError(
                 "fwd_line and aft_line min and max weights should be equal"
             )
-        if fwd_line.intersects(aft_line):
+        # lines may touch, but forward line must not be after aft line
+        gaps = [aft_line[x] - fwd_line[x] for x in {*fwd_line.xp, *aft_line.xp}]
+        if min(gaps) < 0:
+            if max(gaps) < 0:
+                raise ValueError("make sure order of lines is fwd, aft")
             raise ValueError("fwd_line and aft_line should not overlap")
-        if fwd_line.min_f > aft_line.min_f and fwd_line.max_f > aft_line.max_f:
-            raise ValueError("make sure order of lines is fwd, aft")
         self.fwd = fwd_line
         self.aft = aft_line
 
+    @classmethod
+    def _trusted(cls, fwd_line: PLFunction, aft_line: PLFunction) -> CGLimits:
+        """Create CGLimits object from lines known to be valid
+        without checking them again.
+
+        Args:
+            fwd_line (PLFunction): forward CG limit line
+            aft_line (PLFunction): aft CG limit line
+
+        Returns:
+            CGLimits: CGLimits object
+        """
+        limits = cls.__new__(cls)
+        limits.fwd = fwd_line
+        limits.aft = aft_line
+        return limits
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickle as fwd and aft lines only, restored without validation."""
+        return type(self)._trusted, (self.fwd, self.aft)
+
     @property
     def min_weight(self) -> float:
         """Minimum weight.
@@ -105,6 +220,58 @@ class CGLimits:
         new_aft = self.aft.cut(min, max)
         return CGLimits(new_fwd, new_aft)
 
+    def freeze(self) -> CGLimits:
+        """Get CGLimits object with both lines frozen, safe to share
+        between threads. See FrozenPLFunction.
+
+        Returns:
+            CGLimits: CGLimits object with FrozenPLFunction lines
+        """
+        return CGLimits._trusted(self.fwd.freeze(), self.aft.freeze())
+
+    def intersect(self, *others: CGLimits) -> CGLimits:
+        """Get the most restrictive limits satisfying this and all other limits:
+        common weight range, maximum of forward lines and minimum of aft
+        lines. CG is in resulting limits if it is in all of them.
+
+        Args:
+            *others (CGLimits): other limits
+
+        Raises:
+            ValueError: if limits have no common weight range
+            ValueError: if limits have no common CG range
+            ValueError: if common CG range is not a single weight range
+
+        Returns:
+            CGLimits: intersection of limits
+        """
+        if not others:
+            return self
+        all_limits = (self, *others)
+        lower = max(lim.min_weight for lim in all_limits)
+        upper = min(lim.max_weight for lim in all_limits)
+        if lower > upper:
+            raise ValueError("envelopes have no common weight range")
+        fwd, aft = self.fwd, self.aft
+        for other in others:
+            fwd = _combine(fwd, other.fwd, lower, upper, max)
+            aft = _combine(aft, other.aft, lower, upper, min)
+        lower, upper = _feasible_range(fwd, aft)
+        if lower == upper:
+            fwd = PLFunction([(lower, fwd[lower])])
+            aft = PLFunction([(lower, aft[lower])])
+        else:
+            fwd, aft = fwd.cut(lower, upper), aft.cut(lower, upper)
+        return CGLimits(_below(fwd, aft), aft)
+
+    def cursor(self) -> CGLimitsCursor:
+        """Get cursor for checking weights coming in sorted order.
+
+        Returns:
+            CGLimitsCursor: cursor over these limits
+        """
+        return CGLimitsCursor(self)
+
     def limit_range(self, for_weight: float) -> tuple[float, float] | None:
         """Get tuple containing forward and aft CG limits for given weight.
         If weight is outside of defined weight range – None is returned.
@@ -115,12 +282,39 @@ class CGLimits:
         Returns:
             tuple[float, float] | None: fwd, aft limits tuple or None
         """
-        try:
-            fwd, aft = self.fwd[for_weight], self.aft[for_weight]
-        except KeyError:
+        fwd, aft = self.fwd.get(for_weight), self.aft.get(for_weight)
+        if fwd is None or aft is None:
+            _record_out_of_range(self)
             return None
         return fwd, aft
 
+    def limit_ranges(
+        self, weights: Sequence[float]
+    ) -> list[tuple[float, float] | None]:
+        """Get forward and aft CG limits for each of given weights.
+        Same as calling `limit_range` for each weight, without
+        per-call overhead.
+
+        Args:
+            weights (Sequence[float]): weights
+
+        Returns:
+            list[tuple[float, float] | None]: fwd, aft limits tuple or None
+            for each weight
+        """
+        fwd_xp, fwd_fp = self.fwd.xp, self.fwd.fp
+        aft_xp, aft_fp = self.aft.xp, self.aft.fp
+        lower, upper = self.min_weight, self.max_weight
+        ranges = [
+            (interp(w, fwd_xp, fwd_fp), interp(w, aft_xp, aft_fp))
+            if lower <= w <= upper
+            else None
+            for w in weights
+        ]
+        for _ in range(ranges.count(None)):
+            _record_out_of_range(self)
+        return ranges
+
     def __contains__(self, cg: CG) -> bool:
         """Check if CG object is in limits. CG object with weight outside of defined
         weight range is considered to be out of limits.
@@ -198,3 +392,64 @@ class CGLimits:
             True if does. None if weight is out of range.
         """
         return self.exceeds_aft(cg.value, cg.weight)
+
+
+class CGLimitsCursor:
+    """Stateful CGLimits evaluator for weights coming in sorted order,
+    such as fuel burn or loading sequence checks. See PLCursor.
+    Cursor is not thread safe.
+    """
+
+    def __init__(self, limits: CGLimits) -> None:
+        """Create CGLimitsCursor object.
+
+        Args:
+            limits (CGLimits): limits to evaluate
+        """
+        self.limits = limits
+        self._fwd = PLCursor(limits.fwd)
+        self._aft = PLCursor(limits.aft)
+
+    def limit_range(self, for_weight: float) -> tuple[float, float] | None:
+        """Same as CGLimits.limit_range.
+
+        Args:
+            for_weight (float): weight
+
+        Returns:
+            tuple[float, float] | None: fwd, aft limits tuple or None
+        """
+        fwd, aft = self._fwd.get(for_weight), self._aft.get(for_weight)
+        if fwd is None or aft is None:
+            return None
+        return fwd, aft
+
+    def limit_ranges(
+        self, weights: Iterable[float]
+    ) -> Iterator[tuple[float, float] | None]:
+        """Lazily get forward and aft CG limits for each of given weights.
+
+        Args:
+            weights (Iterable[float]): weights, preferably sorted
+
+        Yields:
+            Iterator[tuple[float, float] | None]: fwd, aft limits tuple
+            or None for each weight
+        """
+        for weight in weights:
+            yield self.limit_range(weight)
+
+    def __contains__(self, cg: CG) -> bool:
+        """Same as `cg in CGLimits`.
+
+        Args:
+            cg (CG): CG object
+
+        Returns:
+            bool: True if CG object is in limits, False otherwise
+        """
+        limits = self.limit_range(cg.weight)
+        if limits is None:
+            return False
+        fwd, aft = limits
+        return not (cg.value < fwd or cg.value > aft)
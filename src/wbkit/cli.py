@@ -0,0 +1,242 @@
+"""wbkit command line interface."""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import IO, Any, Iterable, Iterator, Sequence
+
+from wbkit.library import Envelope, check_records, json_safe, load_library
+
+FORMATS = ("csv", "ndjson")
+
+_worker_envelopes: dict[str, Envelope] = {}
+
+
+def read_records(fh: IO[str], fmt: str) -> Iterator[dict[str, Any]]:
+    """Lazily read records from CSV or NDJSON stream.
+
+    NDJSON lines that are not valid JSON or not JSON objects are read
+    as `{"record": <line or value>}`, so that they get "error" verdict
+    instead of aborting the run. CSV fields beyond the header are dropped.
+
+    Args:
+        fh (IO[str]): input stream
+        fmt (str): "csv" or "ndjson"
+
+    Yields:
+        Iterator[dict[str, Any]]: records
+    """
+    if fmt == "csv":
+        for row in csv.DictReader(fh):
+            row.pop(None, None)
+            yield row
+    else:
+        for line in fh:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = {"record": line.rstrip("\r\n")}
+            if not isinstance(record, dict):
+                record = {"record": record}
+            yield record
+
+
+def chunked(
+    records: Iterable[dict[str, Any]], size: int
+) -> Iterator[list[dict[str, Any]]]:
+    """Split records into lists of at most `size` items.
+
+    Args:
+        records (Iterable[dict[str, Any]]): records
+        size (int): chunk size
+
+    Yields:
+        Iterator[list[dict[str, Any]]]: chunks
+    """
+    it = iter(records)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def _init_worker(library: str) -> None:
+    global _worker_envelopes
+    _worker_envelopes = load_library(library)
+
+
+def _check_in_worker(records: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return check_records(records, _worker_envelopes)
+
+
+def check_stream(
+    chunks: Iterable[list[dict[str, Any]]], library: str, workers: int = 1
+) -> Iterator[list[dict[str, Any]]]:
+    """Check chunks of records, keeping input order.
+
+    With multiple workers at most two chunks per worker are in flight,
+    so memory use does not depend on input size.
+
+    Args:
+        chunks (Iterable[list[dict[str, Any]]]): chunks of records
+        library (str): path to library file
+        workers (int, optional): number of processes. Defaults to 1.
+
+    Yields:
+        Iterator[list[dict[str, Any]]]: checked chunks
+    """
+    if workers <= 1:
+        envelopes = load_library(library)
+        for chunk in chunks:
+            yield check_records(chunk, envelopes)
+        return
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(library,)
+    ) as pool:
+        pending: deque[Future[list[dict[str, Any]]]] = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_check_in_worker, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def write_records(fh: IO[str], chunks: Iterable[list[dict[str, Any]]], fmt: str) -> int:
+    """Write checked records as they come.
+
+    Args:
+        fh (IO[str]): output stream
+        chunks (Iterable[list[dict[str, Any]]]): checked chunks
+        fmt (str): "csv" or "ndjson"
+
+    Returns:
+        int: number of records written
+    """
+    count = 0
+    writer: csv.DictWriter | None = None
+    for chunk in chunks:
+        for record in chunk:
+            if fmt == "csv":
+                if writer is None:
+                    writer = csv.DictWriter(
+                        fh, fieldnames=list(record), extrasaction="ignore"
+                    )
+                    writer.writeheader()
+                writer.writerow(
+                    {
+                        **record,
+                        "margin": "" if record["margin"] is None else record["margin"],
+                    }
+                )
+            else:
+                try:
+                    line = json.dumps(record, allow_nan=False)
+                except ValueError:
+                    line = json.dumps(json_safe(record))
+                fh.write(line + "\n")
+            count += 1
+    return count
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be > 0, got {value}")
+    return number
+
+
+def _non_negative_float(value: str) -> float:
+    number = float(value)
+    if not number >= 0:
+        raise argparse.ArgumentTypeError(f"must be >= 0, got {value}")
+    return number
+
+
+def _guess_format(path: str) -> str:
+    return "ndjson" if path.endswith((".ndjson", ".jsonl", ".json")) else "csv"
+
+
+def _check(args: argparse.Namespace) -> int:
+    fmt = args.format or _guess_format(args.input)
+    src = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    dst = (
+        sys.stdout
+        if args.output == "-"
+        else open(args.output, "w", encoding="utf-8", newline="")
+    )
+    try:
+        chunks = chunked(read_records(src, fmt), args.chunk_size)
+        write_records(dst, check_stream(chunks, args.library, args.workers), fmt)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+    return 0
+
+
+def _serve(args: argparse.Namespace) -> int:
+    import asyncio
+
+    from wbkit.server import serve
+
+    try:
+        asyncio.run(
+            serve(
+                load_library(args.library),
+                args.host,
+                args.port,
+                args.unix,
+                args.max_batch_size,
+                args.max_wait,
+                args.max_pending,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="wbkit")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    check = commands.add_parser(
+        "check", help="check CSV/NDJSON load records against envelope library"
+    )
+    check.add_argument("library", help="JSON envelope library file")
+    check.add_argument("input", nargs="?", default="-", help="input file or -")
+    check.add_argument("-o", "--output", default="-", help="output file or -")
+    check.add_argument("-f", "--format", choices=FORMATS, help="input format")
+    check.add_argument("--chunk-size", type=_positive_int, default=10_000)
+    check.add_argument("--workers", type=_positive_int, default=1)
+    check.set_defaults(func=_check)
+
+    serve = commands.add_parser(
+        "serve", help="run JSON lines check service over TCP or Unix socket"
+    )
+    serve.add_argument("library", help="JSON envelope library file")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--unix", help="Unix socket path, used instead of TCP")
+    serve.add_argument("--max-batch-size", type=_positive_int, default=64)
+    serve.add_argument("--max-wait", type=_non_negative_float, default=0.001)
+    serve.add_argument("--max-pending", type=_positive_int, default=256)
+    serve.set_defaults(func=_serve)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""Conversion of limit lines and envelopes between index and %MAC.
+
+Converted lines keep every original breakpoint and get extra breakpoints
+wherever the converted curve deviates from a straight line by more
+than given tolerance.
+"""
+from __future__ import annotations
+
+from itertools import pairwise
+from math import ceil, sqrt
+from typing import Callable
+
+from wbkit.basic import WBCalculator
+from wbkit.cglimits import CGLimits
+from wbkit.plfunc import PLFunction
+
+
+def _pieces(length: float, curvature: float, tol: float) -> int:
+    """Get number of equal pieces a curve segment has to be split into
+    for linear interpolation error to stay within tolerance.
+
+    Args:
+        length (float): segment length along x
+        curvature (float): maximum absolute second derivative on segment
+        tol (float): tolerance
+
+    Returns:
+        int: number of pieces
+    """
+    return max(1, ceil(length * sqrt(curvature / (8 * tol))))
+
+
+def _split(
+    x1: float,
+    x2: float,
+    y1: float,
+    slope: float,
+    curvature: Callable[[float, float, float], float],
+    tol: float,
+) -> list[float]:
+    """Get x values to insert between x1 and x2.
+
+    Segment is halved until every piece satisfies the error bound,
+    so points concentrate where the converted curve bends most.
+
+    Args:
+        x1 (float): segment start
+        x2 (float): segment end
+        y1 (float): source line value at x1
+        slope (float): source line slope
+        curvature (Callable[[float, float, float], float]): maximum absolute
+        second derivative of converted curve on a piece starting at (x, y)
+        with given slope
+        tol (float): tolerance
+
+    Returns:
+        list[float]: ascending x values strictly between x1 and x2
+    """
+    if _pieces(x2 - x1, curvature(x1, y1, slope), tol) == 1:
+        return []
+    mid = (x1 + x2) / 2
+    y_mid = y1 + slope * (mid - x1)
+    return [
+        *_split(x1, mid, y1, slope, curvature, tol),
+        mid,
+        *_split(mid, x2, y_mid, slope, curvature, tol),
+    ]
+
+
+def _resample(
+    line: PLFunction,
+    convert: Callable[[float, float], float],
+    curvature: Callable[[float, float, float], float],
+    tol: float,
+) -> PLFunction:
+    """Build converted PLFunction.
+
+    Args:
+        line (PLFunction): source line
+        convert (Callable[[float, float], float]): (value, weight) -> new value
+        curvature (Callable[[float, float, float], float]): see `_split`
+        tol (float): tolerance
+
+    Raises:
+        ValueError: if tolerance is not > 0
+
+    Returns:
+        PLFunction: converted line
+    """
+    if not tol > 0:
+        raise ValueError("tolerance must be > 0")
+    x0, y0 = line.points[0]
+    points = [(x0, convert(y0, x0))]
+    for (x1, y1), (x2, y2) in pairwise(line.points):
+        slope = (y2 - y1) / (x2 - x1)
+        for x in _split(x1, x2, y1, slope, curvature, tol):
+            points.append((x, convert(y1 + slope * (x - x1), x)))
+        points.append((x2, convert(y2, x2)))
+    return PLFunction(points)
+
+
+def line_mac_to_idx(
+    line: PLFunction, calc: WBCalculator, tol: float = 1e-3
+) -> PLFunction:
+    """Convert weight / %MAC line to weight / index line.
+
+    Args:
+        line (PLFunction): line with weight as x and %MAC as f(x)
+        calc (WBCalculator): calculator used for conversion
+        tol (float, optional): maximum index deviation. Defaults to 1e-3.
+
+    Raises:
+        ValueError: if tolerance is not > 0
+
+    Returns:
+        PLFunction: line with weight as x and index as f(x)
+    """
+    # idx(w) = (macrc / 100 * mac(w) + lemac_at - ref_st) * w / c + k,
+    # with mac(w) linear on segment, idx''(w) = 2 * macrc / 100 * slope / c
+    scale = calc.macrc / 100 / calc.c
+
+    def curvature(x: float, y: float, slope: float) -> float:
+        return abs(2 * scale * slope)
+
+    return _resample(line, calc.mac_to_idx, curvature, tol)
+
+
+def line_idx_to_mac(
+    line: PLFunction, calc: WBCalculator, tol: float = 1e-3
+) -> PLFunction:
+    """Convert weight / index line to weight / %MAC line.
+
+    Args:
+        line (PLFunction): line with weight as x and index as f(x)
+        calc (WBCalculator): calculator used for conversion
+        tol (float, optional): maximum %MAC deviation. Defaults to 1e-3.
+
+    Raises:
+        ValueError: if tolerance is not > 0
+        ValueError: if line weights are not > 0
+
+    Returns:
+        PLFunction: line with weight as x and %MAC as f(x)
+    """
+    if not line.min_x > 0:
+        raise ValueError("weights must be > 0")
+    scale = calc.c / (calc.macrc / 100)
+
+    def curvature(x: float, y: float, slope: float) -> float:
+        # mac(w) = (c * (idx(w) - k) / w + ref_st - lemac_at) / (macrc / 100),
+        # with idx(w) linear on segment, mac(w) = const + scale * b / w,
+        # b = idx(x) - k - slope * x, so |mac''| is largest at lowest weight
+        return abs(2 * scale * (y - calc.k - slope * x)) / x**3
+
+    return _resample(line, calc.mac_from_idx, curvature, tol)
+
+
+def limits_mac_to_idx(
+    limits: CGLimits, calc: WBCalculator, tol: float = 1e-3
+) -> CGLimits:
+    """Convert %MAC CGLimits to index CGLimits.
+
+    Args:
+        limits (CGLimits): limits with %MAC lines
+        calc (WBCalculator): calculator used for conversion
+        tol (float, optional): maximum index deviation. Defaults to 1e-3.
+
+    Returns:
+        CGLimits: limits with index lines
+    """
+    return CGLimits(
+        line_mac_to_idx(limits.fwd, calc, tol), line_mac_to_idx(limits.aft, calc, tol)
+    )
+
+
+def limits_idx_to_mac(
+    limits: CGLimits, calc: WBCalculator, tol: float = 1e-3
+) -> CGLimits:
+    """Convert index CGLimits to %MAC CGLimits.
+
+    Args:
+        limits (CGLimits): limits with index lines
+        calc (WBCalculator): calculator used for conversion
+        tol (float, optional): maximum %MAC deviation. Defaults to 1e-3.
+
+    Returns:
+        CGLimits: limits with %MAC lines
+    """
+    return CGLimits(
+        line_idx_to_mac(limits.fwd, calc, tol), line_idx_to_mac(limits.aft, calc, tol)
+    )
@@ -0,0 +1,213 @@
+"""Opt-in instrumentation of PLFunction and CGLimits hot paths.
+
+Nothing is measured until `enable()` is called: it replaces instrumented
+methods with wrappers reporting to a collector, and `disable()` puts
+original methods back, so disabled instrumentation costs nothing.
+Out of range lookups are reported where PLFunction and CGLimits check
+the range, whatever the method or out of range policy. While disabled,
+that costs a collector lookup on out of range paths only.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter_ns
+from typing import Any, Callable, Iterator, Protocol
+from weakref import WeakKeyDictionary
+
+from wbkit.cglimits import CGLimits
+from wbkit.plfunc import PLFunction
+
+OUT_OF_RANGE = "out_of_range"
+CACHE_HIT = "cache_hit"
+CACHE_MISS = "cache_miss"
+
+
+class Collector(Protocol):
+    def on_call(self, owner: object, operation: str, elapsed_ns: int) -> None:
+        """Called after every instrumented method call.
+
+        Args:
+            owner (object): PLFunction or CGLimits object
+            operation (str): method name
+            elapsed_ns (int): call duration in nanoseconds
+        """
+
+    def on_event(self, owner: object, event: str) -> None:
+        """Called on notable events such as out of range evaluation.
+
+        Args:
+            owner (object): object the event happened to
+            event (str): event name
+        """
+
+
+class InstanceMetrics:
+    """Call counts, event counts and latency histograms of single object."""
+
+    def __init__(self) -> None:
+        self.calls: Counter[str] = Counter()
+        self.events: Counter[str] = Counter()
+        self.latency: dict[str, list[int]] = {}
+
+    def add_call(self, operation: str, elapsed_ns: int) -> None:
+        """Record call duration. Histogram bucket `i` counts calls that took
+        from 2**(i-1) to 2**i - 1 nanoseconds.
+
+        Args:
+            operation (str): method name
+            elapsed_ns (int): call duration in nanoseconds
+        """
+        self.calls[operation] += 1
+        buckets = self.latency.setdefault(operation, [0] * 64)
+        buckets[min(elapsed_ns.bit_length(), 63)] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Get metrics as plain dict for export.
+
+        Returns:
+            dict[str, Any]: calls, events and non-empty latency buckets
+        """
+        return {
+            "calls": dict(self.calls),
+            "events": dict(self.events),
+            "latency_ns": {
+                op: {2**i: n for i, n in enumerate(buckets) if n}
+                for op, buckets in self.latency.items()
+            },
+        }
+
+
+class MetricsCollector:
+    """Collector keeping metrics in memory, per observed object."""
+
+    def __init__(self) -> None:
+        self._metrics: WeakKeyDictionary[object, InstanceMetrics] = (
+            WeakKeyDictionary()
+        )
+
+    def _for(self, owner: object) -> InstanceMetrics:
+        metrics = self._metrics.get(owner)
+        if metrics is None:
+            metrics = self._metrics[owner] = InstanceMetrics()
+        return metrics
+
+    def on_call(self, owner: object, operation: str, elapsed_ns: int) -> None:
+        self._for(owner).add_call(operation, elapsed_ns)
+
+    def on_event(self, owner: object, event: str) -> None:
+        self._for(owner).events[event] += 1
+
+    def metrics(self, owner: object) -> InstanceMetrics | None:
+        """Get metrics of given object.
+
+        Args:
+            owner (object): observed object
+
+        Returns:
+            InstanceMetrics | None: metrics or None if object was not observed
+        """
+        return self._metrics.get(owner)
+
+    def items(self) -> Iterator[tuple[object, InstanceMetrics]]:
+        """Iterate over observed objects and their metrics."""
+        yield from list(self._metrics.items())
+
+    def reset(self) -> None:
+        """Forget all collected metrics."""
+        self._metrics = WeakKeyDictionary()
+
+
+_collector: Collector | None = None
+_originals: dict[tuple[type, str], Callable] = {}
+
+
+def _instrumented(func: Callable, operation: str) -> Callable:
+    @wraps(func)
+    def wrapper(self: object, *args: Any, **kwargs: Any) -> Any:
+        collector = _collector
+        if collector is None:
+            return func(self, *args, **kwargs)
+        start = perf_counter_ns()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            collector.on_call(self, operation, perf_counter_ns() - start)
+
+    return wrapper
+
+
+_TARGETS: tuple[tuple[type, str], ...] = (
+    (PLFunction, "__getitem__"),
+    (PLFunction, "defined_f"),
+    (PLFunction, "get"),
+    (PLFunction, "get_defined"),
+    (PLFunction, "get_many"),
+    (CGLimits, "limit_range"),
+    (CGLimits, "limit_ranges"),
+    (CGLimits, "__contains__"),
+)
+
+
+def enable(collector: Collector) -> None:
+    """Start reporting instrumented calls to given collector.
+
+    Args:
+        collector (Collector): collector
+    """
+    global _collector
+    _collector = collector
+    for cls, name in _TARGETS:
+        if (cls, name) not in _originals:
+            _originals[cls, name] = getattr(cls, name)
+            setattr(cls, name, _instrumented(_originals[cls, name], name))
+
+
+def disable() -> None:
+    """Stop instrumentation and restore original methods."""
+    global _collector
+    _collector = None
+    for (cls, name), func in _originals.items():
+        setattr(cls, name, func)
+    _originals.clear()
+
+
+def get_collector() -> Collector | None:
+    """Get active collector.
+
+    Returns:
+        Collector | None: active collector or None if disabled
+    """
+    return _collector
+
+
+@contextmanager
+def instrumented(collector: Collector) -> Iterator[Collector]:
+    """Enable instrumentation for the duration of `with` block.
+
+    Args:
+        collector (Collector): collector
+
+    Yields:
+        Iterator[Collector]: given collector
+    """
+    enable(collector)
+    try:
+        yield collector
+    finally:
+        disable()
+
+
+def record_event(owner: object, event: str) -> None:
+    """Report event to active collector, if any. Intended for code paths
+    outside of instrumented methods, such as caches.
+
+    Args:
+        owner (object): object the event happened to
+        event (str): event name
+    """
+    collector = _collector
+    if collector is not None:
+        collector.on_event(owner, event)
@@ -0,0 +1,247 @@
+"""Envelope library files.
+
+Library is a JSON document of the following form::
+
+    {
+        "calculators": {
+            "A320": {"ref_st": 13.2, "c": 280, "k": 50,
+                     "macrc": 2.526, "lemac_at": 12.542}
+        },
+        "envelopes": {
+            "A320-ZFW": {"calculator": "A320", "unit": "index",
+                         "fwd": [[13608, 34.45], [19958, 22.82]],
+                         "aft": [[13608, 57.31], [19958, 66.12]]}
+        }
+    }
+
+`unit` is either "index" or "mac" and defaults to "index".
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from os import PathLike
+from typing import Any, Literal, NamedTuple, Sequence
+
+from wbkit.basic import WBCalculator
+from wbkit.cglimits import CGLimits
+from wbkit.plfunc import PLFunction
+
+UNITS = ("index", "mac")
+
+
+class Verdict(NamedTuple):
+    verdict: Literal["in", "fwd", "aft", "weight", "error"]
+    margin: float | None
+
+
+class Envelope(NamedTuple):
+    calc: WBCalculator
+    limits: CGLimits
+    unit: Literal["index", "mac"] = "index"
+
+    def to_unit(self, value: float, weight: float, unit: str) -> float:
+        """Convert CG value given in `unit` to envelope unit.
+
+        Args:
+            value (float): index or %MAC
+            weight (float): weight
+            unit (str): "index" or "mac"
+
+        Raises:
+            ValueError: if unit is unknown
+
+        Returns:
+            float: value in envelope unit
+        """
+        if unit not in UNITS:
+            raise ValueError(f"unknown unit {unit!r}")
+        if unit == self.unit:
+            return value
+        if unit == "mac":
+            return self.calc.mac_to_idx(value, weight)
+        return self.calc.mac_from_idx(value, weight)
+
+    def check_many(
+        self, values: Sequence[float], weights: Sequence[float], unit: str = "index"
+    ) -> list[Verdict]:
+        """Check CG values against limits.
+
+        Verdict is "in" for CG in limits, "fwd" or "aft" for exceeded limit
+        and "weight" for weight outside of limits weight range. Margin is
+        distance to the closest limit in envelope unit, negative if limit
+        is exceeded, None if weight is out of range.
+
+        Args:
+            values (Sequence[float]): CG values
+            weights (Sequence[float]): CG weights
+            unit (str, optional): unit of values. Defaults to "index".
+
+        Raises:
+            ValueError: if values and weights are not of the same length
+            ValueError: if unit is unknown
+
+        Returns:
+            list[Verdict]: verdict for each CG
+        """
+        if len(values) != len(weights):
+            raise ValueError("values and weights are not of the same length.")
+        verdicts = []
+        for value, weight, limit_range in zip(
+            values, weights, self.limits.limit_ranges(weights)
+        ):
+            if limit_range is None:
+                verdicts.append(Verdict("weight", None))
+                continue
+            fwd, aft = limit_range
+            value = self.to_unit(value, weight, unit)
+            margin = min(value - fwd, aft - value)
+            if value < fwd:
+                verdicts.append(Verdict("fwd", margin))
+            elif value > aft:
+                verdicts.append(Verdict("aft", margin))
+            else:
+                verdicts.append(Verdict("in", margin))
+        return verdicts
+
+
+def check_records(
+    records: Sequence[dict[str, Any]], envelopes: dict[str, Envelope]
+) -> list[dict[str, Any]]:
+    """Check records against their envelopes.
+
+    Each record must have `weight`, `envelope` and either `index`
+    or `mac` fields. Records are grouped by envelope and unit
+    so that each group is checked in a single batch. Records that
+    can not be checked, including ones with non-finite values, get
+    "error" verdict without affecting other records.
+
+    Args:
+        records (Sequence[dict[str, Any]]): records
+        envelopes (dict[str, Envelope]): envelopes by id
+
+    Returns:
+        list[dict[str, Any]]: records with `verdict` and `margin` added,
+        in input order
+    """
+    results: list[dict[str, Any]] = [
+        {**r, "verdict": "error", "margin": None} for r in records
+    ]
+    groups: dict[tuple[str, str], list[tuple[int, float, float]]] = {}
+    for pos, record in enumerate(records):
+        unit = "index" if record.get("index") not in (None, "") else "mac"
+        try:
+            weight = float(record["weight"])
+            value = float(record[unit])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if not (math.isfinite(weight) and math.isfinite(value)):
+            continue
+        envelope = record.get("envelope")
+        if not isinstance(envelope, str) or envelope not in envelopes:
+            continue
+        groups.setdefault((envelope, unit), []).append((pos, value, weight))
+    for (envelope_id, unit), items in groups.items():
+        envelope = envelopes[envelope_id]
+        positions, values, weights = zip(*items)
+        try:
+            verdicts = envelope.check_many(values, weights, unit)
+        except (TypeError, ValueError):
+            # find records that fail, the rest of the group is still checked
+            verdicts = []
+            for value, weight in zip(values, weights):
+                try:
+                    (checked,) = envelope.check_many([value], [weight], unit)
+                except (TypeError, ValueError):
+                    checked = Verdict("error", None)
+                verdicts.append(checked)
+        for pos, checked in zip(positions, verdicts):
+            verdict, margin = checked
+            if margin is not None and not math.isfinite(margin):
+                continue
+            results[pos]["verdict"] = verdict
+            results[pos]["margin"] = margin
+    return results
+
+
+def json_safe(value: Any) -> Any:
+    """Replace non-finite floats, which are not valid JSON, with None.
+
+    Args:
+        value (Any): JSON serializable value
+
+    Returns:
+        Any: value with NaN and infinities in nested lists and dicts
+        replaced by None
+    """
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {k: json_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [json_safe(v) for v in value]
+    return value
+
+
+def parse_calculator(data: dict[str, Any]) -> WBCalculator:
+    """Create WBCalculator from library entry.
+
+    Args:
+        data (dict[str, Any]): calculator entry
+
+    Returns:
+        WBCalculator: calculator
+    """
+    return WBCalculator(
+        data["ref_st"], data["c"], data["k"], data["macrc"], data["lemac_at"]
+    )
+
+
+def parse_library(data: dict[str, Any]) -> dict[str, Envelope]:
+    """Create envelopes from library document.
+
+    Args:
+        data (dict[str, Any]): library document
+
+    Raises:
+        ValueError: if envelope refers to unknown calculator
+        ValueError: if envelope unit is unknown
+
+    Returns:
+        dict[str, Envelope]: envelopes by id
+    """
+    calculators = {
+        name: parse_calculator(entry)
+        for name, entry in data.get("calculators", {}).items()
+    }
+    envelopes = {}
+    for name, entry in data.get("envelopes", {}).items():
+        calc = calculators.get(entry["calculator"])
+        if calc is None:
+            raise ValueError(
+                f"envelope {name!r} refers to unknown calculator "
+                f"{entry['calculator']!r}"
+            )
+        unit = entry.get("unit", "index")
+        if unit not in UNITS:
+            raise ValueError(f"envelope {name!r} has unknown unit {unit!r}")
+        limits = CGLimits(
+            PLFunction([tuple(p) for p in entry["fwd"]]),
+            PLFunction([tuple(p) for p in entry["aft"]]),
+        )
+        envelopes[name] = Envelope(calc, limits, unit)
+    return envelopes
+
+
+def load_library(path: str | PathLike[str]) -> dict[str, Envelope]:
+    """Load envelopes from library file.
+
+    Args:
+        path (str | PathLike[str]): path to JSON library file
+
+    Returns:
+        dict[str, Envelope]: envelopes by id
+    """
+    with open(path, encoding="utf-8") as fh:
+        return parse_library(json.load(fh))
@@ -0,0 +1,234 @@
+"""Rasterized CG limits for very high query volumes.
+
+`OccupancyGrid` splits weight by CG area around limits into cells marked
+as fully inside, fully outside or boundary. Queries in inside and outside
+cells are answered by a single lookup, queries in boundary cells and
+outside of the grid fall back to exact `CGLimits` comparison, so results
+are always the same as of `CG in limits`.
+
+Cells are located by index arithmetic alone. Cell bounds are widened by
+a tiny margin when cells are classified, so rounding of the arithmetic
+can not put a query into a cell that does not cover it. On synthetic
+envelopes (see `benchmarks/bench.py`) `contains_many` is 1.5 - 1.8 times
+faster than exact batched check with `CGLimits.limit_ranges`, and about
+3 times faster than `CG in limits`.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import Sequence
+
+from wbkit.cglimits import CG, CGLimits
+from wbkit.plfunc import PLFunction, interp
+
+OUTSIDE = 0
+INSIDE = 1
+BOUNDARY = 2
+
+
+def _bounds(lower: float, upper: float, count: int) -> tuple[float, ...]:
+    step = (upper - lower) / count
+    return (lower, *(lower + i * step for i in range(1, count)), upper)
+
+
+def _extremes(line: PLFunction, lower: float, upper: float) -> tuple[float, float]:
+    """Bounds of evaluated line values on [lower, upper].
+
+    Evaluation is monotone within each segment, but value at a breakpoint
+    evaluated from the left segment may differ from the breakpoint value
+    by rounding, so both are taken into account.
+
+    Args:
+        line (PLFunction): line
+        lower (float): lower x bound
+        upper (float): upper x bound
+
+    Returns:
+        tuple[float, float]: min and max value
+    """
+    xp, fp = line.xp, line.fp
+    lo, hi = bisect_left(xp, lower), bisect_right(xp, upper)
+    values = [interp(lower, xp, fp), interp(upper, xp, fp)]
+    for i in range(lo, hi):
+        values.append(fp[i])
+        values.append(interp(xp[i], xp, fp))
+    return min(values), max(values)
+
+
+def _margin(lower: float, upper: float, count: int) -> float:
+    """Widening of cell bounds covering rounding of cell index arithmetic.
+
+    Cell index of x is computed as `int((x - lower) * scale)`, which can
+    put x slightly outside of nominal cell bounds, by a few ulps of the
+    bounds. Margin is many orders of magnitude larger than that and still
+    negligible compared to cell size.
+    """
+    return 1e-9 * ((upper - lower) / count + abs(lower) + abs(upper))
+
+
+class OccupancyGrid:
+    """Precomputed weight by CG bitmap of CGLimits."""
+
+    def __init__(
+        self,
+        limits: CGLimits,
+        rows: int = 256,
+        cols: int = 256,
+        max_cells: int = 1 << 20,
+    ) -> None:
+        """Create OccupancyGrid object. Grid takes one byte per cell.
+
+        Args:
+            limits (CGLimits): limits
+            rows (int, optional): number of weight intervals. Defaults to 256.
+            cols (int, optional): number of CG intervals. Defaults to 256.
+            max_cells (int, optional): maximum number of cells.
+            Defaults to 1 << 20.
+
+        Raises:
+            ValueError: if rows or cols is not > 0
+            ValueError: if grid has more than max cells
+        """
+        if not (rows > 0 and cols > 0):
+            raise ValueError("rows and cols must be > 0")
+        if rows * cols > max_cells:
+            raise ValueError(f"grid of {rows} x {cols} exceeds {max_cells} cells")
+        self.limits = limits
+        fwd, aft = limits.fwd, limits.aft
+        w_lo, w_hi = limits.min_weight, limits.max_weight
+        c_lo, c_hi = fwd.min_f, aft.max_f
+        if w_lo == w_hi:
+            rows = 1
+        if c_lo == c_hi:
+            cols = 1
+        self.rows, self.cols = rows, cols
+        self.weights = _bounds(w_lo, w_hi, rows)
+        self.values = _bounds(c_lo, c_hi, cols)
+        self._w_scale = rows / (w_hi - w_lo) if w_hi > w_lo else 0.0
+        self._c_scale = cols / (c_hi - c_lo) if c_hi > c_lo else 0.0
+
+        # cells are classified by bounds widened by margin, so that index
+        # arithmetic needs no correction against stored bounds
+        w_margin = _margin(w_lo, w_hi, rows)
+        c_margin = _margin(c_lo, c_hi, cols)
+        starts = [v - c_margin for v in self.values[:-1]]
+        ends = [v + c_margin for v in self.values[1:]]
+        cells = bytearray()
+        for i in range(rows):
+            w0 = max(self.weights[i] - w_margin, w_lo)
+            w1 = min(self.weights[i + 1] + w_margin, w_hi)
+            fwd_min, fwd_max = _extremes(fwd, w0, w1)
+            aft_min, aft_max = _extremes(aft, w0, w1)
+            row = bytearray([BOUNDARY]) * cols
+            # inside: starts[j] >= fwd_max and ends[j] <= aft_min
+            start = bisect_left(starts, fwd_max)
+            end = bisect_right(ends, aft_min)
+            if start < end:
+                row[start:end] = bytes([INSIDE]) * (end - start)
+            # outside: ends[j] < fwd_min or starts[j] > aft_max
+            before = bisect_left(ends, fwd_min)
+            if before > 0:
+                row[:before] = bytes(before)
+            after = bisect_right(starts, aft_max)
+            if after < cols:
+                row[after:] = bytes(cols - after)
+            cells += row
+        self.cells = bytes(cells)
+
+    def state(self, value: float, weight: float) -> int:
+        """Get state of cell containing given CG.
+
+        Args:
+            value (float): CG value
+            weight (float): CG weight
+
+        Returns:
+            int: INSIDE, OUTSIDE or BOUNDARY, which is also returned
+            for CG outside of the grid
+        """
+        weights, values = self.weights, self.values
+        if not (
+            weights[0] <= weight <= weights[-1] and values[0] <= value <= values[-1]
+        ):
+            return BOUNDARY
+        rows, cols = self.rows, self.cols
+        # upper bound of the grid maps to index rows or cols
+        i = min(int((weight - weights[0]) * self._w_scale), rows - 1)
+        j = min(int((value - values[0]) * self._c_scale), cols - 1)
+        return self.cells[i * cols + j]
+
+    def contains(self, value: float, weight: float) -> bool:
+        """Check if value-weight pair is in limits.
+
+        Args:
+            value (float): CG value
+            weight (float): CG weight
+
+        Returns:
+            bool: same as `CG(value, weight) in limits`
+        """
+        state = self.state(value, weight)
+        if state == BOUNDARY:
+            return CG(value, weight) in self.limits
+        return state == INSIDE
+
+    def __contains__(self, cg: CG) -> bool:
+        return self.contains(cg.value, cg.weight)
+
+    def contains_many(
+        self, values: Sequence[float], weights: Sequence[float]
+    ) -> list[bool]:
+        """Check value-weight pairs against limits.
+
+        Args:
+            values (Sequence[float]): CG values
+            weights (Sequence[float]): CG weights
+
+        Raises:
+            ValueError: if values and weights are not of the same length
+
+        Returns:
+            list[bool]: same as `CG(value, weight) in limits` for each pair
+        """
+        if len(values) != len(weights):
+            raise ValueError("values and weights are not of the same length.")
+        w_lo, w_hi = self.weights[0], self.weights[-1]
+        c_lo, c_hi = self.values[0], self.values[-1]
+        w_scale, c_scale = self._w_scale, self._c_scale
+        rows, cols, cells = self.rows, self.cols, self.cells
+        results = []
+        # positions of queries in boundary cells or outside of CG range,
+        # checked exactly in one batch afterwards
+        exact = []
+        for value, weight in zip(values, weights):
+            if not w_lo <= weight <= w_hi:
+                results.append(False)
+                continue
+            if c_lo <= value <= c_hi:
+                i = int((weight - w_lo) * w_scale)
+                j = int((value - c_lo) * c_scale)
+                # same as clamping i to rows - 1 and j to cols - 1
+                state = cells[(i - (i == rows)) * cols + j - (j == cols)]
+                if state != BOUNDARY:
+                    results.append(state == INSIDE)
+                    continue
+            exact.append(len(results))
+            results.append(False)
+        limit_ranges = self.limits.limit_ranges([weights[pos] for pos in exact])
+        for pos, limit_range in zip(exact, limit_ranges):
+            if limit_range is None:
+                continue
+            fwd, aft = limit_range
+            value = values[pos]
+            results[pos] = not (value < fwd or value > aft)
+        return results
+
+    @property
+    def boundary_fraction(self) -> float:
+        """Fraction of cells which need exact comparison.
+
+        Returns:
+            float: from 0 to 1
+        """
+        return self.cells.count(BOUNDARY) / len(self.cells)
@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import random
+from concurrent.futures import ProcessPoolExecutor
+from time import monotonic
+from typing import NamedTuple, Sequence
+
+from wbkit.basic import WBCalculator
+from wbkit.cglimits import CG, CGLimits
+
+
+class Position(NamedTuple):
+    station: float
+    max_weight: float
+    max_items: int | None = None
+
+
+class LoadPlan(NamedTuple):
+    assignment: tuple[int, ...]
+    cg: CG
+    margin: float
+
+
+class _Problem(NamedTuple):
+    weights: tuple[float, ...]
+    arms: tuple[float, ...]
+    max_weights: tuple[float, ...]
+    max_items: tuple[int, ...]
+    base_idx: float
+    target: float
+
+
+def _greedy(
+    problem: _Problem, order: Sequence[int]
+) -> tuple[list[int], list[float], list[int], float] | None:
+    """Assign items one by one, placing each where the index ends up closest
+    to target assuming the rest of items are spread evenly.
+
+    Args:
+        problem (_Problem): problem
+        order (Sequence[int]): order of items to assign
+
+    Returns:
+        tuple[list[int], list[float], list[int], float] | None: assignment,
+        position loads, position item counts and index,
+        None if items do not fit
+    """
+    weights, arms, max_weights, max_items, idx, target = problem
+    capacity = sum(max_weights) or 1
+    mean_arm = sum(a * m for a, m in zip(arms, max_weights)) / capacity
+    assignment = [-1] * len(weights)
+    loads = [0.0] * len(arms)
+    counts = [0] * len(arms)
+    rest = sum(weights)
+    for i in order:
+        w = weights[i]
+        rest -= w
+        best, best_error = -1, 0.0
+        for p, arm in enumerate(arms):
+            if loads[p] + w > max_weights[p] or counts[p] >= max_items[p]:
+                continue
+            error = abs(target - idx - w * arm - rest * mean_arm)
+            if best < 0 or error < best_error:
+                best, best_error = p, error
+        if best < 0:
+            return None
+        assignment[i] = best
+        loads[best] += w
+        counts[best] += 1
+        idx += w * arms[best]
+    return assignment, loads, counts, idx
+
+
+def _improve(
+    problem: _Problem,
+    assignment: list[int],
+    loads: list[float],
+    counts: list[int],
+    idx: float,
+    deadline: float,
+) -> float:
+    """Improve assignment in place with single item moves and pairwise swaps
+    until no move brings index closer to target.
+
+    Args:
+        problem (_Problem): problem
+        assignment (list[int]): item positions
+        loads (list[float]): position loads
+        counts (list[int]): position item counts
+        idx (float): index of assignment
+        deadline (float): monotonic time to stop at
+
+    Returns:
+        float: index of improved assignment
+    """
+    weights, arms, max_weights, max_items, _, target = problem
+    error = abs(idx - target)
+    improved = True
+    while improved and error > 0 and monotonic() < deadline:
+        improved = False
+        for i, w in enumerate(weights):
+            p = assignment[i]
+            for q, arm in enumerate(arms):
+                if q == p or counts[q] >= max_items[q]:
+                    continue
+                if loads[q] + w > max_weights[q]:
+                    continue
+                new_idx = idx + w * (arm - arms[p])
+                if abs(new_idx - target) < error:
+                    assignment[i] = q
+                    loads[p] -= w
+                    loads[q] += w
+                    counts[p] -= 1
+                    counts[q] += 1
+                    idx, error, p = new_idx, abs(new_idx - target), q
+                    improved = True
+        for i, wi in enumerate(weights):
+            for j in range(i + 1, len(weights)):
+                p, q = assignment[i], assignment[j]
+                wj = weights[j]
+                if p == q or wi == wj:
+                    continue
+                if loads[p] - wi + wj > max_weights[p]:
+                    continue
+                if loads[q] - wj + wi > max_weights[q]:
+                    continue
+                new_idx = idx + (wi - wj) * (arms[q] - arms[p])
+                if abs(new_idx - target) < error:
+                    assignment[i], assignment[j] = q, p
+                    loads[p] += wj - wi
+                    loads[q] += wi - wj
+                    idx, error = new_idx, abs(new_idx - target)
+                    improved = True
+    return idx
+
+
+def _fits(problem: _Problem) -> bool:
+    """Check conditions every feasible assignment must meet. Passing
+    the check does not guarantee that items fit.
+
+    Args:
+        problem (_Problem): problem
+
+    Returns:
+        bool: False if items can not fit into positions
+    """
+    weights, _, max_weights, max_items, _, _ = problem
+    if not weights:
+        return True
+    largest = max((m for m, n in zip(max_weights, max_items) if n > 0), default=-1)
+    return (
+        len(weights) <= sum(max_items)
+        and sum(weights) <= sum(max_weights)
+        and max(weights) <= largest
+    )
+
+
+def _lower_bound(problem: _Problem) -> float:
+    """Lower bound of distance to target of any assignment.
+
+    Index range is bounded by pouring total item weight into positions
+    in order of arm, as if items could be split, and target outside
+    of that range can not be reached closer than to its nearest end.
+
+    Args:
+        problem (_Problem): problem
+
+    Returns:
+        float: distance bound, 0 if target may be reachable
+    """
+    weights, arms, max_weights, _, base_idx, target = problem
+
+    def extreme(positions: list[int]) -> float:
+        idx, rest = base_idx, sum(weights)
+        for p in positions:
+            load = min(rest, max_weights[p])
+            idx += load * arms[p]
+            rest -= load
+        return idx
+
+    positions = sorted(range(len(arms)), key=lambda p: arms[p])
+    lowest, highest = extreme(positions), extreme(positions[::-1])
+    return max(lowest - target, target - highest, 0.0)
+
+
+def _search(
+    problem: _Problem, seed: int, time_budget: float
+) -> tuple[float, tuple[int, ...]] | None:
+    """Run greedy construction with local search, restarting with random
+    item order until time budget is exhausted or the best assignment
+    is proven optimal by reaching the lower bound of distance to target.
+
+    Args:
+        problem (_Problem): problem
+        seed (int): random seed
+        time_budget (float): time budget in seconds
+
+    Returns:
+        tuple[float, tuple[int, ...]] | None: distance to target and
+        assignment, None if no feasible assignment was found
+    """
+    if not _fits(problem):
+        return None
+    deadline = monotonic() + time_budget
+    # bound is reached up to rounding of index sums
+    bound = _lower_bound(problem) * (1 + 1e-12) + 1e-12 * abs(problem.target)
+    rng = random.Random(seed)
+    order = sorted(range(len(problem.weights)), key=lambda i: -problem.weights[i])
+    best: tuple[float, tuple[int, ...]] | None = None
+    while True:
+        start = _greedy(problem, order)
+        if start is not None:
+            assignment, loads, counts, idx = start
+            idx = _improve(problem, assignment, loads, counts, idx, deadline)
+            error = abs(idx - problem.target)
+            if best is None or error < best[0]:
+                best = error, tuple(assignment)
+        if best is not None and best[0] <= bound:
+            return best
+        # a single item has only one order to try
+        if len(order) < 2 or monotonic() >= deadline:
+            return best
+        rng.shuffle(order)
+
+
+def optimize_load(
+    base: CG,
+    positions: Sequence[Position],
+    items: Sequence[float],
+    calc: WBCalculator,
+    limits: CGLimits,
+    target: float | None = None,
+    time_budget: float = 1.0,
+    workers: int = 1,
+    seed: int = 0,
+) -> LoadPlan:
+    """Find assignment of items to positions that puts resulting CG
+    as close to target as possible.
+
+    Total weight does not depend on assignment, so neither does
+    the limit range. Without explicit target CG is driven to the middle
+    of the limit range, which maximizes minimum margin to forward
+    and aft limits. Plan is only returned if its CG is in limits.
+
+    Args:
+        base (CG): index and weight of aircraft before loading items
+        positions (Sequence[Position]): loading positions
+        items (Sequence[float]): item weights
+        calc (WBCalculator): calculator used for index calculation
+        limits (CGLimits): limits to satisfy
+        target (float | None, optional): target index. Defaults to None.
+        time_budget (float, optional): search time budget in seconds
+        for each worker. Defaults to 1.0.
+        workers (int, optional): number of search processes. Defaults to 1.
+        seed (int, optional): random seed. Defaults to 0.
+
+    Raises:
+        ValueError: if no positions are given
+        ValueError: if total weight is out of limits weight range
+        ValueError: if no feasible assignment was found
+        ValueError: if CG of the best assignment found is out of limits
+
+    Returns:
+        LoadPlan: assignment (position number for each item),
+        resulting CG and minimum margin to forward and aft limits
+    """
+    if len(positions) == 0:
+        raise ValueError("at least one position is required.")
+    total_weight = base.weight + sum(items)
+    limit_range = limits.limit_range(total_weight)
+    if limit_range is None:
+        raise ValueError("total weight is out of limits weight range")
+    fwd, aft = limit_range
+    problem = _Problem(
+        weights=tuple(items),
+        arms=tuple(calc.calc_idx(1, p.station) - calc.k for p in positions),
+        max_weights=tuple(p.max_weight for p in positions),
+        max_items=tuple(
+            len(items) if p.max_items is None else p.max_items for p in positions
+        ),
+        base_idx=base.value,
+        target=(fwd + aft) / 2 if target is None else target,
+    )
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_search, problem, seed + n, time_budget)
+                for n in range(workers)
+            ]
+            results = [r for r in (f.result() for f in futures) if r is not None]
+        found = min(results, default=None)
+    else:
+        found = _search(problem, seed, time_budget)
+    if found is None:
+        raise ValueError("items do not fit into positions")
+    _, assignment = found
+    idx = base.value + sum(
+        w * problem.arms[p] for w, p in zip(problem.weights, assignment)
+    )
+    if not fwd <= idx <= aft:
+        raise ValueError("no assignment found puts CG in limits")
+    return LoadPlan(
+        assignment, CG(idx, total_weight, limits), min(idx - fwd, aft - idx)
+    )
@@ -1,9 +1,29 @@
 from __future__ import annotations
 
-from bisect import bisect_left
+import math
+from array import array
+from bisect import bisect_left, bisect_right
 from functools import cached_property
-from itertools import pairwise
-from typing import Sequence, overload
+from itertools import chain, pairwise
+from typing import Any, Iterable, Iterator, Literal, Sequence, overload
+
+OutOfRangePolicy = Literal["sentinel", "nan", "clamp", "extrapolate"]
+POLICIES = ("sentinel", "nan", "clamp", "extrapolate")
+
+# breakpoints PLCursor steps over before falling back to bisect
+_CURSOR_WALK = 8
+
+
+def _record_out_of_range(owner: object) -> None:
+    """Report out of range lookup to active instrumentation collector, if any.
+
+    Args:
+        owner (object): PLFunction or CGLimits object
+    """
+    # wbkit.instrument imports this module
+    from wbkit.instrument import OUT_OF_RANGE, record_event
+
+    record_event(owner, OUT_OF_RANGE)
 
 
 def interp(x: float, xp: Sequence[float], fp: Sequence[float]) -> float:
@@ -42,6 +62,45 @@ def interp(x: float, xp: Sequence[float], fp: Sequence[float]) -> float:
     return y1 + (x - x1) * ((y2 - y1) / (x2 - x1))
 
 
+def _validated_points(
+    points: Sequence[tuple[float, float]]
+) -> tuple[tuple[float, float], ...]:
+    """Check PLFunction points and sort them by x.
+
+    Args:
+        points (Sequence[tuple[float, float]]): sequence of (x, f(x)) tuples
+
+    Raises:
+        ValueError: if points are empty
+        ValueError: if points contain duplicate values for x
+
+    Returns:
+        tuple[tuple[float, float], ...]: points sorted by x
+    """
+    if len(points) == 0:
+        raise ValueError("at least one point is required.")
+    if len({x[0] for x in points}) < len(points):
+        raise ValueError("duplicate x values are not allowed.")
+    return tuple(sorted(points, key=lambda x: x[0]))
+
+
+def _unpickle_plfunction(cls: type[PLFunction], data: bytes) -> PLFunction:
+    """Restore PLFunction pickled by `PLFunction.__reduce__` without
+    validating points again.
+
+    Args:
+        cls (type[PLFunction]): PLFunction class
+        data (bytes): float64 x values followed by float64 f(x) values
+
+    Returns:
+        PLFunction: restored object
+    """
+    values = array("d")
+    values.frombytes(data)
+    n = len(values) // 2
+    return cls._trusted(tuple(values[:n]), tuple(values[n:]))
+
+
 class PLFunction:
     """Representation of piecewise linear function."""
 
@@ -57,11 +116,39 @@ class PLFunction:
         Raises:
             ValueError: if points contain duplicate values for x
         """
-        if len(points) == 0:
-            raise ValueError("at least one point is required.")
-        if len({x[0] for x in points}) < len(points):
-            raise ValueError("duplicate x values are not allowed.")
-        self.points = tuple(sorted(points, key=lambda x: x[0]))
+        self.points = _validated_points(points)
+
+    @classmethod
+    def _trusted(
+        cls,
+        xp: tuple[float, ...],
+        fp: tuple[float, ...],
+        min_f: float | None = None,
+        max_f: float | None = None,
+    ) -> PLFunction:
+        """Create PLFunction object from points known to be valid and sorted
+        without checking them again. Derived values are set right away.
+
+        Args:
+            xp (tuple[float, ...]): ascending x values
+            fp (tuple[float, ...]): f(x) values
+            min_f (float | None, optional): minimum f(x), if known.
+            Defaults to None.
+            max_f (float | None, optional): maximum f(x), if known.
+            Defaults to None.
+
+        Returns:
+            PLFunction: PLFunction object
+        """
+        obj = cls.__new__(cls)
+        obj.__dict__.update(
+            points=tuple(zip(xp, fp)),
+            xp=xp,
+            fp=fp,
+            min_f=min(fp) if min_f is None else min_f,
+            max_f=max(fp) if max_f is None else max_f,
+        )
+        return obj
 
     def cut(self, lower: float | None = None, upper: float | None = None) -> PLFunction:
         """Get new PLFunction object with x range cut to given bounds.
@@ -152,6 +239,44 @@ class PLFunction:
         """
         return max(self.fp)
 
+    def freeze(self) -> FrozenPLFunction:
+        """Get immutable, fully precomputed copy of this PLFunction.
+
+        Returns:
+            FrozenPLFunction: frozen copy
+        """
+        return FrozenPLFunction(self.points)
+
+    @cached_property
+    def _slope_table(self) -> SlopeTable:
+        return SlopeTable(self.xp, self.fp)
+
+    def derivative(self) -> SlopeTable:
+        """Get precomputed slope of each segment. Table is built
+        on first call and shared by later calls.
+
+        Returns:
+            SlopeTable: piecewise constant df/dx
+        """
+        return self._slope_table
+
+    def cursor(self) -> PLCursor:
+        """Get cursor for evaluating x values coming in sorted order.
+
+        Returns:
+            PLCursor: cursor over this PLFunction
+        """
+        return PLCursor(self)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickle as packed float64 breakpoints only. Cached values
+        are not pickled, and x and f(x) values come back as floats.
+        """
+        return _unpickle_plfunction, (
+            type(self),
+            array("d", self.xp).tobytes() + array("d", self.fp).tobytes(),
+        )
+
     def __repr__(self) -> str:
         return f"{type(self).__name__}({self.points})"
 
@@ -188,6 +313,7 @@ class PLFunction:
         if isinstance(idx, slice):
             return self.cut(idx.start, idx.stop)
         if idx not in self:
+            _record_out_of_range(self)
             raise KeyError(f"x should be in range {self.min_x} - {self.max_x}")
         return interp(idx, self.xp, self.fp)
 
@@ -204,7 +330,11 @@ class PLFunction:
             float: f( closest defined x )
         """
         if x not in self:
+            _record_out_of_range(self)
             raise ValueError(f"x should be in range {self.min_x} - {self.max_x}")
+        return self._defined(x)
+
+    def _defined(self, x: float) -> float:
         pos = bisect_left(self.xp, x)
         if pos == 0:
             return self.fp[0]
@@ -214,6 +344,123 @@ class PLFunction:
         after = self.xp[pos]
         return self.fp[pos] if x - before >= after - x else self.fp[pos - 1]
 
+    def get(
+        self,
+        x: float,
+        default: float | None = None,
+        policy: OutOfRangePolicy = "sentinel",
+    ) -> float | None:
+        """Get interpolated f(x) without raising for x outside of x range.
+
+        Out of range x is handled according to `policy`:
+        "sentinel" returns `default`, "nan" returns NaN, "clamp" returns
+        f(x) of the closest end point and "extrapolate" extends the first
+        or last segment (constant for single point functions).
+
+        Args:
+            x (float): x value
+            default (float | None, optional): value returned for out of range
+            x by "sentinel" policy. Defaults to None.
+            policy (OutOfRangePolicy, optional): out of range policy.
+            Defaults to "sentinel".
+
+        Raises:
+            ValueError: if policy is unknown
+
+        Returns:
+            float | None: interpolated f(x) or value given by policy
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"unknown out of range policy {policy!r}")
+        xp = self.xp
+        if xp[0] <= x <= xp[-1]:
+            return interp(x, xp, self.fp)
+        return self._out_of_range(x, default, policy)
+
+    def get_many(
+        self,
+        xs: Sequence[float],
+        default: float | None = None,
+        policy: OutOfRangePolicy = "sentinel",
+    ) -> list[float | None]:
+        """Same as calling `get` for each x, without per-call overhead.
+
+        Args:
+            xs (Sequence[float]): x values
+            default (float | None, optional): value returned for out of range
+            x by "sentinel" policy. Defaults to None.
+            policy (OutOfRangePolicy, optional): out of range policy.
+            Defaults to "sentinel".
+
+        Raises:
+            ValueError: if policy is unknown
+
+        Returns:
+            list[float | None]: f(x) for each x
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"unknown out of range policy {policy!r}")
+        xp, fp = self.xp, self.fp
+        lower, upper = xp[0], xp[-1]
+        return [
+            (
+                interp(x, xp, fp)
+                if lower <= x <= upper
+                else self._out_of_range(x, default, policy)
+            )
+            for x in xs
+        ]
+
+    def get_defined(
+        self,
+        x: float,
+        default: float | None = None,
+        policy: OutOfRangePolicy = "sentinel",
+    ) -> float | None:
+        """Get f(x) for defined x closest to given x value without raising
+        for x outside of x range. Same as `defined_f` for x in range.
+        Closest defined x for out of range x is the end point, so
+        "clamp" and "extrapolate" policies behave the same.
+
+        Args:
+            x (float): x value to search for
+            default (float | None, optional): value returned for out of range
+            x by "sentinel" policy. Defaults to None.
+            policy (OutOfRangePolicy, optional): out of range policy.
+            Defaults to "sentinel".
+
+        Raises:
+            ValueError: if policy is unknown
+
+        Returns:
+            float | None: f( closest defined x ) or value given by policy
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"unknown out of range policy {policy!r}")
+        if x in self:
+            return self._defined(x)
+        if policy == "extrapolate":
+            policy = "clamp"
+        return self._out_of_range(x, default, policy)
+
+    def _out_of_range(
+        self, x: float, default: float | None, policy: str
+    ) -> float | None:
+        _record_out_of_range(self)
+        if policy == "sentinel":
+            return default
+        if policy == "nan":
+            return math.nan
+        xp, fp = self.xp, self.fp
+        below = x < xp[0]
+        if policy == "clamp" or len(xp) == 1:
+            return fp[0] if below else fp[-1]
+        if below:
+            x1, x2, y1, y2 = xp[0], xp[1], fp[0], fp[1]
+        else:
+            x1, x2, y1, y2 = xp[-2], xp[-1], fp[-2], fp[-1]
+        return y1 + (x - x1) * ((y2 - y1) / (x2 - x1))
+
     def intersects(self, other: PLFunction) -> bool:
         """Check if two piecewise linear function graphs overlap.
 
@@ -225,7 +472,7 @@ class PLFunction:
         """
         if self.min_x > other.max_x or self.max_x < other.min_x:
             return False
-        all_xp = self.xp + other.xp
+        all_xp = chain(self.xp, other.xp)
         sorted_xp = sorted({x for x in all_xp if x in self and x in other})
         for x1, x2 in pairwise(sorted_xp):
             y1s, y1o = self[x1], other[x1]
@@ -235,3 +482,629 @@ class PLFunction:
             if diff1 == 0 or diff2 == 0 or diff1 * diff2 < 0:
                 return True
         return False
+
+
+class FrozenPLFunction(PLFunction):
+    """Immutable PLFunction with every derived table built at construction.
+
+    Reads never compute or cache anything, so a FrozenPLFunction can be
+    shared between threads, including on free-threaded Python builds,
+    without locking.
+    """
+
+    def __init__(
+        self,
+        points: Sequence[tuple[float, float]],
+    ) -> None:
+        """Create FrozenPLFunction object.
+
+        Args:
+            points (Sequence[tuple[float, float]]): sequence of (x, f(x)) tuples
+
+        Raises:
+            ValueError: if points contain duplicate values for x
+        """
+        points = _validated_points(points)
+        xp = tuple(x[0] for x in points)
+        fp = tuple(x[1] for x in points)
+        # instance values take precedence over cached properties
+        self.__dict__.update(
+            points=points,
+            xp=xp,
+            fp=fp,
+            min_f=min(fp),
+            max_f=max(fp),
+            _slope_table=SlopeTable(xp, fp),
+        )
+
+    @classmethod
+    def _trusted(
+        cls,
+        xp: tuple[float, ...],
+        fp: tuple[float, ...],
+        min_f: float | None = None,
+        max_f: float | None = None,
+    ) -> PLFunction:
+        """Same as `PLFunction._trusted`, with every derived table built."""
+        obj = super()._trusted(xp, fp, min_f, max_f)
+        obj.__dict__["_slope_table"] = SlopeTable(xp, fp)
+        return obj
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def freeze(self) -> FrozenPLFunction:
+        """FrozenPLFunction is already frozen.
+
+        Returns:
+            FrozenPLFunction: self
+        """
+        return self
+
+    def cut(
+        self, lower: float | None = None, upper: float | None = None
+    ) -> FrozenPLFunction:
+        """Same as PLFunction.cut(), but returns FrozenPLFunction."""
+        return super().cut(lower, upper).freeze()
+
+
+class PLCursor:
+    """Stateful PLFunction evaluator for x values coming in sorted order.
+
+    Cursor remembers position of the last x and walks from it to the next
+    one, so a sorted stream of k values over n breakpoints costs O(k + n)
+    instead of O(k log n). Order may change direction or break at any time:
+    jumps longer than a few breakpoints fall back to bisect. Results are
+    exactly the same as of `PLFunction.get`. Cursor is not thread safe.
+    """
+
+    def __init__(self, line: PLFunction) -> None:
+        """Create PLCursor object.
+
+        Args:
+            line (PLFunction): line to evaluate
+        """
+        self.line = line
+        self._xp = line.xp
+        self._fp = line.fp
+        self._pos = 0
+
+    def _seek(self, x: float) -> int:
+        """Move to `bisect_left(xp, x)` and return it."""
+        xp, pos, n = self._xp, self._pos, len(self._xp)
+        if pos < n and xp[pos] < x:
+            end = min(pos + _CURSOR_WALK, n)
+            while pos < end and xp[pos] < x:
+                pos += 1
+            if pos < n and xp[pos] < x:
+                pos = bisect_left(xp, x, pos)
+        elif pos > 0 and xp[pos - 1] >= x:
+            start = max(pos - _CURSOR_WALK, 0)
+            while pos > start and xp[pos - 1] >= x:
+                pos -= 1
+            if pos > 0 and xp[pos - 1] >= x:
+                pos = bisect_left(xp, x, 0, pos)
+        self._pos = pos
+        return pos
+
+    def _interp(self, x: float) -> float:
+        pos = self._seek(x)
+        xp, fp = self._xp, self._fp
+        if pos == 0:
+            return fp[0]
+        if pos == len(xp):
+            return fp[-1]
+        x1, x2 = xp[pos - 1], xp[pos]
+        y1, y2 = fp[pos - 1], fp[pos]
+        return y1 + (x - x1) * ((y2 - y1) / (x2 - x1))
+
+    def __getitem__(self, x: float) -> float:
+        """Get interpolated f(x).
+
+        Args:
+            x (float): x value
+
+        Raises:
+            KeyError: if x is outside of x range
+
+        Returns:
+            float: interpolated f(x)
+        """
+        if not self._xp[0] <= x <= self._xp[-1]:
+            raise KeyError(
+                f"x should be in range {self.line.min_x} - {self.line.max_x}"
+            )
+        return self._interp(x)
+
+    def get(
+        self,
+        x: float,
+        default: float | None = None,
+        policy: OutOfRangePolicy = "sentinel",
+    ) -> float | None:
+        """Get interpolated f(x) without raising for x outside of x range.
+        See `PLFunction.get`.
+
+        Args:
+            x (float): x value
+            default (float | None, optional): value returned for out of range
+            x by "sentinel" policy. Defaults to None.
+            policy (OutOfRangePolicy, optional): out of range policy.
+            Defaults to "sentinel".
+
+        Raises:
+            ValueError: if policy is unknown
+
+        Returns:
+            float | None: interpolated f(x) or value given by policy
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"unknown out of range policy {policy!r}")
+        if self._xp[0] <= x <= self._xp[-1]:
+            return self._interp(x)
+        return self.line._out_of_range(x, default, policy)
+
+    def stream(
+        self,
+        xs: Iterable[float],
+        default: float | None = None,
+        policy: OutOfRangePolicy = "sentinel",
+    ) -> Iterator[float | None]:
+        """Lazily evaluate stream of x values.
+
+        Args:
+            xs (Iterable[float]): x values, preferably sorted
+            default (float | None, optional): value returned for out of range
+            x by "sentinel" policy. Defaults to None.
+            policy (OutOfRangePolicy, optional): out of range policy.
+            Defaults to "sentinel".
+
+        Raises:
+            ValueError: if policy is unknown
+
+        Returns:
+            Iterator[float | None]: f(x) for each x
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"unknown out of range policy {policy!r}")
+        return self._stream(xs, default, policy)
+
+    def _stream(
+        self, xs: Iterable[float], default: float | None, policy: str
+    ) -> Iterator[float | None]:
+        lower, upper = self._xp[0], self._xp[-1]
+        out_of_range = self.line._out_of_range
+        for x in xs:
+            if lower <= x <= upper:
+                yield self._interp(x)
+            else:
+                yield out_of_range(x, default, policy)
+
+
+def _nearest_bound(before: float, after: float) -> float:
+    """Smallest x for which `PLFunction.defined_f` picks `after` over `before`.
+
+    Midpoint is adjusted to the exact float where
+    `x - before >= after - x` starts to hold, so that comparing with
+    the bound gives the same result as `defined_f` despite rounding.
+    """
+
+    def picks_after(x: float) -> bool:
+        return x - before >= after - x
+
+    x = before + (after - before) / 2
+    while not picks_after(x):
+        x = math.nextafter(x, math.inf)
+    while picks_after(lower := math.nextafter(x, -math.inf)):
+        x = lower
+    return x
+
+
+class NearestTable:
+    """Step function table: f(x) of defined x closest to given x.
+
+    Same results and tie-breaking as `PLFunction.defined_f` (x exactly
+    between two defined points gets the upper one), with boundaries
+    between steps precomputed so that every lookup is a single bisect.
+    Intended for tables that must not be interpolated.
+    """
+
+    def __init__(self, points: Sequence[tuple[float, float]]) -> None:
+        """Create NearestTable object.
+
+        Args:
+            points (Sequence[tuple[float, float]]): sequence of (x, f(x)) tuples
+
+        Raises:
+            ValueError: if points contain duplicate values for x
+        """
+        self.points = _validated_points(points)
+        self.xp = tuple(x[0] for x in self.points)
+        self.fp = tuple(x[1] for x in self.points)
+        self.bounds = tuple(_nearest_bound(x1, x2) for x1, x2 in pairwise(self.xp))
+
+    @property
+    def min_x(self) -> float:
+        """Minimum x value.
+
+        Returns:
+            float: minimum x
+        """
+        return self.xp[0]
+
+    @property
+    def max_x(self) -> float:
+        """Maximum x value.
+
+        Returns:
+            float: maximum x
+        """
+        return self.xp[-1]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.points})"
+
+    def __contains__(self, x: float) -> bool:
+        return self.min_x <= x <= self.max_x
+
+    def __getitem__(self, x: float) -> float:
+        """Get f(x) for defined x closest to given x value.
+
+        Args:
+            x (float): x value
+
+        Raises:
+            KeyError: if x is out of defined range
+
+        Returns:
+            float: f( closest defined x )
+        """
+        if x not in self:
+            raise KeyError(f"x should be in range {self.min_x} - {self.max_x}")
+        return self.fp[bisect_right(self.bounds, x)]
+
+    def get(
+        self,
+        x: float,
+        default: float | None = None,
+        policy: OutOfRangePolicy = "sentinel",
+    ) -> float | None:
+        """Get f(x) for defined x closest to given x value without raising
+        for x outside of x range. See `PLFunction.get_defined`.
+
+        Args:
+            x (float): x value
+            default (float | None, optional): value returned for out of range
+            x by "sentinel" policy. Defaults to None.
+            policy (OutOfRangePolicy, optional): out of range policy.
+            Defaults to "sentinel".
+
+        Raises:
+            ValueError: if policy is unknown
+
+        Returns:
+            float | None: f( closest defined x ) or value given by policy
+        """
+        return self.get_many((x,), default, policy)[0]
+
+    def get_many(
+        self,
+        xs: Sequence[float],
+        default: float | None = None,
+        policy: OutOfRangePolicy = "sentinel",
+    ) -> list[float | None]:
+        """Same as calling `get` for each x, without per-call overhead.
+
+        Args:
+            xs (Sequence[float]): x values
+            default (float | None, optional): value returned for out of range
+            x by "sentinel" policy. Defaults to None.
+            policy (OutOfRangePolicy, optional): out of range policy.
+            Defaults to "sentinel".
+
+        Raises:
+            ValueError: if policy is unknown
+
+        Returns:
+            list[float | None]: f( closest defined x ) for each x
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"unknown out of range policy {policy!r}")
+        fp, bounds = self.fp, self.bounds
+        if policy in ("clamp", "extrapolate"):
+            # ends of the table are the closest defined points
+            return [fp[bisect_right(bounds, x)] for x in xs]
+        missing = math.nan if policy == "nan" else default
+        lower, upper = self.min_x, self.max_x
+        return [
+            fp[bisect_right(bounds, x)] if lower <= x <= upper else missing for x in xs
+        ]
+
+
+class SlopeTable:
+    """Piecewise constant derivative of PLFunction.
+
+    At a breakpoint slope of the segment to the left is used, which is the
+    segment `interp` evaluates breakpoint with, except for the first
+    breakpoint, which only has a segment to the right.
+    """
+
+    def __init__(self, xp: Sequence[float], fp: Sequence[float]) -> None:
+        """Create SlopeTable object. Use `PLFunction.derivative` instead
+        of calling this directly.
+
+        Args:
+            xp (Sequence[float]): ascending x values
+            fp (Sequence[float]): f(x) values
+
+        Raises:
+            ValueError: if length of xp is not equal to length of fp
+        """
+        if len(xp) != len(fp):
+            raise ValueError("fp and xp are not of the same length.")
+        self.xp = tuple(xp)
+        # single point function is constant
+        self.slopes = tuple(
+            (f2 - f1) / (x2 - x1) for (x1, f1), (x2, f2) in pairwise(zip(xp, fp))
+        ) or (0.0,)
+
+    @property
+    def min_x(self) -> float:
+        """Minimum x value.
+
+        Returns:
+            float: minimum x
+        """
+        return self.xp[0]
+
+    @property
+    def max_x(self) -> float:
+        """Maximum x value.
+
+        Returns:
+            float: maximum x
+        """
+        return self.xp[-1]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.xp}, {self.slopes})"
+
+    def __contains__(self, x: float) -> bool:
+        return self.min_x <= x <= self.max_x
+
+    def _slope(self, x: float) -> float:
+        pos = bisect_left(self.xp, x) - 1
+        return self.slopes[min(max(pos, 0), len(self.slopes) - 1)]
+
+    def __getitem__(self, x: float) -> float:
+        """Get df/dx at x.
+
+        Args:
+            x (float): x value
+
+        Raises:
+            KeyError: if x is outside of x range
+
+        Returns:
+            float: slope
+        """
+        if x not in self:
+            raise KeyError(f"x should be in range {self.min_x} - {self.max_x}")
+        return self._slope(x)
+
+    def get_many(
+        self,
+        xs: Sequence[float],
+        default: float | None = None,
+        policy: OutOfRangePolicy = "sentinel",
+    ) -> list[float | None]:
+        """Get df/dx for each x without raising for x outside of x range.
+        "clamp" and "extrapolate" policies give slope of the first or last
+        segment, see `PLFunction.get`.
+
+        Args:
+            xs (Sequence[float]): x values
+            default (float | None, optional): value returned for out of range
+            x by "sentinel" policy. Defaults to None.
+            policy (OutOfRangePolicy, optional): out of range policy.
+            Defaults to "sentinel".
+
+        Raises:
+            ValueError: if policy is unknown
+
+        Returns:
+            list[float | None]: slope for each x
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"unknown out of range policy {policy!r}")
+        slope = self._slope
+        if policy in ("clamp", "extrapolate"):
+            return [slope(x) for x in xs]
+        missing = math.nan if policy == "nan" else default
+        lower, upper = self.min_x, self.max_x
+        return [slope(x) if lower <= x <= upper else missing for x in xs]
+
+
+def _uniform_step(xp: Sequence[float], rel_tol: float = 1e-9) -> float | None:
+    """Get spacing of uniformly spaced sample points.
+
+    Args:
+        xp (Sequence[float]): ascending sample points
+        rel_tol (float, optional): relative tolerance for spacing comparison.
+        Defaults to 1e-9.
+
+    Returns:
+        float | None: spacing if points are uniformly spaced, None otherwise
+    """
+    step = (xp[-1] - xp[0]) / (len(xp) - 1)
+    tol = abs(step) * rel_tol
+    if all(abs((x2 - x1) - step) <= tol for x1, x2 in pairwise(xp)):
+        return step
+    return None
+
+
+def _locate(x: float, xp: Sequence[float], step: float | None) -> tuple[int, float]:
+    """Find segment of `xp` containing `x` and relative position of `x` in it.
+
+    If `step` is set, segment is located with index arithmetic and then
+    corrected against actual breakpoints, otherwise bisect is used.
+    `x` is expected to be within [xp[0], xp[-1]].
+
+    Args:
+        x (float): x value
+        xp (Sequence[float]): ascending sample points, at least two
+        step (float | None): spacing of uniformly spaced `xp` or None
+
+    Returns:
+        tuple[int, float]: index of segment start and fraction in [0, 1]
+    """
+    last = len(xp) - 2
+    if step is not None:
+        pos = min(int((x - xp[0]) / step), last)
+        while pos > 0 and x < xp[pos]:
+            pos -= 1
+        while pos < last and x > xp[pos + 1]:
+            pos += 1
+    else:
+        pos = max(bisect_left(xp, x) - 1, 0)
+    x1, x2 = xp[pos], xp[pos + 1]
+    return pos, (x - x1) / (x2 - x1)
+
+
+class PLSurface:
+    """Representation of piecewise bilinear function defined on rectilinear grid."""
+
+    def __init__(
+        self,
+        xp: Sequence[float],
+        yp: Sequence[float],
+        values: Sequence[Sequence[float]],
+        uniform: bool = True,
+    ) -> None:
+        """Create PLSurface object.
+
+        `values[i][j]` is f(xp[i], yp[j]).
+
+        Args:
+            xp (Sequence[float]): ascending x grid points
+            yp (Sequence[float]): ascending y grid points
+            values (Sequence[Sequence[float]]): f(x, y) values, one row per x
+            uniform (bool, optional): use index arithmetic instead of bisect
+            for uniformly spaced axes. Defaults to True.
+
+        Raises:
+            ValueError: if any axis has less than two points
+            ValueError: if any axis is not strictly ascending
+            ValueError: if values shape does not match grid
+        """
+        if len(xp) < 2 or len(yp) < 2:
+            raise ValueError("at least two points per axis are required.")
+        if any(a >= b for a, b in pairwise(xp)) or any(a >= b for a, b in pairwise(yp)):
+            raise ValueError("grid points must be strictly ascending.")
+        if len(values) != len(xp) or any(len(row) != len(yp) for row in values):
+            raise ValueError("values shape does not match grid.")
+        self.xp = tuple(xp)
+        self.yp = tuple(yp)
+        self.values = tuple(tuple(row) for row in values)
+        self._x_step = _uniform_step(self.xp) if uniform else None
+        self._y_step = _uniform_step(self.yp) if uniform else None
+
+    @property
+    def min_x(self) -> float:
+        """Minimum x value.
+
+        Returns:
+            float: minimum x
+        """
+        return self.xp[0]
+
+    @property
+    def max_x(self) -> float:
+        """Maximum x value.
+
+        Returns:
+            float: maximum x
+        """
+        return self.xp[-1]
+
+    @property
+    def min_y(self) -> float:
+        """Minimum y value.
+
+        Returns:
+            float: minimum y
+        """
+        return self.yp[0]
+
+    @property
+    def max_y(self) -> float:
+        """Maximum y value.
+
+        Returns:
+            float: maximum y
+        """
+        return self.yp[-1]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.xp}, {self.yp}, {self.values})"
+
+    def __contains__(self, point: tuple[float, float]) -> bool:
+        x, y = point
+        return self.min_x <= x <= self.max_x and self.min_y <= y <= self.max_y
+
+    def __getitem__(self, point: tuple[float, float]) -> float:
+        """Get interpolated f(x, y).
+
+        Args:
+            point (tuple[float, float]): x, y pair
+
+        Raises:
+            KeyError: if point is outside of grid
+
+        Returns:
+            float: interpolated f(x, y)
+        """
+        if point not in self:
+            raise KeyError(
+                f"x should be in range {self.min_x} - {self.max_x}, "
+                f"y should be in range {self.min_y} - {self.max_y}"
+            )
+        return self._eval(*point)
+
+    def _eval(self, x: float, y: float) -> float:
+        i, tx = _locate(x, self.xp, self._x_step)
+        j, ty = _locate(y, self.yp, self._y_step)
+        row1, row2 = self.values[i], self.values[i + 1]
+        z1 = row1[j] + (row1[j + 1] - row1[j]) * ty
+        z2 = row2[j] + (row2[j + 1] - row2[j]) * ty
+        return z1 + (z2 - z1) * tx
+
+    def evaluate_many(self, xs: Sequence[float], ys: Sequence[float]) -> list[float]:
+        """Get interpolated f(x, y) for each pair of `xs` and `ys` items.
+
+        Args:
+            xs (Sequence[float]): x values
+            ys (Sequence[float]): y values
+
+        Raises:
+            ValueError: if xs and ys are not of the same length
+            KeyError: if any point is outside of grid
+
+        Returns:
+            list[float]: interpolated values
+        """
+        if len(xs) != len(ys):
+            raise ValueError("xs and ys are not of the same length.")
+        min_x, max_x, min_y, max_y = self.min_x, self.max_x, self.min_y, self.max_y
+        if not all(min_x <= x <= max_x for x in xs) or not all(
+            min_y <= y <= max_y for y in ys
+        ):
+            raise KeyError(
+                f"x should be in range {min_x} - {max_x}, "
+                f"y should be in range {min_y} - {max_y}"
+            )
+        evaluate = self._eval
+        return [evaluate(x, y) for x, y in zip(xs, ys)]
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import sys
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, NamedTuple
+from weakref import WeakValueDictionary
+
+from wbkit.basic import WBCalculator
+from wbkit.cglimits import CGLimits
+from wbkit.plfunc import PLFunction
+
+
+class Aircraft(NamedTuple):
+    calc: WBCalculator
+    limits: dict[str, CGLimits]
+
+
+class RegistryStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    shared: int
+    size: int
+    bytes: int
+
+
+def _line_bytes(line: PLFunction) -> int:
+    """Estimate memory used by PLFunction points.
+
+    Args:
+        line (PLFunction): line
+
+    Returns:
+        int: approximate size in bytes
+    """
+    return sys.getsizeof(line.points) + sum(
+        sys.getsizeof(p) + sys.getsizeof(p[0]) + sys.getsizeof(p[1])
+        for p in line.points
+    )
+
+
+class FleetRegistry:
+    """Lazily loaded, size-bounded LRU cache of per-aircraft configurations.
+
+    Calculators with equal constants and envelopes with equal lines are
+    shared between aircraft, so sister ships do not hold their own copies.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str], Aircraft],
+        max_size: int | None = 128,
+        max_bytes: int | None = None,
+    ) -> None:
+        """Create FleetRegistry object.
+
+        Args:
+            loader (Callable[[str], Aircraft]): function loading configuration
+            for given registration, called on first use
+            max_size (int | None, optional): maximum number of cached aircraft,
+            None for no limit. Defaults to 128.
+            max_bytes (int | None, optional): maximum estimated size of cached
+            envelopes in bytes, None for no limit. Envelopes shared between
+            aircraft are counted for each of them. Defaults to None.
+
+        Raises:
+            ValueError: if max size is not > 0
+            ValueError: if max bytes is not > 0
+        """
+        if max_size is not None and not max_size > 0:
+            raise ValueError("max size must be > 0")
+        if max_bytes is not None and not max_bytes > 0:
+            raise ValueError("max bytes must be > 0")
+        self.loader = loader
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+        self._cache: OrderedDict[str, tuple[Aircraft, int]] = OrderedDict()
+        self._bytes = 0
+        self._calcs: WeakValueDictionary[tuple, WBCalculator] = WeakValueDictionary()
+        self._limits: WeakValueDictionary[tuple, CGLimits] = WeakValueDictionary()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._shared = 0
+
+    def get(self, registration: str) -> Aircraft:
+        """Get aircraft configuration, loading it if it is not cached.
+
+        Args:
+            registration (str): aircraft registration
+
+        Returns:
+            Aircraft: aircraft configuration
+        """
+        with self._lock:
+            entry = self._cache.get(registration)
+            if entry is not None:
+                self._cache.move_to_end(registration)
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+        # loading is done without lock so that slow loads of different
+        # aircraft do not block each other
+        loaded = self.loader(registration)
+        with self._lock:
+            aircraft, size = self._intern(loaded)
+            if registration in self._cache:
+                self._bytes -= self._cache[registration][1]
+            self._cache[registration] = aircraft, size
+            self._cache.move_to_end(registration)
+            self._bytes += size
+            self._shrink()
+            return aircraft
+
+    __getitem__ = get
+
+    def _intern(self, aircraft: Aircraft) -> tuple[Aircraft, int]:
+        calc = aircraft.calc
+        calc_key = (calc.ref_st, calc.c, calc.k, calc.macrc, calc.lemac_at)
+        shared_calc = self._calcs.get(calc_key)
+        if shared_calc is None:
+            shared_calc = self._calcs[calc_key] = calc
+        else:
+            self._shared += 1
+        limits = {}
+        size = 0
+        for name, lim in aircraft.limits.items():
+            key = (lim.fwd.points, lim.aft.points)
+            shared = self._limits.get(key)
+            if shared is None:
+                shared = self._limits[key] = lim
+            else:
+                self._shared += 1
+            limits[name] = shared
+            size += _line_bytes(shared.fwd) + _line_bytes(shared.aft)
+        return Aircraft(shared_calc, limits), size
+
+    def _shrink(self) -> None:
+        while self._cache and (
+            (self.max_size is not None and len(self._cache) > self.max_size)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            if len(self._cache) == 1:
+                # never evict the entry that was just requested
+                break
+            _, (_, size) = self._cache.popitem(last=False)
+            self._bytes -= size
+            self._evictions += 1
+
+    def evict(self, registration: str) -> None:
+        """Drop aircraft configuration from cache, if present.
+
+        Args:
+            registration (str): aircraft registration
+        """
+        with self._lock:
+            entry = self._cache.pop(registration, None)
+            if entry is not None:
+                self._bytes -= entry[1]
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """Drop all cached configurations. Statistics are kept."""
+        with self._lock:
+            self._evictions += len(self._cache)
+            self._cache.clear()
+            self._bytes = 0
+
+    def __contains__(self, registration: str) -> bool:
+        return registration in self._cache
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @property
+    def stats(self) -> RegistryStats:
+        """Cache statistics.
+
+        Returns:
+            RegistryStats: hit, miss, eviction and shared object counts,
+            number of cached aircraft and their estimated size in bytes
+        """
+        with self._lock:
+            return RegistryStats(
+                self._hits,
+                self._misses,
+                self._evictions,
+                self._shared,
+                len(self._cache),
+                self._bytes,
+            )
@@ -0,0 +1,301 @@
+"""Asyncio weight and balance check service.
+
+Protocol is JSON lines: every request line is a record with `envelope`,
+`weight` and either `index` or `mac` fields and optional `id`, which is
+echoed back in response along with `verdict` and `margin`. Responses
+on a connection may come out of request order. Request `{"op": "stats"}`
+returns service statistics.
+
+Concurrent requests are coalesced into batches of up to `max_batch_size`
+records, waiting at most `max_wait` seconds for a batch to fill. Each
+connection has at most `max_pending` requests in flight; further lines
+are not read until a response is written.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import deque
+from contextlib import suppress
+from time import monotonic, perf_counter
+from typing import Any
+
+from wbkit.library import Envelope, check_records, json_safe
+
+
+class ServiceStats:
+    """Throughput and latency statistics of CheckService."""
+
+    def __init__(self, window: int = 10_000) -> None:
+        """Create ServiceStats object.
+
+        Args:
+            window (int, optional): number of most recent request latencies
+            to keep for percentiles. Defaults to 10_000.
+        """
+        self.started = monotonic()
+        self.requests = 0
+        self.batches = 0
+        self.latencies: deque[float] = deque(maxlen=window)
+
+    def add_batch(self, latencies: list[float]) -> None:
+        """Record processed batch.
+
+        Args:
+            latencies (list[float]): latency of each request in seconds
+        """
+        self.requests += len(latencies)
+        self.batches += 1
+        self.latencies.extend(latencies)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Get statistics as plain dict.
+
+        Returns:
+            dict[str, Any]: request and batch counts, mean batch size,
+            throughput in requests per second and latency percentiles
+            in milliseconds
+        """
+        latencies = sorted(self.latencies)
+
+        def percentile(p: float) -> float | None:
+            if not latencies:
+                return None
+            return latencies[min(int(p * len(latencies)), len(latencies) - 1)] * 1e3
+
+        elapsed = monotonic() - self.started
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch_size": self.requests / self.batches if self.batches else None,
+            "throughput": self.requests / elapsed if elapsed > 0 else None,
+            "latency_ms": {
+                "p50": percentile(0.5),
+                "p90": percentile(0.9),
+                "p99": percentile(0.99),
+                "max": latencies[-1] * 1e3 if latencies else None,
+            },
+        }
+
+
+class CheckService:
+    """Micro-batching CG check service holding envelope library in memory."""
+
+    def __init__(
+        self,
+        envelopes: dict[str, Envelope],
+        max_batch_size: int = 64,
+        max_wait: float = 0.001,
+        max_pending: int = 256,
+    ) -> None:
+        """Create CheckService object.
+
+        Args:
+            envelopes (dict[str, Envelope]): envelopes by id
+            max_batch_size (int, optional): maximum records per batch.
+            Defaults to 64.
+            max_wait (float, optional): maximum time in seconds to wait
+            for batch to fill. Defaults to 0.001.
+            max_pending (int, optional): maximum requests in flight
+            per connection. Defaults to 256.
+
+        Raises:
+            ValueError: if max batch size is not > 0
+            ValueError: if max wait is negative
+            ValueError: if max pending is not > 0
+        """
+        if not max_batch_size > 0:
+            raise ValueError("max batch size must be > 0")
+        if max_wait < 0:
+            raise ValueError("max wait must not be negative")
+        if not max_pending > 0:
+            raise ValueError("max pending must be > 0")
+        self.envelopes = envelopes
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.max_pending = max_pending
+        self.stats = ServiceStats()
+        self._queue: asyncio.Queue[
+            tuple[dict[str, Any], asyncio.Future[dict[str, Any]], float]
+        ] = asyncio.Queue()
+        self._worker: asyncio.Task[None] | None = None
+
+    async def check(self, record: dict[str, Any]) -> dict[str, Any]:
+        """Check single record as part of the next batch.
+
+        Args:
+            record (dict[str, Any]): record
+
+        Returns:
+            dict[str, Any]: record with `verdict` and `margin` added
+        """
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+        future: asyncio.Future[dict[str, Any]] = (
+            asyncio.get_running_loop().create_future()
+        )
+        await self._queue.put((record, future, perf_counter()))
+        return await future
+
+    async def _next_batch(
+        self,
+    ) -> list[tuple[dict[str, Any], asyncio.Future[dict[str, Any]], float]]:
+        queue = self._queue
+        batch = [await queue.get()]
+        waited = False
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(queue.get_nowait())
+            except asyncio.QueueEmpty:
+                if waited or self.max_wait == 0:
+                    break
+                await asyncio.sleep(self.max_wait)
+                waited = True
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            try:
+                results = check_records([r for r, _, _ in batch], self.envelopes)
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            now = perf_counter()
+            for (_, future, start), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+            self.stats.add_batch([now - start for _, _, start in batch])
+
+    async def _respond(
+        self, line: bytes, writer: asyncio.StreamWriter, lock: asyncio.Lock
+    ) -> None:
+        try:
+            request = json.loads(line)
+        except ValueError:
+            response: dict[str, Any] = {"error": "invalid JSON"}
+        else:
+            if not isinstance(request, dict):
+                response = {"error": "request must be a JSON object"}
+            elif request.get("op") == "stats":
+                response = self.stats.as_dict()
+            else:
+                result = await self.check(request)
+                response = {
+                    "id": request.get("id"),
+                    "verdict": result["verdict"],
+                    "margin": result["margin"],
+                }
+        data = json.dumps(json_safe(response)).encode() + b"\n"
+        # one writer at a time, so that a slow client holds up only
+        # its own responses
+        async with lock:
+            writer.write(data)
+            await writer.drain()
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve JSON lines connection.
+
+        Args:
+            reader (asyncio.StreamReader): connection reader
+            writer (asyncio.StreamWriter): connection writer
+        """
+        pending: set[asyncio.Task[None]] = set()
+        lock = asyncio.Lock()
+        # stop reading from a client that does not read its responses
+        slots = asyncio.Semaphore(self.max_pending)
+
+        def done(task: asyncio.Task[None]) -> None:
+            pending.discard(task)
+            slots.release()
+
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                await slots.acquire()
+                task = asyncio.create_task(self._respond(line, writer, lock))
+                pending.add(task)
+                task.add_done_callback(done)
+            if pending:
+                await asyncio.gather(*pending)
+        finally:
+            for task in pending:
+                task.cancel()
+            writer.close()
+            with suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.Server:
+        """Start serving on TCP socket.
+
+        Args:
+            host (str, optional): host. Defaults to "127.0.0.1".
+            port (int, optional): port, 0 for any free one. Defaults to 0.
+
+        Returns:
+            asyncio.Server: server
+        """
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def start_unix(self, path: str) -> asyncio.Server:
+        """Start serving on Unix socket.
+
+        Args:
+            path (str): socket path
+
+        Returns:
+            asyncio.Server: server
+        """
+        return await asyncio.start_unix_server(self.handle, path)
+
+    async def close(self) -> None:
+        """Stop batch processing."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+
+async def serve(
+    envelopes: dict[str, Envelope],
+    host: str = "127.0.0.1",
+    port: int = 0,
+    path: str | None = None,
+    max_batch_size: int = 64,
+    max_wait: float = 0.001,
+    max_pending: int = 256,
+) -> None:
+    """Run check service until cancelled.
+
+    Args:
+        envelopes (dict[str, Envelope]): envelopes by id
+        host (str, optional): TCP host. Defaults to "127.0.0.1".
+        port (int, optional): TCP port. Defaults to 0.
+        path (str | None, optional): Unix socket path, used instead
+        of TCP if set. Defaults to None.
+        max_batch_size (int, optional): maximum records per batch.
+        Defaults to 64.
+        max_wait (float, optional): maximum time in seconds to wait
+        for batch to fill. Defaults to 0.001.
+        max_pending (int, optional): maximum requests in flight
+        per connection. Defaults to 256.
+    """
+    service = CheckService(envelopes, max_batch_size, max_wait, max_pending)
+    if path is not None:
+        server = await service.start_unix(path)
+    else:
+        server = await service.start_tcp(host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
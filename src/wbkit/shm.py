@@ -0,0 +1,226 @@
+"""Envelope library in shared memory.
+
+`SharedLibrary.publish` packs breakpoints of every limit line into one
+`multiprocessing.shared_memory` block. Worker processes call
+`SharedLibrary.attach` with block name and get envelopes whose lines
+evaluate directly from the shared block, without copying or unpickling.
+
+Block layout: 8 bytes of header length, JSON header with calculator
+constants and line offsets, padding to 8 bytes, then float64 data where
+each line is stored as all x values followed by all f(x) values.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from array import array
+from multiprocessing import shared_memory
+from typing import Any, Sequence
+
+from wbkit.basic import WBCalculator
+from wbkit.cglimits import CGLimits
+from wbkit.library import Envelope
+from wbkit.plfunc import PLFunction
+
+_LENGTH_SIZE = 8
+
+
+class SharedPLFunction(PLFunction):
+    """Read-only PLFunction backed by shared memory. Its `xp` and `fp`
+    are float64 memoryviews into the shared block instead of tuples.
+    """
+
+    xp: Sequence[float]  # type: ignore[assignment]
+    fp: Sequence[float]  # type: ignore[assignment]
+
+    def __init__(self, xp: memoryview[float], fp: memoryview[float]) -> None:
+        """Create SharedPLFunction object. Data is not validated,
+        it is expected to come from a valid PLFunction.
+
+        Args:
+            xp (memoryview): float64 view of ascending x values
+            fp (memoryview): float64 view of f(x) values
+        """
+        self.xp = xp
+        self.fp = fp
+
+    @property
+    def points(self) -> tuple[tuple[float, float], ...]:
+        """Tuple of (x, f(x)) points, built on each access.
+
+        Returns:
+            tuple[tuple[float, float], ...]: all points
+        """
+        return tuple(zip(self.xp, self.fp))
+
+    @points.setter
+    def points(self, value: tuple[tuple[float, float], ...]) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickle as regular PLFunction, shared memory can not be pickled."""
+        reconstruct, (_, data) = super().__reduce__()
+        return reconstruct, (PLFunction, data)
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to existing block without making this process
+    responsible for unlinking it."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # before 3.13 attaching registers block with resource tracker, which is
+    # harmless for workers sharing publisher's tracker (multiprocessing pools)
+    return shared_memory.SharedMemory(name=name)
+
+
+class SharedLibrary:
+    """Envelope library stored in shared memory block."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool = False) -> None:
+        """Create SharedLibrary object from shared memory block.
+        Use `publish` and `attach` instead of calling this directly.
+
+        Args:
+            shm (shared_memory.SharedMemory): block with published library
+            owner (bool, optional): whether this object created the block.
+            Defaults to False.
+        """
+        self._shm = shm
+        self._owner = owner
+        self._views: list[memoryview[Any]] = []
+        buf = shm.buf
+        if buf is None:
+            raise ValueError("shared memory block is closed")
+        header_len = int.from_bytes(buf[:_LENGTH_SIZE], "little")
+        header = json.loads(bytes(buf[_LENGTH_SIZE : _LENGTH_SIZE + header_len]))
+        raw = self._view(buf[header["data_offset"] :])
+        data = self._view(self._view(raw.cast("d")).toreadonly())
+
+        calculators = {
+            name: WBCalculator(*params)
+            for name, params in header["calculators"].items()
+        }
+        lines: dict[int, SharedPLFunction] = {}
+
+        def line(offset: int, length: int) -> SharedPLFunction:
+            if offset not in lines:
+                xp = self._view(data[offset : offset + length])
+                fp = self._view(data[offset + length : offset + 2 * length])
+                lines[offset] = SharedPLFunction(xp, fp)
+            return lines[offset]
+
+        self.envelopes: dict[str, Envelope] = {
+            name: Envelope(
+                calculators[entry["calculator"]],
+                CGLimits._trusted(line(*entry["fwd"]), line(*entry["aft"])),
+                entry["unit"],
+            )
+            for name, entry in header["envelopes"].items()
+        }
+
+    def _view(self, view: memoryview[Any]) -> memoryview[Any]:
+        self._views.append(view)
+        return view
+
+    @classmethod
+    def publish(
+        cls, envelopes: dict[str, Envelope], name: str | None = None
+    ) -> SharedLibrary:
+        """Copy envelopes into new shared memory block. Lines and
+        calculators shared between envelopes are stored once.
+
+        Args:
+            envelopes (dict[str, Envelope]): envelopes by id
+            name (str | None, optional): block name. Defaults to None,
+            which means a random one.
+
+        Returns:
+            SharedLibrary: library owning the block
+        """
+        data = array("d")
+        offsets: dict[int, list[int]] = {}
+        calculators: dict[int, tuple[str, list[float]]] = {}
+        entries: dict[str, dict[str, Any]] = {}
+
+        def store(line: PLFunction) -> list[int]:
+            if id(line) not in offsets:
+                offsets[id(line)] = [len(data), len(line.xp)]
+                data.extend(line.xp)
+                data.extend(line.fp)
+            return offsets[id(line)]
+
+        for env_name, env in envelopes.items():
+            calc = env.calc
+            if id(calc) not in calculators:
+                params = [calc.ref_st, calc.c, calc.k, calc.macrc, calc.lemac_at]
+                calculators[id(calc)] = str(len(calculators)), params
+            entries[env_name] = {
+                "calculator": calculators[id(calc)][0],
+                "unit": env.unit,
+                "fwd": store(env.limits.fwd),
+                "aft": store(env.limits.aft),
+            }
+        header: dict[str, Any] = {
+            "calculators": dict(calculators.values()),
+            "envelopes": entries,
+        }
+        # data offset depends on header length, which depends on data offset
+        header["data_offset"] = 0
+        while True:
+            encoded = json.dumps(header).encode()
+            data_offset = -(-(_LENGTH_SIZE + len(encoded)) // 8) * 8
+            if data_offset == header["data_offset"]:
+                break
+            header["data_offset"] = data_offset
+        raw = data.tobytes()
+        shm = shared_memory.SharedMemory(
+            name=name, create=True, size=data_offset + len(raw)
+        )
+        buf = shm.buf
+        if buf is None:
+            raise ValueError("shared memory block is closed")
+        buf[:_LENGTH_SIZE] = len(encoded).to_bytes(_LENGTH_SIZE, "little")
+        buf[_LENGTH_SIZE : _LENGTH_SIZE + len(encoded)] = encoded
+        buf[data_offset : data_offset + len(raw)] = raw
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> SharedLibrary:
+        """Attach to library published by another process.
+
+        Args:
+            name (str): block name
+
+        Returns:
+            SharedLibrary: library
+        """
+        return cls(_attach(name))
+
+    @property
+    def name(self) -> str:
+        """Shared memory block name to pass to workers.
+
+        Returns:
+            str: block name
+        """
+        return self._shm.name
+
+    def close(self) -> None:
+        """Detach from shared memory block. Envelopes of this library
+        can not be evaluated afterwards. Block is removed
+        if this library has published it."""
+        self.envelopes = {}
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+            self._owner = False
+
+    def __enter__(self) -> SharedLibrary:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
@@ -0,0 +1,411 @@
+from __future__ import annotations
+
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, NamedTuple, Sequence
+
+from wbkit.basic import WBCalculator
+from wbkit.cglimits import CG, CGLimits
+
+
+class SimulationStats:
+    """Aggregate results of passenger distribution simulation."""
+
+    def __init__(self, hist_min: float, hist_max: float, bins: int) -> None:
+        """Create empty SimulationStats object.
+
+        Args:
+            hist_min (float): lower bound of index histogram
+            hist_max (float): upper bound of index histogram
+            bins (int): number of histogram bins
+
+        Raises:
+            ValueError: if histogram bounds are equal or in reverse order
+            ValueError: if number of bins is not > 0
+        """
+        if not hist_min < hist_max:
+            raise ValueError(f"incorrect histogram range {hist_min} - {hist_max}")
+        if not bins > 0:
+            raise ValueError("number of bins must be > 0")
+        self.hist_min = hist_min
+        self.hist_max = hist_max
+        self.trials = 0
+        self.in_limits = 0
+        self.exceeds_fwd = 0
+        self.exceeds_aft = 0
+        self.out_of_weight_range = 0
+        self.histogram = [0] * bins
+        self.underflow = 0
+        self.overflow = 0
+
+    @property
+    def exceedance_probability(self) -> float:
+        """Share of trials which ended up out of limits.
+
+        Returns:
+            float: exceedance probability, 0 if there were no trials
+        """
+        if self.trials == 0:
+            return 0.0
+        return 1 - self.in_limits / self.trials
+
+    @property
+    def bin_edges(self) -> tuple[float, ...]:
+        """Histogram bin edges.
+
+        Returns:
+            tuple[float, ...]: len(histogram) + 1 ascending edges
+        """
+        bins = len(self.histogram)
+        step = (self.hist_max - self.hist_min) / bins
+        return tuple(self.hist_min + i * step for i in range(bins + 1))
+
+    def add(self, value: float, limit_range: tuple[float, float] | None) -> None:
+        """Record single trial.
+
+        Args:
+            value (float): resulting index
+            limit_range (tuple[float, float] | None): limits
+            for resulting weight
+        """
+        self.trials += 1
+        if limit_range is None:
+            self.out_of_weight_range += 1
+        elif value < limit_range[0]:
+            self.exceeds_fwd += 1
+        elif value > limit_range[1]:
+            self.exceeds_aft += 1
+        else:
+            self.in_limits += 1
+        if value < self.hist_min:
+            self.underflow += 1
+        elif value >= self.hist_max:
+            if value == self.hist_max:
+                self.histogram[-1] += 1
+            else:
+                self.overflow += 1
+        else:
+            bins = len(self.histogram)
+            pos = int((value - self.hist_min) / (self.hist_max - self.hist_min) * bins)
+            self.histogram[min(pos, bins - 1)] += 1
+
+    def add_many(
+        self,
+        values: Sequence[float],
+        limit_ranges: Sequence[tuple[float, float] | None],
+    ) -> None:
+        """Record many trials, same as calling `add` for each of them.
+
+        Args:
+            values (Sequence[float]): resulting indexes
+            limit_ranges (Sequence[tuple[float, float] | None]): limits
+            for resulting weights
+        """
+        hist_min, hist_max, histogram = self.hist_min, self.hist_max, self.histogram
+        bins = len(histogram)
+        scale = bins / (hist_max - hist_min)
+        fwd = aft = out = underflow = overflow = 0
+        for value, limit_range in zip(values, limit_ranges):
+            if limit_range is None:
+                out += 1
+            elif value < limit_range[0]:
+                fwd += 1
+            elif value > limit_range[1]:
+                aft += 1
+            if value < hist_min:
+                underflow += 1
+            elif value < hist_max:
+                histogram[min(int((value - hist_min) * scale), bins - 1)] += 1
+            elif value == hist_max:
+                histogram[-1] += 1
+            else:
+                overflow += 1
+        trials = len(values)
+        self.trials += trials
+        self.in_limits += trials - fwd - aft - out
+        self.exceeds_fwd += fwd
+        self.exceeds_aft += aft
+        self.out_of_weight_range += out
+        self.underflow += underflow
+        self.overflow += overflow
+
+    def merge(self, other: SimulationStats) -> SimulationStats:
+        """Add results of other SimulationStats object to this one.
+
+        Args:
+            other (SimulationStats): stats with the same histogram layout
+
+        Raises:
+            ValueError: if histogram layouts differ
+
+        Returns:
+            SimulationStats: self
+        """
+        if (self.hist_min, self.hist_max, len(self.histogram)) != (
+            other.hist_min,
+            other.hist_max,
+            len(other.histogram),
+        ):
+            raise ValueError("histogram layouts differ")
+        self.trials += other.trials
+        self.in_limits += other.in_limits
+        self.exceeds_fwd += other.exceeds_fwd
+        self.exceeds_aft += other.exceeds_aft
+        self.out_of_weight_range += other.out_of_weight_range
+        self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        return self
+
+    def copy(self) -> SimulationStats:
+        """Get independent copy of this object.
+
+        Returns:
+            SimulationStats: copy
+        """
+        stats = SimulationStats(self.hist_min, self.hist_max, len(self.histogram))
+        return stats.merge(self)
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(trials={self.trials}, "
+            f"exceedance_probability={self.exceedance_probability})"
+        )
+
+
+class _Task(NamedTuple):
+    base: CG
+    arms: tuple[float, ...]
+    squares: tuple[float, ...]
+    passengers: int
+    weight_mean: float
+    weight_sd: float
+    limits: CGLimits
+    hist_min: float
+    hist_max: float
+    bins: int
+    seed: int
+
+
+def _seat_sums(
+    rng: random.Random, task: _Task, trials: int
+) -> tuple[list[float], list[float]]:
+    """Sample seat sets and sum arms and squared arms of taken seats.
+
+    Seats are picked by partial Fisher-Yates shuffle of a seat pool kept
+    between trials. When more than half of seats are taken, empty seats
+    are picked instead and their sums are subtracted from totals.
+
+    Args:
+        rng (random.Random): random generator
+        task (_Task): simulation parameters
+        trials (int): number of trials
+
+    Returns:
+        tuple[list[float], list[float]]: sums of arms and of squared arms
+        for each trial
+    """
+    arms, squares = task.arms, task.squares
+    seats = len(arms)
+    empty = 2 * task.passengers > seats
+    picks = seats - task.passengers if empty else task.passengers
+    pool = list(range(seats))
+    # position to swap into and number of seats left to pick from
+    steps = [(i, seats - i) for i in range(picks)]
+    rand, arm_of, square_of = rng.random, arms.__getitem__, squares.__getitem__
+    arm_sums, square_sums = [], []
+    for _ in range(trials):
+        for i, left in steps:
+            j = i + int(rand() * left)
+            pool[i], pool[j] = pool[j], pool[i]
+        picked = pool[:picks]
+        arm_sums.append(sum(map(arm_of, picked)))
+        square_sums.append(sum(map(square_of, picked)))
+    if empty:
+        arm_total, square_total = math.fsum(arms), math.fsum(squares)
+        arm_sums = [arm_total - a for a in arm_sums]
+        square_sums = [square_total - a for a in square_sums]
+    return arm_sums, square_sums
+
+
+def _run_chunk(task: _Task, chunk: int, trials: int) -> SimulationStats:
+    """Simulate trials of a single chunk.
+
+    Random generator is seeded with both task seed and chunk number,
+    so results do not depend on how chunks are spread over processes.
+
+    Passenger weights are not drawn one by one. For given seats with
+    arms a_i and weights mean + sd * z_i, index and total weight
+    depend on z only through S = sum(z_i * a_i) and T = sum(z_i),
+    which are jointly normal with var(S) = sum(a_i^2), var(T) = n
+    and cov(S, T) = sum(a_i). Each trial draws S and T from two
+    standard normal values, which gives exactly the same distribution
+    as drawing every passenger weight.
+
+    Args:
+        task (_Task): simulation parameters
+        chunk (int): chunk number
+        trials (int): number of trials
+
+    Returns:
+        SimulationStats: chunk results
+    """
+    rng = random.Random(f"{task.seed}:{chunk}")
+    stats = SimulationStats(task.hist_min, task.hist_max, task.bins)
+    passengers = task.passengers
+    base_idx, base_weight = task.base.value, task.base.weight
+    mean, sd = task.weight_mean, task.weight_sd
+    arm_sums, square_sums = _seat_sums(rng, task, trials)
+    if sd == 0 or passengers == 0:
+        # total weight does not change between trials
+        limit_range = task.limits.limit_range(base_weight + mean * passengers)
+        stats.add_many(
+            [base_idx + mean * arm_sum for arm_sum in arm_sums], [limit_range] * trials
+        )
+        return stats
+    gauss, sqrt = rng.gauss, math.sqrt
+    root = sqrt(passengers)
+    weight_sd = sd * root
+    mean_weight = base_weight + mean * passengers
+    values, weights = [], []
+    for arm_sum, square_sum in zip(arm_sums, square_sums):
+        z1, z2 = gauss(0.0, 1.0), gauss(0.0, 1.0)
+        # Cholesky factor of S, T covariance, variance of S not explained
+        # by T is never negative, apart from rounding
+        rest = square_sum - arm_sum * arm_sum / passengers
+        spread = arm_sum / root * z1 + (sqrt(rest) * z2 if rest > 0 else 0.0)
+        values.append(base_idx + mean * arm_sum + sd * spread)
+        weights.append(mean_weight + weight_sd * z1)
+    stats.add_many(values, task.limits.limit_ranges(weights))
+    return stats
+
+
+def simulate_iter(
+    base: CG,
+    seats: Sequence[float],
+    passengers: int,
+    weight_mean: float,
+    calc: WBCalculator,
+    limits: CGLimits,
+    trials: int,
+    weight_sd: float = 0.0,
+    chunk_size: int = 10_000,
+    workers: int = 1,
+    seed: int = 0,
+    hist_range: tuple[float, float] | None = None,
+    bins: int = 50,
+) -> Iterator[SimulationStats]:
+    """Simulate random free seating of passengers and yield accumulated
+    results as chunks of trials complete.
+
+    Each trial seats `passengers` passengers on randomly chosen distinct
+    seats, with weights drawn from normal distribution if `weight_sd`
+    is set, and checks resulting CG against limits. CG weight outside
+    of limits weight range is counted as out of limits.
+
+    A single process runs about 4 µs per trial with 60 of 72 seats taken,
+    and about 6 µs with `weight_sd` set, so a million trials take
+    4 - 6 seconds, divided roughly by the number of workers.
+
+    Args:
+        base (CG): index and weight of aircraft without passengers
+        seats (Sequence[float]): seat stations
+        passengers (int): number of passengers
+        weight_mean (float): mean passenger weight
+        calc (WBCalculator): calculator used for index calculation
+        limits (CGLimits): limits to check against
+        trials (int): number of trials
+        weight_sd (float, optional): passenger weight standard deviation.
+        Defaults to 0.0.
+        chunk_size (int, optional): trials per chunk. Defaults to 10_000.
+        workers (int, optional): number of processes. Defaults to 1.
+        seed (int, optional): random seed. Defaults to 0.
+        hist_range (tuple[float, float] | None, optional): index histogram
+        bounds. Defaults to range between lowest forward and highest aft limit.
+        bins (int, optional): number of histogram bins. Defaults to 50.
+
+    Raises:
+        ValueError: if there are more passengers than seats
+        ValueError: if chunk size is not > 0
+
+    Yields:
+        Iterator[SimulationStats]: accumulated results after each chunk,
+        or empty results once if there are no trials
+    """
+    if passengers > len(seats):
+        raise ValueError("more passengers than seats")
+    if not chunk_size > 0:
+        raise ValueError("chunk size must be > 0")
+    hist_min, hist_max = (
+        (limits.fwd.min_f, limits.aft.max_f) if hist_range is None else hist_range
+    )
+    arms = tuple(calc.calc_idx(1, st) - calc.k for st in seats)
+    task = _Task(
+        base=base,
+        arms=arms,
+        squares=tuple(a * a for a in arms),
+        passengers=passengers,
+        weight_mean=weight_mean,
+        weight_sd=weight_sd,
+        limits=limits,
+        hist_min=hist_min,
+        hist_max=hist_max,
+        bins=bins,
+        seed=seed,
+    )
+    total = SimulationStats(hist_min, hist_max, bins)
+    sizes = [chunk_size] * (trials // chunk_size)
+    if trials % chunk_size:
+        sizes.append(trials % chunk_size)
+    if not sizes:
+        yield total.copy()
+        return
+    chunks = range(len(sizes))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for stats in pool.map(_run_chunk, [task] * len(sizes), chunks, sizes):
+                yield total.merge(stats).copy()
+    else:
+        for chunk, size in zip(chunks, sizes):
+            yield total.merge(_run_chunk(task, chunk, size)).copy()
+
+
+def simulate(
+    base: CG,
+    seats: Sequence[float],
+    passengers: int,
+    weight_mean: float,
+    calc: WBCalculator,
+    limits: CGLimits,
+    trials: int,
+    weight_sd: float = 0.0,
+    chunk_size: int = 10_000,
+    workers: int = 1,
+    seed: int = 0,
+    hist_range: tuple[float, float] | None = None,
+    bins: int = 50,
+) -> SimulationStats:
+    """Simulate random free seating of passengers.
+    See `simulate_iter` for details.
+
+    Returns:
+        SimulationStats: results of all trials
+    """
+    for stats in simulate_iter(
+        base,
+        seats,
+        passengers,
+        weight_mean,
+        calc,
+        limits,
+        trials,
+        weight_sd,
+        chunk_size,
+        workers,
+        seed,
+        hist_range,
+        bins,
+    ):
+        pass
+    return stats
@@ -0,0 +1,152 @@
+"""Fuel burn CG trajectories.
+
+Fuel index curve gives index change caused by fuel weight in tanks.
+Between its breakpoints tanks are used in a fixed sequence, so both
+weight and index change linearly with burned fuel and the CG path is
+a straight line in weight-index space. `fuel_trajectory` yields the
+path only at breakpoints, and `check_path` checks it against limits
+segment by segment without materializing the path.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator, Literal, NamedTuple
+
+from wbkit.basic import WBCalculator
+from wbkit.cglimits import CG, CGLimits
+from wbkit.plfunc import PLFunction
+
+
+class TrajectoryPoint(NamedTuple):
+    fuel: float
+    weight: float
+    idx: float
+    mac: float
+
+
+class Exceedance(NamedTuple):
+    weight: float
+    idx: float
+    limit: Literal["fwd", "aft", "weight"]
+
+
+def fuel_trajectory(
+    takeoff: CG,
+    takeoff_fuel: float,
+    fuel_index: PLFunction,
+    calc: WBCalculator,
+    landing_fuel: float = 0,
+) -> Iterator[TrajectoryPoint]:
+    """Lazily generate CG path from takeoff to landing.
+
+    Points are yielded at takeoff fuel, at every fuel index breakpoint
+    in between, in burn order, and at landing fuel. Path is straight
+    between consecutive points.
+
+    Args:
+        takeoff (CG): takeoff CG, index and weight
+        takeoff_fuel (float): fuel weight at takeoff
+        fuel_index (PLFunction): index change by fuel weight in tanks
+        calc (WBCalculator): calculator used for %MAC
+        landing_fuel (float, optional): fuel weight at landing. Defaults to 0.
+
+    Raises:
+        ValueError: if takeoff or landing fuel is outside of fuel index range
+        ValueError: if landing fuel exceeds takeoff fuel
+        ValueError: if takeoff fuel exceeds takeoff weight
+
+    Returns:
+        Iterator[TrajectoryPoint]: path points in burn order
+    """
+    if takeoff_fuel not in fuel_index or landing_fuel not in fuel_index:
+        raise ValueError(
+            f"fuel should be in range {fuel_index.min_x} - {fuel_index.max_x}"
+        )
+    if landing_fuel > takeoff_fuel:
+        raise ValueError("landing fuel must not exceed takeoff fuel")
+    if takeoff_fuel > takeoff.weight:
+        raise ValueError("takeoff fuel must not exceed takeoff weight")
+    return _trajectory(takeoff, takeoff_fuel, fuel_index, calc, landing_fuel)
+
+
+def _trajectory(
+    takeoff: CG,
+    takeoff_fuel: float,
+    fuel_index: PLFunction,
+    calc: WBCalculator,
+    landing_fuel: float,
+) -> Iterator[TrajectoryPoint]:
+    # weight and index without any fuel
+    dry_weight = takeoff.weight - takeoff_fuel
+    dry_index = takeoff.value - fuel_index[takeoff_fuel]
+
+    def point(fuel: float, fuel_idx: float) -> TrajectoryPoint:
+        weight = dry_weight + fuel
+        index = dry_index + fuel_idx
+        return TrajectoryPoint(fuel, weight, index, calc.mac_from_idx(index, weight))
+
+    yield TrajectoryPoint(
+        takeoff_fuel,
+        takeoff.weight,
+        takeoff.value,
+        calc.mac_from_idx(takeoff.value, takeoff.weight),
+    )
+    xp, fp = fuel_index.xp, fuel_index.fp
+    for i in range(
+        bisect_left(xp, takeoff_fuel) - 1, bisect_right(xp, landing_fuel) - 1, -1
+    ):
+        yield point(xp[i], fp[i])
+    if landing_fuel != takeoff_fuel:
+        yield point(landing_fuel, fuel_index[landing_fuel])
+
+
+def check_path(path: Iterable[TrajectoryPoint], limits: CGLimits) -> Exceedance | None:
+    """Check straight-segment CG path against limits.
+
+    Between path points the path is checked at every limit breakpoint,
+    so the result holds for the whole path, not just its points. Path is
+    consumed only up to the first exceedance.
+
+    Args:
+        path (Iterable[TrajectoryPoint]): path points, see `fuel_trajectory`
+        limits (CGLimits): limits in index
+
+    Returns:
+        Exceedance | None: first checked point out of limits, None
+        if the whole path is in limits
+    """
+    cursor = limits.cursor()
+    breakpoints = sorted({*limits.fwd.xp, *limits.aft.xp})
+
+    def exceedance(weight: float, index: float) -> Exceedance | None:
+        limit_range = cursor.limit_range(weight)
+        if limit_range is None:
+            return Exceedance(weight, index, "weight")
+        fwd, aft = limit_range
+        if index < fwd:
+            return Exceedance(weight, index, "fwd")
+        if index > aft:
+            return Exceedance(weight, index, "aft")
+        return None
+
+    prev: TrajectoryPoint | None = None
+    for pt in path:
+        if prev is not None and pt.weight != prev.weight:
+            w1, w2 = prev.weight, pt.weight
+            slope = (pt.idx - prev.idx) / (w2 - w1)
+            # limit breakpoints strictly between path points
+            lo = bisect_right(breakpoints, min(w1, w2))
+            hi = bisect_left(breakpoints, max(w1, w2))
+            inner = breakpoints[lo:hi]
+            if w2 < w1:
+                inner.reverse()
+            for w in inner:
+                found = exceedance(w, prev.idx + (w - w1) * slope)
+                if found is not None:
+                    return found
+        found = exceedance(pt.weight, pt.idx)
+        if found is not None:
+            return found
+        prev = pt
+    return None
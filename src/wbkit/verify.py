@@ -0,0 +1,381 @@
+"""Differential verification of evaluation paths.
+
+Faster evaluators must give exactly the same results as the reference
+pure-Python path, including exceptions for out of range values and
+`defined_f` tie-breaking at midpoints between breakpoints. `compare`
+runs reference and candidate side by side and reports the largest
+difference and the first mismatch. `SampledCheck` does the same for a
+random sample of production calls.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import struct
+from threading import Lock
+from typing import Any, Callable, Iterable, NamedTuple, Sequence
+
+from wbkit.cglimits import CGLimits
+from wbkit.plfunc import PLFunction
+
+
+class Mismatch(NamedTuple):
+    x: Any
+    expected: Any
+    actual: Any
+
+
+class VerifyReport(NamedTuple):
+    checked: int
+    mismatches: int
+    max_abs_diff: float
+    max_ulp_diff: int
+    first_mismatch: Mismatch | None
+
+    @property
+    def ok(self) -> bool:
+        """Whether no mismatches were found.
+
+        Returns:
+            bool: True if all results matched
+        """
+        return self.mismatches == 0
+
+
+def _ordered(value: float) -> int:
+    bits = struct.unpack("<q", struct.pack("<d", value))[0]
+    return bits if bits >= 0 else -(bits & 0x7FFF_FFFF_FFFF_FFFF)
+
+
+def ulp_distance(a: float, b: float) -> int:
+    """Number of representable doubles between two finite values.
+
+    Args:
+        a (float): first value
+        b (float): second value
+
+    Returns:
+        int: distance in units in the last place, 0 for equal values
+    """
+    return abs(_ordered(a) - _ordered(b))
+
+
+class _Outcome(NamedTuple):
+    value: Any
+    error: BaseException | None
+
+    def __repr__(self) -> str:
+        if self.error is not None:
+            return f"{type(self.error).__name__}({self.error})"
+        return repr(self.value)
+
+
+def _outcome(func: Callable[[Any], Any], x: Any) -> _Outcome:
+    try:
+        return _Outcome(func(x), None)
+    except Exception as e:
+        return _Outcome(None, e)
+
+
+def _numbers(value: Any) -> tuple[float, ...] | None:
+    if value is None:
+        return ()
+    if isinstance(value, (int, float)):
+        return (value,)
+    if isinstance(value, tuple) and all(isinstance(v, (int, float)) for v in value):
+        return value
+    return None
+
+
+class _Tally:
+    """Running comparison statistics."""
+
+    def __init__(self, max_ulps: int) -> None:
+        self.max_ulps = max_ulps
+        self.checked = 0
+        self.mismatches = 0
+        self.max_abs_diff = 0.0
+        self.max_ulp_diff = 0
+        self.first_mismatch: Mismatch | None = None
+
+    def add(self, x: Any, expected: _Outcome, actual: _Outcome) -> Mismatch | None:
+        self.checked += 1
+        if not self._matches(expected, actual):
+            self.mismatches += 1
+            mismatch = Mismatch(x, expected, actual)
+            if self.first_mismatch is None:
+                self.first_mismatch = mismatch
+            return mismatch
+        return None
+
+    def _matches(self, expected: _Outcome, actual: _Outcome) -> bool:
+        if expected.error is not None or actual.error is not None:
+            return type(expected.error) is type(actual.error)
+        exp, act = _numbers(expected.value), _numbers(actual.value)
+        if exp is None or act is None:
+            return bool(expected.value == actual.value)
+        if len(exp) != len(act) or (exp == () and actual.value != expected.value):
+            return False
+        ok = True
+        for e, a in zip(exp, act):
+            if math.isnan(e) or math.isnan(a):
+                ok = ok and math.isnan(e) and math.isnan(a)
+                continue
+            if math.isinf(e) or math.isinf(a):
+                ok = ok and e == a
+                continue
+            ulps = ulp_distance(e, a)
+            self.max_abs_diff = max(self.max_abs_diff, abs(e - a))
+            self.max_ulp_diff = max(self.max_ulp_diff, ulps)
+            ok = ok and ulps <= self.max_ulps
+        return ok
+
+    def report(self) -> VerifyReport:
+        return VerifyReport(
+            self.checked,
+            self.mismatches,
+            self.max_abs_diff,
+            self.max_ulp_diff,
+            self.first_mismatch,
+        )
+
+
+def compare(
+    reference: Callable[[Any], Any],
+    inputs: Iterable[Any],
+    candidate: Callable[[Any], Any] | None = None,
+    candidate_many: Callable[[list[Any]], Sequence[Any]] | None = None,
+    max_ulps: int = 0,
+) -> VerifyReport:
+    """Evaluate reference and candidate on every input and compare results.
+
+    Results match if both calls raise exceptions of the same type, or if
+    they return equal values, numbers (or tuples of numbers) being allowed
+    to differ by `max_ulps`. NaN matches NaN. Exactly one of `candidate`
+    and `candidate_many` must be given.
+
+    Args:
+        reference (Callable[[Any], Any]): reference evaluation of single input
+        inputs (Iterable[Any]): inputs
+        candidate (Callable[[Any], Any] | None, optional): evaluation of
+        single input to verify. Defaults to None.
+        candidate_many (Callable[[list[Any]], Sequence[Any]] | None, optional):
+        batch evaluation to verify, its exceptions are not caught.
+        Defaults to None.
+        max_ulps (int, optional): allowed difference in units in the last
+        place. Defaults to 0.
+
+    Raises:
+        ValueError: if not exactly one candidate is given
+        ValueError: if batch candidate returns wrong number of results
+
+    Returns:
+        VerifyReport: number of checked inputs and mismatches, maximum
+        absolute and ULP difference and first mismatch
+    """
+    if (candidate is None) == (candidate_many is None):
+        raise ValueError("exactly one of candidate and candidate_many is required")
+    inputs = list(inputs)
+    if candidate_many is not None:
+        actual = [_Outcome(v, None) for v in candidate_many(inputs)]
+        if len(actual) != len(inputs):
+            raise ValueError("candidate_many returned wrong number of results")
+    else:
+        actual = [_outcome(candidate, x) for x in inputs]  # type: ignore[arg-type]
+    tally = _Tally(max_ulps)
+    for x, act in zip(inputs, actual):
+        tally.add(x, _outcome(reference, x), act)
+    return tally.report()
+
+
+def edge_inputs(xp: Sequence[float]) -> list[float]:
+    """Adversarial inputs for breakpoints `xp`: the breakpoints, midpoints
+    between them, their floating point neighbours and values just
+    outside of the range.
+
+    Args:
+        xp (Sequence[float]): ascending breakpoints
+
+    Returns:
+        list[float]: sorted unique inputs
+    """
+    values: set[float] = set()
+    for x in xp:
+        values.update((x, math.nextafter(x, -math.inf), math.nextafter(x, math.inf)))
+    for x1, x2 in zip(xp, xp[1:]):
+        mid = (x1 + x2) / 2
+        values.update(
+            (mid, math.nextafter(mid, -math.inf), math.nextafter(mid, math.inf))
+        )
+    span = xp[-1] - xp[0] or 1.0
+    values.update((xp[0] - span, xp[-1] + span))
+    return sorted(values)
+
+
+def random_inputs(
+    lower: float, upper: float, count: int, seed: int | None = 0
+) -> list[float]:
+    """Random inputs, mostly within [lower, upper] and about a tenth
+    of them outside.
+
+    Args:
+        lower (float): lower bound
+        upper (float): upper bound
+        count (int): number of inputs
+        seed (int | None, optional): random seed. Defaults to 0.
+
+    Returns:
+        list[float]: inputs
+    """
+    rng = random.Random(seed)
+    margin = (upper - lower or 1.0) * 0.05
+    return [
+        (
+            rng.uniform(lower - margin, upper + margin)
+            if rng.random() < 0.1
+            else rng.uniform(lower, upper)
+        )
+        for _ in range(count)
+    ]
+
+
+def verify_line(
+    line: PLFunction,
+    candidate: Callable[[float], float] | None = None,
+    candidate_many: Callable[[list[float]], Sequence[float]] | None = None,
+    defined: bool = False,
+    count: int = 1000,
+    seed: int | None = 0,
+    max_ulps: int = 0,
+) -> VerifyReport:
+    """Verify evaluation of line against plain `PLFunction` with same points.
+
+    Args:
+        line (PLFunction): line
+        candidate (Callable[[float], float] | None, optional): evaluation
+        to verify. Defaults to None, which means `line[x]`
+        or `line.defined_f(x)`.
+        candidate_many (Callable[[list[float]], Sequence[float]] | None,
+        optional): batch evaluation to verify. Defaults to None.
+        defined (bool, optional): compare against `defined_f` instead of
+        interpolation. Defaults to False.
+        count (int, optional): number of random inputs added to edge cases.
+        Defaults to 1000.
+        seed (int | None, optional): random seed. Defaults to 0.
+        max_ulps (int, optional): allowed difference in units in the last
+        place. Defaults to 0.
+
+    Returns:
+        VerifyReport: verification report
+    """
+    ref = PLFunction(line.points)
+    reference = ref.defined_f if defined else ref.__getitem__
+    if candidate is None and candidate_many is None:
+        candidate = line.defined_f if defined else line.__getitem__
+    inputs = edge_inputs(ref.xp) + random_inputs(ref.min_x, ref.max_x, count, seed)
+    return compare(reference, inputs, candidate, candidate_many, max_ulps)
+
+
+def verify_limits(
+    limits: CGLimits,
+    candidate: Callable[[float], tuple[float, float] | None] | None = None,
+    candidate_many: (
+        Callable[[list[float]], Sequence[tuple[float, float] | None]] | None
+    ) = None,
+    count: int = 1000,
+    seed: int | None = 0,
+    max_ulps: int = 0,
+) -> VerifyReport:
+    """Verify limit ranges against `CGLimits.limit_range` of plain lines.
+
+    Args:
+        limits (CGLimits): limits
+        candidate (Callable[[float], tuple[float, float] | None] | None,
+        optional): evaluation to verify. Defaults to None.
+        candidate_many (Callable[[list[float]],
+        Sequence[tuple[float, float] | None]] | None, optional): batch
+        evaluation to verify. Defaults to None, which means
+        `limits.limit_ranges` if no candidate is given.
+        count (int, optional): number of random inputs added to edge cases.
+        Defaults to 1000.
+        seed (int | None, optional): random seed. Defaults to 0.
+        max_ulps (int, optional): allowed difference in units in the last
+        place. Defaults to 0.
+
+    Returns:
+        VerifyReport: verification report
+    """
+    ref = CGLimits(PLFunction(limits.fwd.points), PLFunction(limits.aft.points))
+    if candidate is None and candidate_many is None:
+        candidate_many = limits.limit_ranges
+    weights = sorted({*ref.fwd.xp, *ref.aft.xp})
+    inputs = edge_inputs(weights) + random_inputs(
+        ref.min_weight, ref.max_weight, count, seed
+    )
+    return compare(ref.limit_range, inputs, candidate, candidate_many, max_ulps)
+
+
+class SampledCheck:
+    """Callable wrapper checking a random sample of calls against reference.
+
+    Candidate result (or exception) is always returned to the caller.
+    """
+
+    def __init__(
+        self,
+        candidate: Callable[[Any], Any],
+        reference: Callable[[Any], Any],
+        rate: float = 0.01,
+        max_ulps: int = 0,
+        on_mismatch: Callable[[Mismatch], None] | None = None,
+        seed: int | None = None,
+    ) -> None:
+        """Create SampledCheck object.
+
+        Args:
+            candidate (Callable[[Any], Any]): evaluation to verify
+            reference (Callable[[Any], Any]): reference evaluation
+            rate (float, optional): fraction of calls to verify.
+            Defaults to 0.01.
+            max_ulps (int, optional): allowed difference in units in the last
+            place. Defaults to 0.
+            on_mismatch (Callable[[Mismatch], None] | None, optional):
+            called for each mismatch found. Defaults to None.
+            seed (int | None, optional): random seed. Defaults to None.
+
+        Raises:
+            ValueError: if rate is not within [0, 1]
+        """
+        if not 0 <= rate <= 1:
+            raise ValueError("rate must be within [0, 1]")
+        self.candidate = candidate
+        self.reference = reference
+        self.rate = rate
+        self.on_mismatch = on_mismatch
+        self._random = random.Random(seed)
+        self._lock = Lock()
+        self._tally = _Tally(max_ulps)
+
+    def __call__(self, x: Any) -> Any:
+        if self._random.random() >= self.rate:
+            return self.candidate(x)
+        actual = _outcome(self.candidate, x)
+        expected = _outcome(self.reference, x)
+        with self._lock:
+            mismatch = self._tally.add(x, expected, actual)
+        if mismatch is not None and self.on_mismatch is not None:
+            self.on_mismatch(mismatch)
+        if actual.error is not None:
+            raise actual.error
+        return actual.value
+
+    @property
+    def report(self) -> VerifyReport:
+        """Statistics of verified calls so far.
+
+        Returns:
+            VerifyReport: verification report
+        """
+        with self._lock:
+            return self._tally.report()
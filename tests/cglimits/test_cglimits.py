@@ -1,6 +1,13 @@
+import pickle
+import random
+
 import pytest
-from wbkit.cglimits import CG, CGLimits
-from wbkit.plfunc import PLFunction
+from wbkit.basic import WBCalculator
+from wbkit.builder import CGLimitsBuilder
+from wbkit.cglimits import CG, CGLimits, CGLimitsCursor
+from wbkit.convert import limits_idx_to_mac, limits_mac_to_idx
+from wbkit.plfunc import FrozenPLFunction, PLFunction
+from wbkit.verify import verify_limits
 
 
 class TestInit:
@@ -22,6 +29,12 @@ class TestInit:
         with pytest.raises(ValueError, match="make sure order of lines is fwd, aft"):
             CGLimits(zfw_aft_line, zfw_fwd_line)
 
+    def test_touching_lines(self):
+        limits = CGLimits(
+            PLFunction([(0, 0), (5, 10), (10, 0)]), PLFunction([(0, 10), (10, 10)])
+        )
+        assert limits.limit_range(5) == (10, 10)
+
     def test_intersecting_lines(self):
         with pytest.raises(
             ValueError, match="fwd_line and aft_line should not overlap"
@@ -128,3 +141,156 @@ class TestCGExceedsAft:
 
     def test_bad_weight_idx(self, zfw_cglimits: CGLimits, bad_weight_idx: CG):
         assert zfw_cglimits.cg_exceeds_aft(bad_weight_idx)
+
+
+class TestRanges:
+    def test_matches_limit_range(self, zfw_cglimits: CGLimits):
+        weights = [13000, 13608, 14000, 15190, 17841, 19958, 20000]
+        assert zfw_cglimits.limit_ranges(weights) == [
+            zfw_cglimits.limit_range(w) for w in weights
+        ]
+
+    def test_empty(self, zfw_cglimits: CGLimits):
+        assert zfw_cglimits.limit_ranges([]) == []
+
+
+class TestFreeze:
+    def test_freeze(self, zfw_cglimits: CGLimits, good_idx: CG):
+        frozen = zfw_cglimits.freeze()
+        assert isinstance(frozen.fwd, FrozenPLFunction)
+        assert isinstance(frozen.aft, FrozenPLFunction)
+        assert frozen.limit_range(17841) == zfw_cglimits.limit_range(17841)
+        assert good_idx in frozen
+
+
+class TestPickle:
+    def test_round_trip(self, zfw_cglimits: CGLimits, good_idx: CG):
+        restored = pickle.loads(pickle.dumps(zfw_cglimits))
+        assert type(restored) is CGLimits
+        assert restored.fwd.points == zfw_cglimits.fwd.points
+        assert restored.aft.points == zfw_cglimits.aft.points
+        assert restored.limit_range(17841) == zfw_cglimits.limit_range(17841)
+        assert good_idx in restored
+
+    def test_frozen_round_trip(self, zfw_cglimits: CGLimits):
+        restored = pickle.loads(pickle.dumps(zfw_cglimits.freeze()))
+        assert isinstance(restored.fwd, FrozenPLFunction)
+        assert isinstance(restored.aft, FrozenPLFunction)
+
+
+class TestCursor:
+    def test_same_as_limit_range(self, zfw_cglimits: CGLimits):
+        weights = [*range(13000, 20500, 50), *range(20500, 13000, -70), 15000, 14000]
+        cursor = zfw_cglimits.cursor()
+        assert isinstance(cursor, CGLimitsCursor)
+        assert list(cursor.limit_ranges(weights)) == [
+            zfw_cglimits.limit_range(w) for w in weights
+        ]
+
+    def test_contains(self, zfw_cglimits: CGLimits, good_idx: CG, bad_weight_idx: CG):
+        cursor = zfw_cglimits.cursor()
+        assert good_idx in cursor
+        assert bad_weight_idx not in cursor
+
+
+def _limits(fwd, aft) -> CGLimits:
+    return CGLimits(PLFunction(fwd), PLFunction(aft))
+
+
+class TestIntersect:
+    def test_most_restrictive(self):
+        a = _limits([(0, 10), (100, 10)], [(0, 50), (100, 50)])
+        b = _limits([(20, 0), (120, 20)], [(20, 60), (120, 40)])
+        c = a.intersect(b)
+        assert (c.min_weight, c.max_weight) == (20, 100)
+        # fwd lines cross at 70, aft lines at 70 as well
+        assert c.fwd.points == ((20, 10), (70, 10), (100, 16))
+        assert c.aft.points == ((20, 50), (70, 50), (100, 44))
+
+    def test_same_as_checking_each(self, zfw_cglimits: CGLimits):
+        other = _limits(
+            [(14000, 30), (17000, 32), (21000, 25)],
+            [(14000, 60), (18000, 55), (21000, 70)],
+        )
+        margin = _limits([(13000, 31), (19000, 31)], [(13000, 62), (19000, 62)])
+        common = zfw_cglimits.intersect(other, margin)
+        rng = random.Random(0)
+        for _ in range(5000):
+            cg = CG(rng.uniform(20, 70), rng.uniform(13000, 21000))
+            expected = all(cg in lim for lim in (zfw_cglimits, other, margin))
+            assert (cg in common) == expected, cg
+
+    def test_trims_weight_range(self):
+        a = _limits([(0, 0), (100, 0)], [(0, 10), (100, 10)])
+        b = _limits([(0, 0), (100, 20)], [(0, 30), (100, 30)])
+        c = a.intersect(b)
+        assert (c.min_weight, c.max_weight) == (0, 50)
+        assert c.limit_range(25) == (5, 10)
+        assert c.limit_range(50) == (10, 10)
+        assert c.limit_range(60) is None
+
+    @pytest.mark.parametrize(
+        "fwd, aft",
+        [
+            # lines meet at max weight of the result
+            ([(13000, 30), (18250, 60)], [(13000, 60), (18250, 60)]),
+            # lines meet inside weight range
+            ([(13000, 30), (15000, 60), (18250, 30)], [(13000, 60), (18250, 60)]),
+            # lines cross, result is trimmed at computed weight
+            ([(13000, 30), (18250, 61.3)], [(13000, 60), (18250, 59.1)]),
+        ],
+    )
+    def test_result_is_valid_limits(self, fwd, aft):
+        low, high = [(13000, 0), (18250, 0)], [(13000, 100), (18250, 100)]
+        c = _limits(fwd, high).intersect(_limits(low, aft))
+        assert verify_limits(c, count=100).ok
+        calc = WBCalculator(13.2, 280, 50, 2.526, 12.542)
+        mac = limits_idx_to_mac(c, calc)
+        assert limits_mac_to_idx(mac, calc).min_weight == c.min_weight
+        frozen = CGLimitsBuilder.from_cglimits(c).freeze()
+        assert frozen.fwd.points == c.fwd.points
+
+    def test_cut_touching_lines(self):
+        a = _limits([(0, 0), (5, 10), (10, 0)], [(0, 20), (10, 20)])
+        b = _limits([(0, -10), (10, -10)], [(0, 10), (10, 10)])
+        c = a.intersect(b)
+        # lines touch inside weight range, at 5
+        assert c.limit_range(5) == (10, 10)
+        cut = c.cut_weight_range(1, 9)
+        assert (cut.min_weight, cut.max_weight) == (1, 9)
+        assert cut.limit_range(5) == (10, 10)
+        assert cut.limit_range(2) == (4, 10)
+
+    def test_single_weight(self):
+        a = _limits([(0, 0), (100, 0)], [(0, 10), (100, 10)])
+        b = _limits([(100, 5), (200, 5)], [(100, 6), (200, 6)])
+        c = a.intersect(b)
+        assert c.limit_range(100) == (5, 6)
+        assert c.limit_range(100.5) is None
+
+    def test_no_others(self, zfw_cglimits: CGLimits):
+        assert zfw_cglimits.intersect() is zfw_cglimits
+
+    @pytest.mark.parametrize(
+        "other, message",
+        [
+            (
+                _limits([(30000, 0), (40000, 0)], [(30000, 99), (40000, 99)]),
+                "no common weight range",
+            ),
+            (
+                _limits([(0, 70), (30000, 70)], [(0, 80), (30000, 80)]),
+                "no common CG range",
+            ),
+            (
+                _limits(
+                    [(13608, 0), (15000, 60), (17000, 0), (19958, 0)],
+                    [(13608, 99), (15000, 99), (17000, 99), (19958, 99)],
+                ),
+                "not a single weight range",
+            ),
+        ],
+    )
+    def test_empty_raises(self, zfw_cglimits: CGLimits, other, message):
+        with pytest.raises(ValueError, match=message):
+            zfw_cglimits.intersect(other)
@@ -0,0 +1,45 @@
+import json
+
+import pytest
+from wbkit.cglimits import CGLimits
+from wbkit.plfunc import PLFunction
+
+LIBRARY = {
+    "calculators": {
+        "ATR": {"ref_st": 13.2, "c": 280, "k": 50, "macrc": 2.526, "lemac_at": 12.542}
+    },
+    "envelopes": {
+        "ZFW": {
+            "calculator": "ATR",
+            "fwd": [[13608, 34.45], [14515, 33.22], [15190, 30.14], [19958, 22.82]],
+            "aft": [[13608, 57.31], [15422, 58.28], [16329, 63.19], [19958, 66.12]],
+        },
+        "ZFW-MAC": {
+            "calculator": "ATR",
+            "unit": "mac",
+            "fwd": [[13608, 12], [19958, 12]],
+            "aft": [[13608, 35], [19958, 35]],
+        },
+    },
+}
+
+
+@pytest.fixture
+def library_data() -> dict:
+    return json.loads(json.dumps(LIBRARY))
+
+
+@pytest.fixture
+def library_file(tmp_path, library_data) -> str:
+    path = tmp_path / "lib.json"
+    path.write_text(json.dumps(library_data))
+    return str(path)
+
+
+@pytest.fixture
+def zfw_limits() -> CGLimits:
+    envelope = LIBRARY["envelopes"]["ZFW"]
+    return CGLimits(
+        PLFunction([(w, i) for w, i in envelope["fwd"]]),
+        PLFunction([(w, i) for w, i in envelope["aft"]]),
+    )
@@ -0,0 +1,79 @@
+import pytest
+from wbkit.allowable import AllowableLoad, allowable_load, allowable_loads
+from wbkit.basic import WBCalculator
+from wbkit.cglimits import CG, CGLimits
+from wbkit.plfunc import PLFunction
+
+
+@pytest.fixture
+def calc() -> WBCalculator:
+    return WBCalculator(10, 1, 0, 10, 10)
+
+
+@pytest.fixture
+def box() -> CGLimits:
+    return CGLimits(
+        PLFunction([(0, -10), (1000, -10)]),
+        PLFunction([(0, 10), (1000, 10)]),
+    )
+
+
+@pytest.fixture
+def zfw_calc() -> WBCalculator:
+    return WBCalculator(13.2, 280, 50, 2.526, 12.542)
+
+
+class TestAllowableLoad:
+    @pytest.mark.parametrize(
+        "station, expected",
+        [
+            (12, AllowableLoad(5, "aft")),
+            (5, AllowableLoad(2, "fwd")),
+            (10, AllowableLoad(900, "weight")),
+        ],
+    )
+    def test_box(self, calc, box, station, expected):
+        assert allowable_load(CG(0, 100), station, calc, box) == expected
+
+    def test_max_weight(self, calc, box):
+        assert allowable_load(CG(0, 100), 10, calc, box, 500) == (400, "weight")
+
+    def test_on_limit(self, calc, box):
+        assert allowable_load(CG(10, 100), 12, calc, box) == (0, "aft")
+        assert allowable_load(CG(10, 100), 8, calc, box).limit == "fwd"
+
+    def test_sloped_limit(self, calc):
+        limits = CGLimits(
+            PLFunction([(0, -10), (200, -10)]),
+            PLFunction([(0, 10), (100, 10), (200, 0)]),
+        )
+        # aft line: 10 - (w - 100) / 10, path: 0.5 * (w - 100)
+        assert allowable_load(CG(0, 100), 10.5, calc, limits) == pytest.approx(
+            (100 / 6, "aft")
+        )
+
+    @pytest.mark.parametrize("station", [0, 5, 10, 13, 16, 20, 30])
+    def test_against_stepping(self, zfw_calc, zfw_limits, station):
+        cg = CG(40, 14000)
+        result = allowable_load(cg, station, zfw_calc, zfw_limits)
+        step = 0.5
+        added = 0.0
+        while True:
+            w = added + step
+            idx = cg.value + zfw_calc.calc_idx(w, station) - zfw_calc.k
+            if CG(idx, cg.weight + w) not in zfw_limits:
+                break
+            added = w
+        assert result.weight == pytest.approx(added, abs=step)
+
+    def test_vectorized(self, calc, box):
+        results = allowable_loads(CG(0, 100), [12, 5, 10], calc, box)
+        assert results == [(5, "aft"), (2, "fwd"), (900, "weight")]
+
+    def test_out_of_limits_raises(self, calc, box):
+        with pytest.raises(ValueError, match="initial CG is out of limits"):
+            allowable_load(CG(20, 100), 10, calc, box)
+
+    def test_exceeds_max_weight_raises(self, calc, box):
+        with pytest.raises(ValueError, match="initial CG weight exceeds maximum"):
+            allowable_load(CG(0, 100), 10, calc, box, 50)
@@ -84,3 +84,28 @@ class TestReal:
     )
     def test_mac_to_idx(self, calc, idx, weight, mac):
         assert calc.mac_to_idx(mac, weight) == pytest.approx(idx, 1e-3)
+
+
+@pytest.mark.parametrize("calc", [WBCalculator(13.2, 280, 50, 2.526, 12.542)])
+class TestSensitivity:
+    def test_idx_sensitivities(self, calc):
+        stations = [5.0, 13.2, 20.0]
+        result = calc.idx_sensitivities(stations)
+        assert result == [calc.idx_sensitivity(st) for st in stations]
+        # adding weight at reference station does not change index
+        assert result[1] == 0
+        for st, slope in zip(stations, result):
+            delta = calc.calc_idx(1000, st) - calc.calc_idx(0, st)
+            assert slope * 1000 == pytest.approx(delta)
+
+    def test_mac_sensitivities(self, calc):
+        weights = [17841, 21627]
+        result = calc.mac_sensitivities(weights)
+        assert result == [calc.mac_sensitivity(w) for w in weights]
+        for w, slope in zip(weights, result):
+            delta = calc.mac_from_idx(31, w) - calc.mac_from_idx(30, w)
+            assert slope == pytest.approx(delta)
+
+    def test_zero_weight_raises(self, calc):
+        with pytest.raises(ValueError, match="weight must not be equal to 0"):
+            calc.mac_sensitivities([1000, 0])
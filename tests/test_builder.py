@@ -0,0 +1,153 @@
+import random
+
+import pytest
+from wbkit.builder import CGLimitsBuilder, PLFunctionBuilder
+from wbkit.cglimits import CGLimits
+from wbkit.plfunc import PLFunction
+
+
+@pytest.fixture
+def builder() -> PLFunctionBuilder:
+    return PLFunctionBuilder([(2, 20), (3, 30), (-1, 10)])
+
+
+@pytest.fixture
+def limits() -> CGLimits:
+    return CGLimits(
+        PLFunction([(0, 10), (50, 12), (100, 10)]),
+        PLFunction([(0, 30), (40, 25), (100, 30)]),
+    )
+
+
+class TestPLFunctionBuilder:
+    def test_freeze(self, builder: PLFunctionBuilder):
+        line = builder.freeze()
+        assert type(line) is PLFunction
+        assert line.points == PLFunction([(2, 20), (3, 30), (-1, 10)]).points
+        assert (line.min_f, line.max_f) == (10, 30)
+
+    def test_edits(self, builder: PLFunctionBuilder):
+        builder.insert(0, 0)
+        builder.update(3, 35)
+        builder.move(-1, 5, 50)
+        assert builder.delete(2) == 20
+        assert builder.points == ((0, 0), (3, 35), (5, 50))
+        assert (builder.min_x, builder.max_x) == (0, 5)
+        assert (builder.min_f, builder.max_f) == (0, 50)
+        assert builder[4] == pytest.approx(42.5)
+        assert builder.freeze().points == builder.points
+
+    def test_random_edits_match_plfunction(self):
+        rng = random.Random(0)
+        builder = PLFunctionBuilder([(0, 0)])
+        for _ in range(500):
+            x = rng.randrange(100)
+            points = dict(builder.points)
+            if x in points:
+                if rng.random() < 0.5 and len(points) > 1:
+                    builder.delete(x)
+                else:
+                    new_x = rng.randrange(100)
+                    if new_x in points and new_x != x:
+                        continue
+                    builder.move(x, new_x, rng.uniform(-10, 10))
+            else:
+                builder.insert(x, rng.uniform(-10, 10))
+            expected = PLFunction(list(builder.points))
+            assert builder.freeze().points == expected.points
+            assert (builder.min_f, builder.max_f) == (expected.min_f, expected.max_f)
+
+    def test_from_plfunction(self):
+        line = PLFunction([(1, 1), (2, 4)])
+        assert PLFunctionBuilder.from_plfunction(line).freeze().points == line.points
+
+    def test_duplicate_raises(self, builder: PLFunctionBuilder):
+        with pytest.raises(ValueError, match="duplicate x values"):
+            builder.insert(2, 0)
+        with pytest.raises(ValueError, match="duplicate x values"):
+            builder.move(2, 3)
+        assert len(builder) == 3
+
+    def test_missing_raises(self, builder: PLFunctionBuilder):
+        for edit in (builder.delete, lambda x: builder.update(x, 0)):
+            with pytest.raises(KeyError, match="no breakpoint"):
+                edit(2.5)
+        with pytest.raises(KeyError, match="no breakpoint"):
+            builder.move(2.5, 4)
+
+    def test_out_of_range_raises(self, builder: PLFunctionBuilder):
+        with pytest.raises(KeyError):
+            builder[4]
+
+    def test_empty_freeze_raises(self):
+        with pytest.raises(ValueError, match="at least one point"):
+            PLFunctionBuilder().freeze()
+
+    def test_listener(self, builder: PLFunctionBuilder):
+        calls = []
+        builder.subscribe(lambda *args: calls.append(args))
+        builder.insert(2.5, 0)
+        builder.update(3, 0)
+        builder.delete(-1)
+        assert calls == [(2, 3, 2.5, None), (2.5, 3, None, None), (-1, 2, None, -1)]
+
+
+class TestCGLimitsBuilder:
+    def test_freeze(self, limits: CGLimits):
+        builder = CGLimitsBuilder.from_cglimits(limits)
+        assert builder.valid
+        frozen = builder.freeze()
+        assert frozen.fwd.points == limits.fwd.points
+        assert frozen.aft.points == limits.aft.points
+
+    def test_overlap(self, limits: CGLimits):
+        builder = CGLimitsBuilder.from_cglimits(limits)
+        builder.fwd.insert(40, 26)
+        assert not builder.valid
+        assert builder.overlap == (40,)
+        with pytest.raises(ValueError, match="should not overlap"):
+            builder.freeze()
+        builder.fwd.update(40, 20)
+        assert builder.valid
+
+    def test_touching_lines_valid(self, limits: CGLimits):
+        builder = CGLimitsBuilder.from_cglimits(limits)
+        x = limits.aft.xp[1]
+        builder.fwd.insert(x, limits.aft[x])
+        assert builder.valid
+        assert builder.freeze().limit_range(x) == (limits.aft[x], limits.aft[x])
+
+    def test_weight_range(self, limits: CGLimits):
+        builder = CGLimitsBuilder.from_cglimits(limits)
+        builder.fwd.move(100, 110)
+        assert not builder.valid
+        with pytest.raises(ValueError, match="min and max weights should be equal"):
+            builder.freeze()
+        builder.aft.move(100, 110)
+        assert builder.valid
+        assert builder.freeze().max_weight == 110
+
+    def test_random_edits_match_cglimits(self, limits: CGLimits):
+        rng = random.Random(1)
+        builder = CGLimitsBuilder.from_cglimits(limits)
+        states = set()
+        for _ in range(1000):
+            line = builder.fwd if rng.random() < 0.5 else builder.aft
+            points = dict(line.points)
+            x = rng.choice(list(points)) if rng.random() < 0.7 else rng.randrange(101)
+            f = rng.uniform(5, 35)
+            if x not in points:
+                line.insert(x, f)
+            elif rng.random() < 0.2 and len(points) > 2:
+                line.delete(x)
+            else:
+                line.update(x, f)
+            try:
+                CGLimits(builder.fwd.freeze(), builder.aft.freeze())
+            except ValueError:
+                expected = False
+            else:
+                expected = True
+            states.add(expected)
+            assert builder.valid == expected
+        assert states == {True, False}
@@ -0,0 +1,67 @@
+import pytest
+from wbkit.cache import CacheStats, CutCache
+from wbkit.cglimits import CGLimits
+from wbkit.instrument import CACHE_HIT, CACHE_MISS, MetricsCollector, instrumented
+
+
+class TestCutCache:
+    def test_same_as_cut_weight_range(self, zfw_limits: CGLimits):
+        cut = CutCache().cut(zfw_limits, 14000, 19000)
+        expected = zfw_limits.cut_weight_range(14000, 19000)
+        assert cut.fwd.points == expected.fwd.points
+        assert cut.aft.points == expected.aft.points
+
+    def test_hit(self, zfw_limits: CGLimits):
+        cache = CutCache()
+        cut = cache.cut(zfw_limits, 14000, 19000)
+        assert cache.cut(zfw_limits, 14000, 19000) is cut
+        assert cache.stats == CacheStats(1, 1, 0, 1)
+
+    def test_equivalent_bounds_share_entry(self, zfw_limits: CGLimits):
+        cache = CutCache()
+        cut = cache.cut(zfw_limits, None, 19000)
+        assert cache.cut(zfw_limits, 10000, 19000) is cut
+        assert cache.cut(zfw_limits, 13608, 19000) is cut
+        assert cache.cut(zfw_limits) is zfw_limits
+        assert cache.stats.misses == 2
+
+    def test_keyed_by_identity(self, zfw_limits: CGLimits):
+        cache = CutCache()
+        other = CGLimits(zfw_limits.fwd, zfw_limits.aft)
+        assert cache.cut(zfw_limits, 14000) is not cache.cut(other, 14000)
+
+    def test_shares_points(self, zfw_limits: CGLimits):
+        cut = CutCache().cut(zfw_limits, 14000, 19000)
+        assert cut.fwd.points[1] is zfw_limits.fwd.points[1]
+
+    def test_eviction(self, zfw_limits: CGLimits):
+        cache = CutCache(max_size=2)
+        first = cache.cut(zfw_limits, 14000)
+        cache.cut(zfw_limits, 15000)
+        cache.cut(zfw_limits, 14000)
+        cache.cut(zfw_limits, 16000)
+        assert len(cache) == 2
+        assert cache.stats.evictions == 1
+        # 15000 was least recently used
+        assert cache.cut(zfw_limits, 14000) is first
+        assert cache.stats.misses == 3
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.stats.evictions == 3
+
+    def test_events(self, zfw_limits: CGLimits):
+        cache = CutCache()
+        with instrumented(MetricsCollector()) as collector:
+            cache.cut(zfw_limits, 14000)
+            cache.cut(zfw_limits, 14000)
+        events = collector.metrics(zfw_limits).events
+        assert events[CACHE_MISS] == 1
+        assert events[CACHE_HIT] == 1
+
+    def test_invalid_range_raises(self, zfw_limits: CGLimits):
+        with pytest.raises(ValueError, match="incorrect cutting range"):
+            CutCache().cut(zfw_limits, 19000, 14000)
+
+    def test_invalid_size_raises(self):
+        with pytest.raises(ValueError, match="max size must be > 0"):
+            CutCache(max_size=0)
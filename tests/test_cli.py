@@ -0,0 +1,162 @@
+import csv
+import io
+import json
+
+import pytest
+from wbkit.cli import main
+
+RECORDS = [
+    {"flight": "1", "weight": 17841, "index": 29.84, "envelope": "ZFW"},
+    {"flight": "2", "weight": 14500, "index": 33, "envelope": "ZFW"},
+    {"flight": "3", "weight": 20000, "index": 40, "envelope": "ZFW"},
+    {"flight": "4", "weight": 17841, "mac": 13.52, "envelope": "ZFW"},
+    {"flight": "5", "weight": 17841, "mac": 40, "envelope": "ZFW-MAC"},
+    {"flight": "6", "weight": 17841, "index": 30, "envelope": "B737"},
+    {"flight": "7", "weight": "n/a", "index": 30, "envelope": "ZFW"},
+]
+EXPECTED = ["in", "fwd", "weight", "in", "aft", "error", "error"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+class TestCheck:
+    def test_ndjson(self, tmp_path, library_file, workers):
+        src = tmp_path / "in.ndjson"
+        dst = tmp_path / "out.ndjson"
+        src.write_text("".join(json.dumps(r) + "\n" for r in RECORDS))
+        argv = ["check", library_file, str(src), "-o", str(dst), "--chunk-size", "2"]
+        assert main([*argv, "--workers", str(workers)]) == 0
+        out = [json.loads(line) for line in dst.read_text().splitlines()]
+        assert [r["flight"] for r in out] == [r["flight"] for r in RECORDS]
+        assert [r["verdict"] for r in out] == EXPECTED
+        assert out[0]["margin"] > 0
+        assert out[2]["margin"] is None
+
+    def test_csv(self, tmp_path, library_file, workers):
+        src = tmp_path / "in.csv"
+        dst = tmp_path / "out.csv"
+        fields = ["flight", "weight", "index", "mac", "envelope"]
+        with open(src, "w", newline="") as fh:
+            writer = csv.DictWriter(fh, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(RECORDS)
+        argv = ["check", library_file, str(src), "-o", str(dst), "--chunk-size", "3"]
+        assert main([*argv, "--workers", str(workers)]) == 0
+        with open(dst, newline="") as fh:
+            out = list(csv.DictReader(fh))
+        assert list(out[0]) == [*fields, "verdict", "margin"]
+        assert [r["verdict"] for r in out] == EXPECTED
+        assert out[2]["margin"] == ""
+
+
+def test_stdin_stdout(library_file, monkeypatch, capsys):
+    monkeypatch.setattr("sys.stdin", io.StringIO(json.dumps(RECORDS[0]) + "\n"))
+    assert main(["check", library_file, "-f", "ndjson"]) == 0
+    assert json.loads(capsys.readouterr().out)["verdict"] == "in"
+
+
+def _strict_loads(line):
+    def reject(constant):
+        raise ValueError(f"invalid JSON constant {constant}")
+
+    return json.loads(line, parse_constant=reject)
+
+
+def test_bad_records_do_not_abort_run(tmp_path, library_data):
+    library_data["envelopes"]["FERRY"] = {
+        "calculator": "ATR",
+        "unit": "mac",
+        "fwd": [[0, 0], [20000, 0]],
+        "aft": [[0, 40], [20000, 40]],
+    }
+    library = tmp_path / "lib.json"
+    library.write_text(json.dumps(library_data))
+    records = [
+        RECORDS[0],
+        {"flight": "8", "weight": 17841, "index": 30, "envelope": ["ZFW"]},
+        # %MAC can not be calculated at weight 0
+        {"flight": "9", "weight": 0, "index": 40, "envelope": "FERRY"},
+        {"flight": "10", "weight": 17841, "index": 40, "envelope": "FERRY"},
+    ]
+    src = tmp_path / "in.ndjson"
+    dst = tmp_path / "out.ndjson"
+    src.write_text("".join(json.dumps(r) + "\n" for r in records))
+    assert main(["check", str(library), str(src), "-o", str(dst)]) == 0
+    out = [_strict_loads(line) for line in dst.read_text().splitlines()]
+    assert [r["verdict"] for r in out] == ["in", "error", "error", "in"]
+
+
+def test_non_finite_values(tmp_path, library_file):
+    src = tmp_path / "in.ndjson"
+    dst = tmp_path / "out.ndjson"
+    src.write_text(
+        '{"flight": "1", "weight": 17841, "index": NaN, "envelope": "ZFW"}\n'
+        '{"flight": "2", "weight": Infinity, "index": 30, "envelope": "ZFW"}\n'
+        + json.dumps(RECORDS[0])
+        + "\n"
+    )
+    assert main(["check", library_file, str(src), "-o", str(dst)]) == 0
+    out = [_strict_loads(line) for line in dst.read_text().splitlines()]
+    assert [r["verdict"] for r in out] == ["error", "error", "in"]
+    assert out[0]["index"] is None
+    assert out[0]["margin"] is None
+
+
+def test_invalid_json_line(tmp_path, library_file):
+    src = tmp_path / "in.ndjson"
+    dst = tmp_path / "out.ndjson"
+    src.write_text(json.dumps(RECORDS[0]) + "\n{not json\n" + json.dumps(RECORDS[0]))
+    assert main(["check", library_file, str(src), "-o", str(dst)]) == 0
+    out = [json.loads(line) for line in dst.read_text().splitlines()]
+    assert [r["verdict"] for r in out] == ["in", "error", "in"]
+    assert out[1]["record"] == "{not json"
+
+
+def test_non_object_json_line(tmp_path, library_file):
+    src = tmp_path / "in.ndjson"
+    dst = tmp_path / "out.ndjson"
+    src.write_text("[1, 2]\n" + json.dumps(RECORDS[0]) + "\n")
+    assert main(["check", library_file, str(src), "-o", str(dst)]) == 0
+    out = [json.loads(line) for line in dst.read_text().splitlines()]
+    assert [r["verdict"] for r in out] == ["error", "in"]
+    assert out[0]["record"] == [1, 2]
+
+
+def test_csv_row_with_extra_fields(tmp_path, library_file):
+    src = tmp_path / "in.csv"
+    dst = tmp_path / "out.csv"
+    src.write_text(
+        "flight,weight,index,envelope\n"
+        "1,17841,29.84,ZFW\n"
+        "2,17841,29.84,ZFW,extra\n"
+        "3,17841,29.84,ZFW\n"
+    )
+    assert main(["check", library_file, str(src), "-o", str(dst)]) == 0
+    with open(dst, newline="") as fh:
+        out = list(csv.DictReader(fh))
+    assert [r["flight"] for r in out] == ["1", "2", "3"]
+    assert [r["verdict"] for r in out] == ["in", "in", "in"]
+    assert "extra" not in dst.read_text()
+
+
+@pytest.mark.parametrize("option", ["--chunk-size", "--workers"])
+@pytest.mark.parametrize("value", ["0", "-1"])
+def test_non_positive_options(library_file, option, value, capsys):
+    with pytest.raises(SystemExit) as e:
+        main(["check", library_file, option, value])
+    assert e.value.code == 2
+    assert "must be > 0" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize(
+    "option, value, message",
+    [
+        ("--max-batch-size", "0", "must be > 0"),
+        ("--max-wait", "-1", "must be >= 0"),
+        ("--max-wait", "nan", "must be >= 0"),
+    ],
+)
+def test_serve_invalid_options(library_file, option, value, message, capsys):
+    with pytest.raises(SystemExit) as e:
+        main(["serve", library_file, option, value])
+    assert e.value.code == 2
+    assert message in capsys.readouterr().err
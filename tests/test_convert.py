@@ -0,0 +1,100 @@
+import pytest
+from wbkit.basic import WBCalculator
+from wbkit.cglimits import CGLimits
+from wbkit.convert import (
+    limits_idx_to_mac,
+    limits_mac_to_idx,
+    line_idx_to_mac,
+    line_mac_to_idx,
+)
+from wbkit.plfunc import PLFunction
+
+
+@pytest.fixture
+def calc() -> WBCalculator:
+    return WBCalculator(13.2, 280, 50, 2.526, 12.542)
+
+
+@pytest.fixture
+def mac_line() -> PLFunction:
+    return PLFunction([(13608, 15.0), (15190, 12.0), (19958, 8.5), (21500, 8.5)])
+
+
+@pytest.fixture
+def idx_line() -> PLFunction:
+    return PLFunction([(13608, 34.45), (14515, 33.22), (15190, 30.14), (19958, 22.82)])
+
+
+def weights(line: PLFunction, n: int = 2000) -> list[float]:
+    step = (line.max_x - line.min_x) / n
+    return [line.min_x + i * step for i in range(n + 1)]
+
+
+@pytest.mark.parametrize("tol", [1e-1, 1e-3, 1e-5])
+class TestTolerance:
+    def test_mac_to_idx(self, calc, mac_line, tol):
+        idx_line = line_mac_to_idx(mac_line, calc, tol)
+        for w in weights(mac_line):
+            expected = calc.mac_to_idx(mac_line[w], w)
+            assert abs(idx_line[w] - expected) <= tol * 1.0001
+
+    def test_idx_to_mac(self, calc, idx_line, tol):
+        mac_line = line_idx_to_mac(idx_line, calc, tol)
+        for w in weights(idx_line):
+            expected = calc.mac_from_idx(idx_line[w], w)
+            assert abs(mac_line[w] - expected) <= tol * 1.0001
+
+
+class TestBreakpoints:
+    def test_mac_to_idx_keeps_breakpoints(self, calc, mac_line):
+        idx_line = line_mac_to_idx(mac_line, calc)
+        for w, mac in mac_line.points:
+            assert w in idx_line.xp
+            assert idx_line[w] == calc.mac_to_idx(mac, w)
+
+    def test_idx_to_mac_keeps_breakpoints(self, calc, idx_line):
+        mac_line = line_idx_to_mac(idx_line, calc)
+        for w, idx in idx_line.points:
+            assert w in mac_line.xp
+            assert mac_line[w] == calc.mac_from_idx(idx, w)
+
+    def test_constant_mac_is_not_resampled(self, calc):
+        mac_line = PLFunction([(10000, 20.0), (20000, 20.0)])
+        assert line_mac_to_idx(mac_line, calc).xp == mac_line.xp
+
+    def test_tighter_tolerance_adds_points(self, calc, mac_line):
+        coarse = line_mac_to_idx(mac_line, calc, 1e-1)
+        fine = line_mac_to_idx(mac_line, calc, 1e-4)
+        assert len(fine.points) > len(coarse.points)
+
+    def test_single_point(self, calc):
+        line = line_mac_to_idx(PLFunction([(15000, 20.0)]), calc)
+        assert line.points == ((15000, calc.mac_to_idx(20.0, 15000)),)
+
+
+class TestErrors:
+    @pytest.mark.parametrize("tol", [0, -1])
+    def test_bad_tolerance_raises(self, calc, mac_line, tol):
+        with pytest.raises(ValueError, match="tolerance must be > 0"):
+            line_mac_to_idx(mac_line, calc, tol)
+
+    def test_non_positive_weight_raises(self, calc):
+        with pytest.raises(ValueError, match="weights must be > 0"):
+            line_idx_to_mac(PLFunction([(0, 30), (100, 40)]), calc)
+
+
+class TestLimits:
+    def test_round_trip(self, calc, idx_line):
+        aft_line = PLFunction(
+            [(13608, 57.31), (15422, 58.28), (16329, 63.19), (19958, 66.12)]
+        )
+        zfw_cglimits = CGLimits(idx_line, aft_line)
+        mac_limits = limits_idx_to_mac(zfw_cglimits, calc, 1e-6)
+        idx_limits = limits_mac_to_idx(mac_limits, calc, 1e-6)
+        assert idx_limits.min_weight == zfw_cglimits.min_weight
+        assert idx_limits.max_weight == zfw_cglimits.max_weight
+        for w in weights(zfw_cglimits.fwd, 200):
+            fwd, aft = zfw_cglimits.limit_range(w)
+            new_fwd, new_aft = idx_limits.limit_range(w)
+            assert new_fwd == pytest.approx(fwd, abs=1e-4)
+            assert new_aft == pytest.approx(aft, abs=1e-4)
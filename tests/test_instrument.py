@@ -0,0 +1,112 @@
+import pytest
+from wbkit import instrument
+from wbkit.cglimits import CG, CGLimits
+from wbkit.instrument import MetricsCollector, instrumented
+from wbkit.plfunc import PLFunction
+
+
+@pytest.fixture
+def limits() -> CGLimits:
+    return CGLimits(
+        PLFunction([(0, -10), (100, -10)]), PLFunction([(0, 10), (100, 10)])
+    )
+
+
+class RecordingCollector:
+    def __init__(self):
+        self.calls = []
+        self.events = []
+
+    def on_call(self, owner, operation, elapsed_ns):
+        self.calls.append((owner, operation))
+
+    def on_event(self, owner, event):
+        self.events.append((owner, event))
+
+
+class TestInstrumentation:
+    def test_disabled_by_default(self):
+        assert instrument.get_collector() is None
+        assert "wrapper" not in repr(PLFunction.__getitem__)
+
+    def test_counts(self, limits: CGLimits):
+        with instrumented(MetricsCollector()) as collector:
+            limits.limit_range(50)
+            limits.limit_range(500)
+            CG(0, 50) in limits
+            with pytest.raises(KeyError):
+                limits.fwd[-1]
+        fwd = collector.metrics(limits.fwd)
+        assert fwd.calls["get"] == 3
+        assert fwd.calls["__getitem__"] == 1
+        assert fwd.events[instrument.OUT_OF_RANGE] == 2
+        lim = collector.metrics(limits)
+        assert lim.calls["limit_range"] == 3
+        assert lim.calls["__contains__"] == 1
+        assert lim.events[instrument.OUT_OF_RANGE] == 1
+        assert sum(lim.latency["limit_range"]) == 3
+
+    def test_restores_methods(self, limits: CGLimits):
+        original = PLFunction.__getitem__
+        collector = RecordingCollector()
+        with instrumented(collector):
+            assert PLFunction.__getitem__ is not original
+        assert PLFunction.__getitem__ is original
+        assert instrument.get_collector() is None
+        limits.limit_range(50)
+        assert collector.calls == []
+
+    def test_custom_collector(self, limits: CGLimits):
+        collector = RecordingCollector()
+        with instrumented(collector):
+            limits.fwd.defined_f(10)
+        assert collector.calls == [(limits.fwd, "defined_f")]
+
+    def test_out_of_range_any_policy(self, limits: CGLimits):
+        with instrumented(MetricsCollector()) as collector:
+            limits.fwd.get(500, policy="nan")
+            limits.fwd.get(500, default=0.0)
+            limits.fwd.get(500, policy="clamp")
+            limits.fwd.get(500, policy="extrapolate")
+            limits.fwd.get_defined(500, policy="clamp")
+            limits.fwd.get(50, policy="clamp")
+        fwd = collector.metrics(limits.fwd)
+        assert fwd.calls["get"] == 5
+        assert fwd.events[instrument.OUT_OF_RANGE] == 5
+
+    def test_out_of_range_batches(self, limits: CGLimits):
+        with instrumented(MetricsCollector()) as collector:
+            limits.fwd.get_many([-1, 50, 500], policy="clamp")
+            limits.limit_ranges([-1, 50, 500, 600])
+        fwd = collector.metrics(limits.fwd)
+        assert fwd.calls["get_many"] == 1
+        assert fwd.events[instrument.OUT_OF_RANGE] == 2
+        lim = collector.metrics(limits)
+        assert lim.calls["limit_ranges"] == 1
+        assert lim.events[instrument.OUT_OF_RANGE] == 3
+
+    def test_record_event(self, limits: CGLimits):
+        instrument.record_event(limits, instrument.CACHE_HIT)
+        collector = RecordingCollector()
+        with instrumented(collector):
+            instrument.record_event(limits, instrument.CACHE_HIT)
+        assert collector.events == [(limits, instrument.CACHE_HIT)]
+
+    def test_as_dict(self, limits: CGLimits):
+        with instrumented(MetricsCollector()) as collector:
+            limits.limit_range(500)
+        exported = collector.metrics(limits).as_dict()
+        assert exported["calls"] == {"limit_range": 1}
+        assert exported["events"] == {instrument.OUT_OF_RANGE: 1}
+        assert sum(exported["latency_ns"]["limit_range"].values()) == 1
+
+    def test_items_and_reset(self, limits: CGLimits):
+        with instrumented(MetricsCollector()) as collector:
+            limits.limit_range(50)
+        assert {owner for owner, _ in collector.items()} == {
+            limits,
+            limits.fwd,
+            limits.aft,
+        }
+        collector.reset()
+        assert collector.metrics(limits) is None
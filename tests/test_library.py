@@ -0,0 +1,66 @@
+import pytest
+from wbkit.library import Envelope, Verdict, load_library, parse_library
+
+
+@pytest.fixture
+def envelopes(library_data) -> dict[str, Envelope]:
+    return parse_library(library_data)
+
+
+class TestParse:
+    def test_parse(self, envelopes):
+        assert set(envelopes) == {"ZFW", "ZFW-MAC"}
+        zfw = envelopes["ZFW"]
+        assert zfw.unit == "index"
+        assert zfw.calc.c == 280
+        assert zfw.limits.limit_range(13608) == (34.45, 57.31)
+        assert envelopes["ZFW-MAC"].unit == "mac"
+
+    def test_shared_calculator(self, envelopes):
+        assert envelopes["ZFW"].calc is envelopes["ZFW-MAC"].calc
+
+    def test_load(self, library_file):
+        assert set(load_library(library_file)) == {"ZFW", "ZFW-MAC"}
+
+    def test_unknown_calculator_raises(self, library_data):
+        data = {"envelopes": library_data["envelopes"]}
+        with pytest.raises(ValueError, match="unknown calculator 'ATR'"):
+            parse_library(data)
+
+    def test_unknown_unit_raises(self, library_data):
+        library_data["envelopes"]["ZFW"]["unit"] = "inch"
+        with pytest.raises(ValueError, match="unknown unit 'inch'"):
+            parse_library(library_data)
+
+
+class TestCheck:
+    def test_check_index(self, envelopes):
+        verdicts = envelopes["ZFW"].check_many(
+            [29.84, 33, 59, 40], [17841, 14500, 15400, 20000]
+        )
+        assert [v.verdict for v in verdicts] == ["in", "fwd", "aft", "weight"]
+        assert verdicts[0].margin > 0
+        assert verdicts[1].margin < 0
+        assert verdicts[2].margin < 0
+        assert verdicts[3] == Verdict("weight", None)
+
+    def test_check_mac_against_index(self, envelopes):
+        zfw = envelopes["ZFW"]
+        mac = zfw.calc.mac_from_idx(29.84, 17841)
+        (verdict,) = zfw.check_many([mac], [17841], "mac")
+        (expected,) = zfw.check_many([29.84], [17841])
+        assert verdict.verdict == "in"
+        assert verdict.margin == pytest.approx(expected.margin)
+
+    def test_check_index_against_mac(self, envelopes):
+        (verdict,) = envelopes["ZFW-MAC"].check_many([29.84], [17841], "index")
+        assert verdict.verdict == "in"
+        assert verdict.margin == pytest.approx(13.52 - 12, abs=1e-2)
+
+    def test_diff_len_raises(self, envelopes):
+        with pytest.raises(ValueError, match="not of the same length"):
+            envelopes["ZFW"].check_many([1, 2], [1])
+
+    def test_unknown_unit_raises(self, envelopes):
+        with pytest.raises(ValueError, match="unknown unit"):
+            envelopes["ZFW"].check_many([30], [17841], "inch")
@@ -0,0 +1,95 @@
+import math
+import random
+
+import pytest
+from wbkit.cglimits import CG, CGLimits
+from wbkit.occupancy import BOUNDARY, INSIDE, OUTSIDE, OccupancyGrid
+from wbkit.plfunc import PLFunction
+
+
+def _queries(zfw_limits: CGLimits, grid: OccupancyGrid, count: int):
+    rng = random.Random(0)
+    weights = [*grid.weights, *zfw_limits.fwd.xp, *zfw_limits.aft.xp]
+    for _ in range(count):
+        weight = rng.choice(
+            [rng.choice(weights), rng.uniform(13000, 20500), rng.uniform(13608, 19958)]
+        )
+        fwd, aft = zfw_limits.fwd.get(weight, 0), zfw_limits.aft.get(weight, 0)
+        value = rng.choice(
+            [
+                rng.choice(grid.values),
+                rng.uniform(15, 75),
+                fwd,
+                aft,
+                math.nextafter(fwd, 0),
+                math.nextafter(aft, 100),
+            ]
+        )
+        yield value, weight
+
+
+@pytest.mark.parametrize("rows, cols", [(1, 1), (7, 5), (64, 64), (256, 256)])
+def test_same_as_cglimits(zfw_limits: CGLimits, rows, cols):
+    grid = OccupancyGrid(zfw_limits, rows, cols)
+    queries = list(_queries(zfw_limits, grid, 5000))
+    expected = [CG(value, weight) in zfw_limits for value, weight in queries]
+    assert [grid.contains(value, weight) for value, weight in queries] == expected
+    assert grid.contains_many(*zip(*queries)) == expected
+
+
+def test_grid_edges(zfw_limits: CGLimits):
+    grid = OccupancyGrid(zfw_limits, 7, 5)
+    queries = [
+        (value, weight)
+        for weight in (*grid.weights, *(math.nextafter(w, 0) for w in grid.weights))
+        for value in (*grid.values, *(math.nextafter(v, 0) for v in grid.values))
+    ]
+    expected = [CG(value, weight) in zfw_limits for value, weight in queries]
+    assert [grid.contains(value, weight) for value, weight in queries] == expected
+    assert grid.contains_many(*zip(*queries)) == expected
+
+
+def test_cells(zfw_limits: CGLimits):
+    grid = OccupancyGrid(zfw_limits, 64, 64)
+    assert set(grid.cells) == {OUTSIDE, INSIDE, BOUNDARY}
+    assert len(grid.cells) == 64 * 64
+    assert grid.boundary_fraction < 0.2
+    assert grid.state(45, 15000) == INSIDE
+    assert grid.state(23, 19000) == OUTSIDE
+    # outside of the grid
+    assert grid.state(20, 19000) == BOUNDARY
+    assert grid.state(45, 25000) == BOUNDARY
+
+
+def test_contains_many(zfw_limits: CGLimits):
+    grid = OccupancyGrid(zfw_limits)
+    values, weights = [45, 20, 45, 60], [15000, 19000, 25000, 14000]
+    assert grid.contains_many(values, weights) == [
+        CG(v, w) in zfw_limits for v, w in zip(values, weights)
+    ]
+    assert CG(45, 15000) in grid
+    with pytest.raises(ValueError, match="not of the same length"):
+        grid.contains_many([1], [])
+
+
+def test_nan(zfw_limits: CGLimits):
+    grid = OccupancyGrid(zfw_limits)
+    for value, weight in [(math.nan, 15000), (45, math.nan)]:
+        assert grid.contains(value, weight) == (CG(value, weight) in zfw_limits)
+
+
+def test_single_weight():
+    limits = CGLimits._trusted(PLFunction([(100, 5)]), PLFunction([(100, 6)]))
+    grid = OccupancyGrid(limits)
+    assert (grid.rows, grid.cols) == (1, 256)
+    assert grid.contains(5.5, 100)
+    assert not grid.contains(5.5, 101)
+
+
+@pytest.mark.parametrize(
+    "rows, cols, message",
+    [(0, 10, "must be > 0"), (2048, 1024, "exceeds")],
+)
+def test_invalid_raises(zfw_limits: CGLimits, rows, cols, message):
+    with pytest.raises(ValueError, match=message):
+        OccupancyGrid(zfw_limits, rows, cols)
@@ -0,0 +1,129 @@
+from time import monotonic
+
+import pytest
+from wbkit.basic import WBCalculator
+from wbkit.cglimits import CG, CGLimits
+from wbkit.optimize import Position, optimize_load
+from wbkit.plfunc import PLFunction
+
+
+@pytest.fixture
+def calc() -> WBCalculator:
+    return WBCalculator(13.2, 280, 50, 2.526, 12.542)
+
+
+@pytest.fixture
+def base() -> CG:
+    return CG(45, 13000)
+
+
+@pytest.fixture
+def positions() -> list[Position]:
+    return [
+        Position(3.0, 1000),
+        Position(6.0, 1000),
+        Position(20.0, 1000, 1),
+        Position(23.0, 1000, 1),
+    ]
+
+
+@pytest.fixture
+def items() -> list[float]:
+    return [900, 700, 450, 300, 250, 120]
+
+
+def check_plan(plan, base, positions, items, calc):
+    loads = [0.0] * len(positions)
+    counts = [0] * len(positions)
+    for w, p in zip(items, plan.assignment):
+        loads[p] += w
+        counts[p] += 1
+    for pos, load, count in zip(positions, loads, counts):
+        assert load <= pos.max_weight
+        assert pos.max_items is None or count <= pos.max_items
+    idx = base.value + sum(
+        calc.calc_idx(w, positions[p].station) - calc.k
+        for w, p in zip(items, plan.assignment)
+    )
+    assert plan.cg.value == pytest.approx(idx)
+    assert plan.cg.weight == base.weight + sum(items)
+
+
+class TestOptimizeLoad:
+    def test_max_margin(self, base, positions, items, calc, zfw_limits):
+        plan = optimize_load(base, positions, items, calc, zfw_limits, time_budget=0.2)
+        check_plan(plan, base, positions, items, calc)
+        assert plan.cg.in_limits
+        fwd, aft = zfw_limits.limit_range(plan.cg.weight)
+        assert plan.margin == pytest.approx(
+            min(plan.cg.value - fwd, aft - plan.cg.value)
+        )
+        assert plan.margin > 0
+
+    def test_target(self, base, positions, items, calc, zfw_limits):
+        plan = optimize_load(
+            base, positions, items, calc, zfw_limits, target=40, time_budget=0.2
+        )
+        check_plan(plan, base, positions, items, calc)
+        assert plan.cg.value == pytest.approx(40, abs=1)
+
+    def test_workers(self, base, positions, items, calc, zfw_limits):
+        single = optimize_load(
+            base, positions, items, calc, zfw_limits, time_budget=0.1
+        )
+        multi = optimize_load(
+            base, positions, items, calc, zfw_limits, time_budget=0.1, workers=2
+        )
+        check_plan(multi, base, positions, items, calc)
+        assert multi.margin == pytest.approx(single.margin, abs=0.5)
+
+    def test_no_items(self, base, positions, calc, zfw_limits):
+        base = CG(45, 15000)
+        plan = optimize_load(base, positions, [], calc, zfw_limits, time_budget=0.01)
+        assert plan.assignment == ()
+        assert plan.cg.value == 45
+
+    def test_no_positions_raises(self, base, items, calc, zfw_limits):
+        with pytest.raises(ValueError, match="at least one position is required"):
+            optimize_load(base, [], items, calc, zfw_limits)
+
+    def test_weight_out_of_range_raises(self, base, positions, calc, zfw_limits):
+        with pytest.raises(ValueError, match="total weight is out of limits"):
+            optimize_load(base, positions, [9000], calc, zfw_limits)
+
+    def test_not_fitting_raises(self, base, positions, calc, zfw_limits):
+        with pytest.raises(ValueError, match="items do not fit into positions"):
+            optimize_load(
+                base,
+                positions,
+                [600, 600, 600, 600, 600],
+                calc,
+                zfw_limits,
+                time_budget=0.05,
+            )
+
+    def test_not_fitting_returns_early(self, base, positions, calc, zfw_limits):
+        start = monotonic()
+        with pytest.raises(ValueError, match="items do not fit into positions"):
+            optimize_load(base, positions, [1200], calc, zfw_limits, time_budget=10)
+        assert monotonic() - start < 1
+
+    def test_unreachable_target_returns_early(self, base, positions, items, calc):
+        # every item fits into the most aft position, which is optimal
+        positions = [*positions, Position(25.0, 5000)]
+        limits = CGLimits(
+            PLFunction([(13000, -1000), (20000, -1000)]),
+            PLFunction([(13000, 2000), (20000, 2000)]),
+        )
+        start = monotonic()
+        plan = optimize_load(
+            base, positions, items, calc, limits, target=1000, time_budget=10
+        )
+        assert monotonic() - start < 1
+        assert set(plan.assignment) == {4}
+
+    def test_out_of_limits_raises(self, base, positions, items, calc, zfw_limits):
+        # all positions are far forward, CG can not reach forward limit
+        positions = [Position(-20.0, 5000), Position(-25.0, 5000)]
+        with pytest.raises(ValueError, match="no assignment found puts CG in limits"):
+            optimize_load(base, positions, items, calc, zfw_limits, time_budget=0.05)
@@ -1,5 +1,21 @@
+import bisect
+import math
+import pickle
+import random
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
-from wbkit.plfunc import PLFunction, interp
+import wbkit.plfunc
+from wbkit.plfunc import (
+    FrozenPLFunction,
+    NearestTable,
+    PLCursor,
+    PLFunction,
+    PLSurface,
+    SlopeTable,
+    interp,
+)
+from wbkit.verify import edge_inputs
 
 
 @pytest.fixture
@@ -226,3 +242,334 @@ class TestMisc:
     @pytest.mark.parametrize("pl, value", [("pl", -1), ("pl", 3)], indirect=["pl"])
     def test_contains(self, pl, value):
         assert value in pl
+
+
+@pytest.fixture(params=[True, False], ids=["uniform", "bisect"])
+def surface(request) -> PLSurface:
+    # f(x, y) = x + 10 * y is reproduced exactly by bilinear interpolation
+    xp = [0, 1, 2, 3]
+    yp = [0, 0.5, 1]
+    values = [[x + 10 * y for y in yp] for x in xp]
+    return PLSurface(xp, yp, values, uniform=request.param)
+
+
+class TestPLSurface:
+    @pytest.mark.parametrize("x", [0, 0.25, 1, 1.5, 2.999, 3])
+    @pytest.mark.parametrize("y", [0, 0.1, 0.5, 0.75, 1])
+    def test_getitem(self, surface: PLSurface, x, y):
+        assert surface[x, y] == pytest.approx(x + 10 * y)
+
+    def test_bilinear(self):
+        surface = PLSurface([0, 1], [0, 1], [[0, 0], [0, 1]])
+        assert surface[0.5, 0.5] == 0.25
+
+    def test_non_uniform(self):
+        surface = PLSurface([0, 1, 10], [0, 1], [[0, 0], [1, 1], [10, 10]])
+        assert surface[5.5, 0.3] == pytest.approx(5.5)
+
+    @pytest.mark.parametrize("point", [(-1, 0), (4, 0), (0, -1), (0, 2)])
+    def test_getitem_out_of_range_raises(self, surface: PLSurface, point):
+        assert point not in surface
+        with pytest.raises(KeyError, match="should be in range"):
+            surface[point]
+
+    def test_evaluate_many(self, surface: PLSurface):
+        xs = [0, 0.5, 2.5, 3]
+        ys = [1, 0.2, 0.6, 0]
+        expected = [x + 10 * y for x, y in zip(xs, ys)]
+        assert surface.evaluate_many(xs, ys) == pytest.approx(expected)
+
+    def test_evaluate_many_diff_len_raises(self, surface: PLSurface):
+        with pytest.raises(ValueError, match="xs and ys are not of the same length"):
+            surface.evaluate_many([1, 2], [1])
+
+    def test_evaluate_many_out_of_range_raises(self, surface: PLSurface):
+        with pytest.raises(KeyError):
+            surface.evaluate_many([1, 5], [0, 0])
+
+    def test_props(self, surface: PLSurface):
+        assert surface.min_x == 0
+        assert surface.max_x == 3
+        assert surface.min_y == 0
+        assert surface.max_y == 1
+
+    @pytest.mark.parametrize(
+        "xp, yp, values, message",
+        [
+            ([0], [0, 1], [[0, 0]], "at least two points per axis are required"),
+            ([1, 0], [0, 1], [[0, 0], [0, 0]], "grid points must be strictly"),
+            ([0, 1], [0, 0], [[0, 0], [0, 0]], "grid points must be strictly"),
+            ([0, 1], [0, 1], [[0, 0]], "values shape does not match grid"),
+            ([0, 1], [0, 1], [[0, 0], [0]], "values shape does not match grid"),
+        ],
+    )
+    def test_invalid_raises(self, xp, yp, values, message):
+        with pytest.raises(ValueError, match=message):
+            PLSurface(xp, yp, values)
+
+
+class TestFrozen:
+    def test_same_as_plfunction(self, pl: PLFunction):
+        frozen = pl.freeze()
+        assert isinstance(frozen, FrozenPLFunction)
+        assert frozen.points == pl.points
+        assert frozen.xp == pl.xp
+        assert frozen.fp == pl.fp
+        assert (frozen.min_f, frozen.max_f) == (pl.min_f, pl.max_f)
+        assert frozen[2.5] == pl[2.5]
+        assert frozen.defined_f(2.5) == pl.defined_f(2.5)
+
+    def test_precomputed(self):
+        frozen = FrozenPLFunction([(2, 20), (3, 30), (-1, 10)])
+        assert {"points", "xp", "fp", "min_f", "max_f"} <= set(vars(frozen))
+        assert frozen.xp == (-1, 2, 3)
+
+    def test_immutable(self, pl: PLFunction):
+        frozen = pl.freeze()
+        with pytest.raises(AttributeError, match="immutable"):
+            frozen.points = ((0, 0),)
+        with pytest.raises(AttributeError, match="immutable"):
+            del frozen.xp
+        with pytest.raises(AttributeError, match="immutable"):
+            frozen.anything = 1
+
+    def test_freeze_is_idempotent(self, pl: PLFunction):
+        frozen = pl.freeze()
+        assert frozen.freeze() is frozen
+
+    def test_cut_is_frozen(self, pl: PLFunction):
+        cut = pl.freeze().cut(0, 2.5)
+        assert isinstance(cut, FrozenPLFunction)
+        assert cut.xp == (0, 2, 2.5)
+
+    def test_validates(self):
+        with pytest.raises(ValueError, match="duplicate x values are not allowed"):
+            FrozenPLFunction([(1, 10), (1, 20)])
+
+    def test_threads(self):
+        frozen = FrozenPLFunction([(x, x * 10.0) for x in range(1000)])
+        xs = [x / 7 for x in range(6994)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(frozen.__getitem__, xs))
+        assert results == pytest.approx([x * 10 for x in xs])
+
+
+class TestPickle:
+    @pytest.mark.parametrize("cls", [PLFunction, FrozenPLFunction])
+    def test_round_trip(self, cls):
+        pl = cls([(2, 20.5), (3, 30), (-1, 10)])
+        restored = pickle.loads(pickle.dumps(pl))
+        assert type(restored) is cls
+        assert restored.points == pl.points
+        assert (restored.xp, restored.fp) == (pl.xp, pl.fp)
+        assert (restored.min_f, restored.max_f) == (pl.min_f, pl.max_f)
+        assert restored[2.5] == pl[2.5]
+
+    def test_restored_frozen_is_immutable(self, pl: PLFunction):
+        restored = pickle.loads(pickle.dumps(pl.freeze()))
+        with pytest.raises(AttributeError, match="immutable"):
+            restored.points = ((0, 0),)
+
+    def test_cached_values_not_pickled(self):
+        pl = PLFunction([(x, x * 0.1) for x in range(100)])
+        empty = pickle.dumps(pl)
+        pl[50.5], pl.min_f, pl.max_f
+        assert pickle.dumps(pl) == empty
+
+    def test_compact(self):
+        points = [(x * 10.0, x * 0.1) for x in range(1000)]
+        size = len(pickle.dumps(PLFunction(points)))
+        assert size < len(pickle.dumps(points))
+        assert size < 16 * len(points) + 200
+
+
+class TestGet:
+    def test_in_range_same_as_getitem(self, pl: PLFunction, x, expected_interp_x):
+        for policy in ("sentinel", "nan", "clamp", "extrapolate"):
+            assert pl.get(x, policy=policy) == pytest.approx(expected_interp_x)
+
+    @pytest.mark.parametrize(
+        "policy, default, below, above",
+        [
+            ("sentinel", None, None, None),
+            ("sentinel", -1, -1, -1),
+            ("clamp", None, 10, 30),
+            ("extrapolate", None, 6, 40),
+        ],
+    )
+    def test_policies(self, pl: PLFunction, policy, default, below, above):
+        assert pl.get(-2.2, default, policy) == pytest.approx(below)
+        assert pl.get(4, default, policy) == pytest.approx(above)
+
+    def test_nan(self, pl: PLFunction):
+        assert math.isnan(pl.get(-5, policy="nan"))
+        assert math.isnan(pl.get(5, policy="nan"))
+
+    def test_extrapolate_single_point(self):
+        assert PLFunction([(1, 10)]).get(5, policy="extrapolate") == 10
+
+    def test_unknown_policy_raises(self, pl: PLFunction):
+        with pytest.raises(ValueError, match="unknown out of range policy"):
+            pl.get(2, policy="raise")
+        with pytest.raises(ValueError, match="unknown out of range policy"):
+            pl.get_many([2], policy="raise")
+        with pytest.raises(ValueError, match="unknown out of range policy"):
+            pl.get_defined(2, policy="raise")
+
+    def test_get_many(self, pl: PLFunction):
+        xs = [-5, -1, 0.5, 2.5, 3, 5]
+        for policy in ("sentinel", "clamp", "extrapolate"):
+            assert pl.get_many(xs, 0, policy) == [pl.get(x, 0, policy) for x in xs]
+
+    def test_get_defined(self, pl: PLFunction, x, expected_defined_x):
+        assert pl.get_defined(x) == expected_defined_x
+        assert pl.get_defined(0.5) == pl.defined_f(0.5)
+        assert pl.get_defined(-5) is None
+        assert pl.get_defined(-5, policy="clamp") == 10
+        assert pl.get_defined(5, policy="extrapolate") == 30
+
+
+class TestNearestTable:
+    def test_same_as_defined_f(self, pl: PLFunction, x, expected_defined_x):
+        assert NearestTable(pl.points)[x] == expected_defined_x
+
+    def test_matches_defined_f_bit_for_bit(self):
+        rng = random.Random(0)
+        xs = sorted({rng.uniform(0, 1e5) for _ in range(200)} | {0.1, 0.2, 0.3})
+        pl = PLFunction([(x, i) for i, x in enumerate(xs)])
+        table = NearestTable(pl.points)
+        for x in edge_inputs(pl.xp):
+            if x in pl:
+                assert table[x] == pl.defined_f(x), x
+
+    def test_tie_goes_to_upper(self):
+        table = NearestTable([(0, 1), (2, 2)])
+        assert table[1] == 2
+        assert table[math.nextafter(1, 0)] == 1
+
+    def test_out_of_range_raises(self, pl: PLFunction):
+        with pytest.raises(KeyError):
+            NearestTable(pl.points)[5]
+
+    def test_get(self, pl: PLFunction):
+        table = NearestTable(pl.points)
+        assert table.get(2.4) == 20
+        assert table.get(5) is None
+        assert table.get(5, 0) == 0
+        assert math.isnan(table.get(-5, policy="nan"))
+        assert table.get(-5, policy="clamp") == 10
+        assert table.get(5, policy="extrapolate") == 30
+
+    def test_get_many(self, pl: PLFunction):
+        table = NearestTable(pl.points)
+        xs = [-5, -1, 0.5, 0.49, 2.5, 3, 5]
+        for policy in ("sentinel", "clamp", "extrapolate"):
+            assert table.get_many(xs, 0, policy) == [
+                pl.get_defined(x, 0, policy) for x in xs
+            ]
+
+    def test_single_point(self):
+        table = NearestTable([(1, 10)])
+        assert table[1] == 10
+        assert table.get(2, policy="clamp") == 10
+
+    def test_validates(self):
+        with pytest.raises(ValueError, match="duplicate x values are not allowed"):
+            NearestTable([(1, 10), (1, 20)])
+
+
+class TestCursor:
+    @pytest.fixture
+    def line(self) -> PLFunction:
+        return PLFunction([(x, (x * 37) % 11 + x / 3) for x in range(0, 100, 3)])
+
+    @pytest.mark.parametrize(
+        "xs",
+        [
+            [x / 10 for x in range(-20, 1020)],
+            [x / 10 for x in range(1020, -20, -1)],
+            [50, 1, 99, 0, 99, 50.5, 50.5, 2, 3],
+        ],
+        ids=["ascending", "descending", "unordered"],
+    )
+    def test_same_as_get(self, line: PLFunction, xs):
+        cursor = line.cursor()
+        assert isinstance(cursor, PLCursor)
+        assert [cursor.get(x) for x in xs] == [line.get(x) for x in xs]
+        assert list(line.cursor().stream(xs, 0, "clamp")) == line.get_many(
+            xs, 0, "clamp"
+        )
+
+    def test_getitem(self, line: PLFunction):
+        cursor = line.cursor()
+        assert cursor[10.5] == line[10.5]
+        assert cursor[line.max_x] == line[line.max_x]
+        assert cursor[line.min_x] == line[line.min_x]
+        with pytest.raises(KeyError):
+            cursor[-1]
+
+    def test_walks_sorted_stream(self, line: PLFunction, monkeypatch):
+        calls = []
+
+        def counting_bisect_left(*args):
+            calls.append(args)
+            return bisect.bisect_left(*args)
+
+        monkeypatch.setattr(wbkit.plfunc, "bisect_left", counting_bisect_left)
+        list(line.cursor().stream(x / 10 for x in range(1000)))
+        assert calls == []
+        line.cursor().get(90)
+        assert len(calls) == 1
+
+    def test_unknown_policy_raises(self, line: PLFunction):
+        with pytest.raises(ValueError, match="unknown out of range policy"):
+            line.cursor().get(1, policy="raise")
+        with pytest.raises(ValueError, match="unknown out of range policy"):
+            line.cursor().stream([1], policy="raise")
+
+
+class TestDerivative:
+    def test_slopes(self, pl: PLFunction):
+        table = pl.derivative()
+        assert isinstance(table, SlopeTable)
+        assert table.xp == (-1, 2, 3)
+        assert table.slopes == pytest.approx((10 / 3, 10))
+
+    @pytest.mark.parametrize(
+        "x, slope", [(-1, 10 / 3), (0, 10 / 3), (2, 10 / 3), (2.5, 10), (3, 10)]
+    )
+    def test_breakpoint_uses_interp_segment(self, pl: PLFunction, x, slope):
+        assert pl.derivative()[x] == pytest.approx(slope)
+
+    def test_cached(self, pl: PLFunction):
+        assert pl.derivative() is pl.derivative()
+
+    def test_frozen_built_at_construction(self):
+        frozen = FrozenPLFunction([(0, 0), (1, 2)])
+        assert "_slope_table" in vars(frozen)
+        assert "_slope_table" in vars(pickle.loads(pickle.dumps(frozen)))
+        assert frozen.derivative()[0.5] == 2
+
+    def test_single_point_is_constant(self):
+        assert PLFunction([(1, 5)]).derivative()[1] == 0
+
+    def test_out_of_range_raises(self, pl: PLFunction):
+        with pytest.raises(KeyError, match="x should be in range"):
+            pl.derivative()[4]
+
+    @pytest.mark.parametrize(
+        "policy, expected",
+        [
+            ("sentinel", [None, 10, None]),
+            ("nan", [math.nan, 10, math.nan]),
+            ("clamp", [10 / 3, 10, 10]),
+            ("extrapolate", [10 / 3, 10, 10]),
+        ],
+    )
+    def test_get_many(self, pl: PLFunction, policy, expected):
+        result = pl.derivative().get_many([-5, 2.5, 5], policy=policy)
+        assert result == pytest.approx(expected, nan_ok=True)
+
+    def test_unknown_policy_raises(self, pl: PLFunction):
+        with pytest.raises(ValueError, match="unknown out of range policy"):
+            pl.derivative().get_many([0], policy="wrap")
@@ -0,0 +1,92 @@
+import pytest
+from wbkit.basic import WBCalculator
+from wbkit.cglimits import CGLimits
+from wbkit.plfunc import PLFunction
+from wbkit.registry import Aircraft, FleetRegistry
+
+
+def make_aircraft(registration: str) -> Aircraft:
+    # sister ships share constants and envelopes, except "X" which differs
+    k = 60 if registration.startswith("X") else 50
+    return Aircraft(
+        WBCalculator(13.2, 280, k, 2.526, 12.542),
+        {
+            "ZFW": CGLimits(
+                PLFunction([(13608, 34.45), (19958, 22.82)]),
+                PLFunction([(13608, 57.31), (19958, 66.12)]),
+            )
+        },
+    )
+
+
+class Loader:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, registration):
+        self.calls.append(registration)
+        return make_aircraft(registration)
+
+
+@pytest.fixture
+def loader() -> Loader:
+    return Loader()
+
+
+class TestFleetRegistry:
+    def test_lazy_load(self, loader):
+        registry = FleetRegistry(loader)
+        assert loader.calls == []
+        aircraft = registry.get("A")
+        assert registry["A"] is aircraft
+        assert loader.calls == ["A"]
+        assert registry.stats.hits == 1
+        assert registry.stats.misses == 1
+
+    def test_lru_eviction(self, loader):
+        registry = FleetRegistry(loader, max_size=2)
+        registry.get("A")
+        registry.get("B")
+        registry.get("A")
+        registry.get("C")
+        assert "B" not in registry
+        assert "A" in registry and "C" in registry
+        assert len(registry) == 2
+        assert registry.stats.evictions == 1
+        registry.get("B")
+        assert loader.calls == ["A", "B", "C", "B"]
+
+    def test_memory_bound(self, loader):
+        registry = FleetRegistry(loader, max_size=None, max_bytes=1)
+        registry.get("A")
+        registry.get("B")
+        assert len(registry) == 1
+        assert "B" in registry
+        assert registry.stats.bytes > 1
+
+    def test_sister_ships_share(self, loader):
+        registry = FleetRegistry(loader)
+        a, b, x = registry.get("A"), registry.get("B"), registry.get("X")
+        assert a.calc is b.calc
+        assert a.limits["ZFW"] is b.limits["ZFW"]
+        assert x.calc is not a.calc
+        assert x.limits["ZFW"] is a.limits["ZFW"]
+        assert registry.stats.shared == 3
+
+    def test_evict_and_clear(self, loader):
+        registry = FleetRegistry(loader)
+        registry.get("A")
+        registry.get("B")
+        registry.evict("A")
+        registry.evict("missing")
+        assert "A" not in registry
+        registry.clear()
+        assert len(registry) == 0
+        stats = registry.stats
+        assert stats.evictions == 2
+        assert stats.bytes == 0
+
+    @pytest.mark.parametrize("kwargs", [{"max_size": 0}, {"max_bytes": 0}])
+    def test_invalid_raises(self, loader, kwargs):
+        with pytest.raises(ValueError):
+            FleetRegistry(loader, **kwargs)
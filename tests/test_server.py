@@ -0,0 +1,160 @@
+import asyncio
+import json
+
+import pytest
+from wbkit.library import parse_library
+from wbkit.server import CheckService, ServiceStats
+
+
+async def roundtrip(reader, writer, requests):
+    for request in requests:
+        writer.write(json.dumps(request).encode() + b"\n")
+    await writer.drain()
+    writer.write_eof()
+    responses = [json.loads(line) async for line in reader]
+    writer.close()
+    return responses
+
+
+@pytest.fixture
+def envelopes(library_data):
+    return parse_library(library_data)
+
+
+REQUESTS = [
+    {"id": 1, "weight": 17841, "index": 29.84, "envelope": "ZFW"},
+    {"id": 2, "weight": 14500, "index": 33, "envelope": "ZFW"},
+    {"id": 3, "weight": 20000, "index": 40, "envelope": "ZFW"},
+    {"id": 4, "weight": 17841, "mac": 40, "envelope": "ZFW-MAC"},
+    {"id": 5, "weight": 17841, "index": 30, "envelope": "B737"},
+]
+EXPECTED = {1: "in", 2: "fwd", 3: "weight", 4: "aft", 5: "error"}
+
+
+class TestCheckService:
+    def test_check_batches(self, envelopes):
+        async def run():
+            service = CheckService(envelopes, max_batch_size=3, max_wait=0.05)
+            results = await asyncio.gather(*(service.check(r) for r in REQUESTS))
+            await service.close()
+            return service, results
+
+        service, results = asyncio.run(run())
+        assert [r["verdict"] for r in results] == list(EXPECTED.values())
+        assert service.stats.requests == 5
+        assert service.stats.batches == 2
+
+    def test_tcp(self, envelopes):
+        async def run():
+            service = CheckService(envelopes)
+            server = await service.start_tcp()
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            responses = await roundtrip(
+                reader, writer, [*REQUESTS, {"op": "stats"}, "x"]
+            )
+            server.close()
+            await server.wait_closed()
+            await service.close()
+            return responses
+
+        responses = asyncio.run(run())
+        verdicts = {r["id"]: r["verdict"] for r in responses if "id" in r}
+        assert verdicts == EXPECTED
+        assert {"error": "request must be a JSON object"} in responses
+        assert any("requests" in r for r in responses)
+
+    def test_bad_request_in_batch(self, envelopes):
+        async def run():
+            service = CheckService(envelopes, max_wait=0.05)
+            server = await service.start_tcp()
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            bad = {"id": "bad", "weight": 17841, "index": 30, "envelope": ["ZFW"]}
+            responses = await roundtrip(reader, writer, [bad, REQUESTS[0]])
+            server.close()
+            await server.wait_closed()
+            await service.close()
+            return service, responses
+
+        service, responses = asyncio.run(run())
+        verdicts = {r["id"]: r["verdict"] for r in responses}
+        assert verdicts == {"bad": "error", 1: "in"}
+        assert service.stats.batches == 1
+
+    def test_unix(self, envelopes, tmp_path):
+        path = str(tmp_path / "wbkit.sock")
+
+        async def run():
+            service = CheckService(envelopes)
+            server = await service.start_unix(path)
+            reader, writer = await asyncio.open_unix_connection(path)
+            writer.write(b"not json\n")
+            responses = await roundtrip(reader, writer, REQUESTS[:1])
+            server.close()
+            await server.wait_closed()
+            await service.close()
+            return responses
+
+        responses = asyncio.run(run())
+        assert {"error": "invalid JSON"} in responses
+        (checked,) = [r for r in responses if "id" in r]
+        assert checked["verdict"] == "in"
+        assert checked["margin"] > 0
+
+    def test_caps_requests_in_flight(self, envelopes):
+        async def run():
+            service = CheckService(envelopes, max_pending=2)
+            release = asyncio.Event()
+            started = []
+            check = service.check
+
+            async def slow_check(record):
+                started.append(record["id"])
+                await release.wait()
+                return await check(record)
+
+            service.check = slow_check
+            server = await service.start_tcp()
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            for request in REQUESTS:
+                writer.write(json.dumps(request).encode() + b"\n")
+            await writer.drain()
+            await asyncio.sleep(0.05)
+            in_flight = len(started)
+            release.set()
+            responses = await roundtrip(reader, writer, [])
+            server.close()
+            await server.wait_closed()
+            await service.close()
+            return in_flight, responses
+
+        in_flight, responses = asyncio.run(run())
+        assert in_flight == 2
+        assert {r["id"]: r["verdict"] for r in responses} == EXPECTED
+
+    @pytest.mark.parametrize(
+        "kwargs", [{"max_batch_size": 0}, {"max_wait": -1}, {"max_pending": 0}]
+    )
+    def test_invalid_raises(self, envelopes, kwargs):
+        with pytest.raises(ValueError):
+            CheckService(envelopes, **kwargs)
+
+
+class TestServiceStats:
+    def test_empty(self):
+        stats = ServiceStats().as_dict()
+        assert stats["requests"] == 0
+        assert stats["mean_batch_size"] is None
+        assert stats["latency_ms"]["p50"] is None
+
+    def test_batches(self):
+        stats = ServiceStats()
+        stats.add_batch([0.001, 0.002])
+        stats.add_batch([0.003])
+        result = stats.as_dict()
+        assert result["requests"] == 3
+        assert result["mean_batch_size"] == 1.5
+        assert result["latency_ms"]["p50"] == pytest.approx(2)
+        assert result["latency_ms"]["max"] == pytest.approx(3)
@@ -0,0 +1,139 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from wbkit.allowable import allowable_load
+from wbkit.basic import WBCalculator
+from wbkit.cglimits import CG, CGLimits
+from wbkit.library import parse_library
+from wbkit.plfunc import PLFunction
+from wbkit.shm import SharedLibrary, SharedPLFunction
+from wbkit.trajectory import check_path, fuel_trajectory
+
+
+@pytest.fixture
+def envelopes(library_data):
+    return parse_library(library_data)
+
+
+@pytest.fixture
+def published(envelopes):
+    library = SharedLibrary.publish(envelopes)
+    yield library
+    library.close()
+
+
+def _check_in_worker(name: str) -> tuple:
+    library = SharedLibrary.attach(name)
+    try:
+        zfw = library.envelopes["ZFW"].limits
+        return zfw.limit_range(17841), CG(29.84, 17841) in zfw
+    finally:
+        library.close()
+
+
+class TestSharedLibrary:
+    def test_same_results(self, envelopes, published):
+        for name, env in envelopes.items():
+            shared = published.envelopes[name]
+            assert shared.unit == env.unit
+            assert vars(shared.calc) == vars(env.calc)
+            for w in [13000, 13608, 14000, 15190, 17841, 19958]:
+                assert shared.limits.limit_range(w) == env.limits.limit_range(w)
+
+    def test_lines_are_views(self, published):
+        fwd = published.envelopes["ZFW"].limits.fwd
+        assert isinstance(fwd, SharedPLFunction)
+        assert isinstance(fwd.xp, memoryview)
+        assert fwd.xp.readonly
+        assert fwd.points[0] == (13608, 34.45)
+        assert fwd.min_f == 22.82
+        assert fwd.cut(14000, 15000).min_x == 14000
+        with pytest.raises(AttributeError):
+            fwd.points = ((0, 0),)
+
+    def test_pickle_copies_line(self, published):
+        fwd = published.envelopes["ZFW"].limits.fwd
+        restored = pickle.loads(pickle.dumps(fwd))
+        assert type(restored) is PLFunction
+        assert restored.points == fwd.points
+
+    def test_calculator_shared(self, published):
+        envs = published.envelopes
+        assert envs["ZFW"].calc is envs["ZFW-MAC"].calc
+
+    def test_attach(self, published):
+        attached = SharedLibrary.attach(published.name)
+        try:
+            limits = attached.envelopes["ZFW"].limits
+            assert limits.limit_range(13608) == (34.45, 57.31)
+        finally:
+            attached.close()
+
+    def test_worker_process(self, published):
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            limit_range, in_limits = pool.submit(
+                _check_in_worker, published.name
+            ).result()
+        assert limit_range == published.envelopes["ZFW"].limits.limit_range(17841)
+        assert in_limits
+
+    def test_close(self, envelopes):
+        library = SharedLibrary.publish(envelopes)
+        fwd = library.envelopes["ZFW"].limits.fwd
+        with library:
+            pass
+        assert library.envelopes == {}
+        with pytest.raises(ValueError):
+            fwd[15000]
+        with pytest.raises(FileNotFoundError):
+            SharedLibrary.attach(library.name)
+
+    def test_shared_line_stored_once(self, envelopes):
+        envelopes["COPY"] = envelopes["ZFW"]
+        with SharedLibrary.publish(envelopes) as library:
+            assert (
+                library.envelopes["COPY"].limits.fwd
+                is library.envelopes["ZFW"].limits.fwd
+            )
+
+
+class TestSharedLines:
+    """Shared lines stand in for PLFunction in library entry points."""
+
+    @pytest.fixture
+    def shared(self, published):
+        return published.envelopes["ZFW"].limits
+
+    @pytest.fixture
+    def regular(self, envelopes):
+        return envelopes["ZFW"].limits
+
+    def test_cglimits(self, shared, regular):
+        limits = CGLimits(shared.fwd, shared.aft)
+        assert limits.limit_range(17841) == regular.limit_range(17841)
+        assert shared.fwd.intersects(shared.aft) is False
+
+    def test_intersect(self, shared, regular):
+        other = CGLimits(
+            PLFunction([(14000, 30), (19000, 30)]),
+            PLFunction([(14000, 60), (19000, 60)]),
+        )
+        result = shared.intersect(other)
+        expected = regular.intersect(other)
+        assert result.fwd.points == expected.fwd.points
+        assert result.aft.points == expected.aft.points
+
+    @pytest.fixture
+    def calc(self):
+        return WBCalculator(13.2, 280, 50, 2.526, 12.542)
+
+    def test_check_path(self, shared, regular, calc):
+        fuel_index = PLFunction([(0, 0), (4000, -4)])
+        path = list(fuel_trajectory(CG(40, 19000), 4000, fuel_index, calc))
+        assert check_path(path, shared) == check_path(path, regular)
+
+    def test_allowable_load(self, shared, regular, calc):
+        cg = CG(40, 15000)
+        expected = allowable_load(cg, 20, calc, regular)
+        assert allowable_load(cg, 20, calc, shared) == expected
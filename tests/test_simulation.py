@@ -0,0 +1,135 @@
+import pytest
+from wbkit.basic import WBCalculator
+from wbkit.cglimits import CG, CGLimits
+from wbkit.plfunc import PLFunction
+from wbkit.simulation import SimulationStats, simulate, simulate_iter
+
+
+@pytest.fixture
+def calc() -> WBCalculator:
+    return WBCalculator(10, 1, 0, 10, 10)
+
+
+@pytest.fixture
+def limits() -> CGLimits:
+    return CGLimits(
+        PLFunction([(1000, -100), (2000, -100)]),
+        PLFunction([(1000, 100), (2000, 100)]),
+    )
+
+
+@pytest.fixture
+def base() -> CG:
+    return CG(0, 1000)
+
+
+class TestSimulate:
+    def test_half_exceed_aft(self, base, calc, limits):
+        # one passenger of 100 on either a neutral seat or 2 units aft
+        stats = simulate(base, [10, 12], 1, 100, calc, limits, 10_000, chunk_size=999)
+        assert stats.trials == 10_000
+        assert stats.exceeds_fwd == 0
+        assert stats.out_of_weight_range == 0
+        assert stats.in_limits + stats.exceeds_aft == stats.trials
+        assert stats.exceedance_probability == pytest.approx(0.5, abs=0.03)
+
+    def test_all_seats_taken(self, base, calc, limits):
+        stats = simulate(base, [9, 10, 11], 3, 50, calc, limits, 100)
+        assert stats.in_limits == 100
+        assert sum(stats.histogram) == 100
+
+    def test_weight_sd(self, base, calc, limits):
+        stats = simulate(base, [8, 12], 2, 80, calc, limits, 1000, weight_sd=30)
+        assert stats.in_limits + stats.exceeds_fwd + stats.exceeds_aft == 1000
+        assert 0 < stats.exceedance_probability < 1
+
+    def test_out_of_weight_range(self, base, calc, limits):
+        stats = simulate(base, [10] * 20, 20, 100, calc, limits, 10)
+        assert stats.out_of_weight_range == 10
+        assert stats.exceedance_probability == 1
+
+    def test_deterministic_across_workers(self, base, calc, limits):
+        args = (base, [5, 9, 12, 15], 2, 80, calc, limits, 2000)
+        single = simulate(*args, weight_sd=10, chunk_size=500, seed=7)
+        multi = simulate(*args, weight_sd=10, chunk_size=500, seed=7, workers=2)
+        assert single.histogram == multi.histogram
+        assert single.in_limits == multi.in_limits
+
+    def test_empty_seats_sampled(self, base, calc, limits):
+        # one of four seats stays empty, aft seat is taken 3 times out of 4
+        stats = simulate(base, [10, 10, 10, 12], 3, 100, calc, limits, 10_000)
+        assert stats.exceedance_probability == pytest.approx(0.75, abs=0.03)
+
+    def test_weight_distribution(self, base, calc, limits):
+        # index is 2 * weight, aft limit exceeded for weight > mean + sd
+        stats = simulate(base, [12], 1, 40, calc, limits, 20_000, weight_sd=10)
+        assert stats.exceeds_aft / stats.trials == pytest.approx(0.1587, abs=0.01)
+
+    def test_no_trials(self, base, calc, limits):
+        stats = simulate(base, [10], 1, 100, calc, limits, 0)
+        assert stats.trials == 0
+
+    def test_iter_streams_chunks(self, base, calc, limits):
+        results = list(
+            simulate_iter(base, [10, 12], 1, 100, calc, limits, 250, chunk_size=100)
+        )
+        assert [s.trials for s in results] == [100, 200, 250]
+
+    def test_too_many_passengers_raises(self, base, calc, limits):
+        with pytest.raises(ValueError, match="more passengers than seats"):
+            simulate(base, [10], 2, 100, calc, limits, 1)
+
+    def test_bad_chunk_size_raises(self, base, calc, limits):
+        with pytest.raises(ValueError, match="chunk size must be > 0"):
+            simulate(base, [10], 1, 100, calc, limits, 1, chunk_size=0)
+
+
+class TestSimulationStats:
+    def test_histogram(self):
+        stats = SimulationStats(0, 10, 5)
+        for value in [-1, 0, 1.9, 2, 9.99, 10, 11]:
+            stats.add(value, (0, 10))
+        assert stats.histogram == [2, 1, 0, 0, 2]
+        assert stats.underflow == 1
+        assert stats.overflow == 1
+        assert stats.bin_edges == (0, 2, 4, 6, 8, 10)
+
+    def test_counts(self):
+        stats = SimulationStats(0, 10, 5)
+        stats.add(-1, (0, 10))
+        stats.add(11, (0, 10))
+        stats.add(5, None)
+        stats.add(5, (0, 10))
+        assert stats.exceeds_fwd == 1
+        assert stats.exceeds_aft == 1
+        assert stats.out_of_weight_range == 1
+        assert stats.in_limits == 1
+        assert stats.exceedance_probability == 0.75
+
+    def test_add_many_same_as_add(self):
+        values = [-1, 0, 1.9, 2, 5, 9.99, 10, 11, 5]
+        ranges = [(0, 10)] * 8 + [None]
+        one, many = SimulationStats(0, 10, 5), SimulationStats(0, 10, 5)
+        for value, limit_range in zip(values, ranges):
+            one.add(value, limit_range)
+        many.add_many(values, ranges)
+        assert vars(many) == vars(one)
+
+    def test_empty_probability(self):
+        assert SimulationStats(0, 1, 1).exceedance_probability == 0
+
+    def test_merge(self):
+        a, b = SimulationStats(0, 10, 5), SimulationStats(0, 10, 5)
+        a.add(1, (0, 10))
+        b.add(3, (0, 10))
+        assert a.merge(b).histogram == [1, 1, 0, 0, 0]
+        assert a.trials == 2
+
+    def test_merge_different_layout_raises(self):
+        with pytest.raises(ValueError, match="histogram layouts differ"):
+            SimulationStats(0, 10, 5).merge(SimulationStats(0, 10, 4))
+
+    @pytest.mark.parametrize("hist_min, hist_max, bins", [(1, 1, 5), (0, 1, 0)])
+    def test_invalid_raises(self, hist_min, hist_max, bins):
+        with pytest.raises(ValueError):
+            SimulationStats(hist_min, hist_max, bins)
@@ -0,0 +1,100 @@
+import pytest
+from wbkit.basic import WBCalculator
+from wbkit.cglimits import CG, CGLimits
+from wbkit.plfunc import PLFunction
+from wbkit.trajectory import Exceedance, TrajectoryPoint, check_path, fuel_trajectory
+
+
+@pytest.fixture
+def calc() -> WBCalculator:
+    return WBCalculator(13.2, 280, 50, 2.526, 12.542)
+
+
+@pytest.fixture
+def fuel_index() -> PLFunction:
+    # wing tanks first, then center tank
+    return PLFunction([(0, 0), (2000, -4), (4000, -6), (6000, 2)])
+
+
+@pytest.fixture
+def limits() -> CGLimits:
+    return CGLimits(
+        PLFunction([(10000, 30), (15000, 32), (20000, 36)]),
+        PLFunction([(10000, 70), (15000, 66), (20000, 60)]),
+    )
+
+
+class TestFuelTrajectory:
+    def test_points(self, calc, fuel_index):
+        path = list(fuel_trajectory(CG(50, 18000), 5000, fuel_index, calc, 500))
+        assert [p.fuel for p in path] == [5000, 4000, 2000, 500]
+        assert [p.weight for p in path] == [18000, 17000, 15000, 13500]
+        # index at 5000 kg of fuel is -2, dry index is 52
+        assert [p.idx for p in path] == pytest.approx([50, 46, 48, 51])
+        for p in path:
+            assert p.mac == pytest.approx(calc.mac_from_idx(p.idx, p.weight))
+
+    def test_landing_fuel_at_breakpoint(self, calc, fuel_index):
+        path = fuel_trajectory(CG(50, 18000), 4000, fuel_index, calc, 2000)
+        assert [p.fuel for p in path] == [4000, 2000]
+
+    def test_no_burn(self, calc, fuel_index):
+        path = list(fuel_trajectory(CG(50, 18000), 3000, fuel_index, calc, 3000))
+        assert len(path) == 1
+
+    def test_is_lazy(self, calc):
+        fuel_index = PLFunction([(x, x / 1000) for x in range(0, 100_001, 10)])
+        path = fuel_trajectory(CG(50, 200_000), 100_000, fuel_index, calc)
+        assert next(path).fuel == 100_000
+        assert next(path).fuel == 99_990
+
+    @pytest.mark.parametrize(
+        "takeoff, takeoff_fuel, landing_fuel, message",
+        [
+            (CG(50, 18000), 7000, 0, "fuel should be in range"),
+            (CG(50, 18000), 3000, -1, "fuel should be in range"),
+            (CG(50, 18000), 3000, 4000, "must not exceed takeoff fuel"),
+            (CG(50, 2000), 3000, 0, "must not exceed takeoff weight"),
+        ],
+    )
+    def test_invalid_raises(
+        self, calc, fuel_index, takeoff, takeoff_fuel, landing_fuel, message
+    ):
+        with pytest.raises(ValueError, match=message):
+            fuel_trajectory(takeoff, takeoff_fuel, fuel_index, calc, landing_fuel)
+
+
+class TestCheckPath:
+    def test_in_limits(self, calc, fuel_index, limits):
+        path = fuel_trajectory(CG(50, 18000), 5000, fuel_index, calc, 500)
+        assert check_path(path, limits) is None
+
+    def test_exceeds_at_point(self, calc, fuel_index, limits):
+        path = fuel_trajectory(CG(36, 18000), 5000, fuel_index, calc, 500)
+        assert check_path(path, limits) == Exceedance(17000, pytest.approx(32), "fwd")
+
+    def test_exceeds_between_points(self, calc, limits):
+        # straight path from (20000, 59) to (10000, 69) is in limits at both
+        # ends, but passes aft limit breakpoint at 15000 with index 64
+        limits = CGLimits(
+            limits.fwd, PLFunction([(10000, 70), (15000, 63), (20000, 60)])
+        )
+        fuel_index = PLFunction([(0, 0), (10000, -10)])
+        path = fuel_trajectory(CG(59, 20000), 10000, fuel_index, calc)
+        found = check_path(path, limits)
+        assert found == Exceedance(15000, pytest.approx(64), "aft")
+
+    def test_weight_out_of_range(self, calc, fuel_index, limits):
+        path = fuel_trajectory(CG(50, 12000), 5000, fuel_index, calc)
+        found = check_path(path, limits)
+        assert found is not None
+        assert found.limit == "weight"
+        assert found.weight == 9000
+
+    def test_stops_at_first_exceedance(self, limits):
+        def path():
+            yield from [(20000, 50), (15000, 20)]
+            raise AssertionError("path consumed after exceedance")
+
+        points = (TrajectoryPoint(0, w, i, 0) for w, i in path())
+        assert check_path(points, limits).limit == "fwd"
@@ -0,0 +1,143 @@
+import math
+
+import pytest
+from wbkit.cglimits import CGLimits
+from wbkit.plfunc import FrozenPLFunction, PLFunction, PLSurface
+from wbkit.verify import (
+    SampledCheck,
+    compare,
+    edge_inputs,
+    ulp_distance,
+    verify_limits,
+    verify_line,
+)
+
+
+@pytest.fixture
+def line() -> PLFunction:
+    return PLFunction([(13608, 34.45), (14515, 33.22), (15190, 30.14), (19958, 22.82)])
+
+
+@pytest.fixture
+def limits(line) -> CGLimits:
+    return CGLimits(line, PLFunction([(13608, 57.31), (16329, 63.19), (19958, 66.12)]))
+
+
+def test_ulp_distance():
+    assert ulp_distance(1.0, 1.0) == 0
+    assert ulp_distance(1.0, math.nextafter(1.0, 2)) == 1
+    assert ulp_distance(0.0, -0.0) == 0
+    assert ulp_distance(-5e-324, 5e-324) == 2
+
+
+def test_edge_inputs():
+    inputs = edge_inputs([0, 2])
+    assert {0, 1, 2, -2, 4} <= set(inputs)
+    assert math.nextafter(1, 0) in inputs
+    assert math.nextafter(2, 3) in inputs
+    assert inputs == sorted(inputs)
+
+
+class TestCompare:
+    def test_same(self, line):
+        report = verify_line(line, count=100)
+        assert report.ok
+        assert report.checked > 100
+        assert report.max_ulp_diff == 0
+        assert report.first_mismatch is None
+
+    @pytest.mark.parametrize("defined", [False, True])
+    def test_frozen(self, line, defined):
+        assert verify_line(line.freeze(), defined=defined).ok
+
+    def test_defined_tie_breaking(self, line):
+        # rounding down at the exact midpoint must be caught
+        def defined_f(x):
+            pos = min(range(len(line.xp)), key=lambda i: abs(line.xp[i] - x))
+            if x not in line:
+                raise ValueError
+            return line.fp[pos]
+
+        report = verify_line(line, defined_f, defined=True, count=0)
+        assert not report.ok
+        assert report.first_mismatch.x == (13608 + 14515) / 2
+
+    def test_ulp_difference(self, line):
+        report = verify_line(line, lambda x: math.nextafter(line[x], 0), count=10)
+        assert not report.ok
+        assert report.max_ulp_diff == 1
+        assert report.max_abs_diff > 0
+        assert verify_line(
+            line, lambda x: math.nextafter(line[x], 0), count=10, max_ulps=1
+        ).ok
+
+    def test_exception_mismatch(self, line):
+        def clamped(x):
+            return line[min(max(x, line.min_x), line.max_x)]
+
+        report = verify_line(line, clamped, count=0)
+        assert report.mismatches == 4
+        mismatch = report.first_mismatch
+        assert mismatch.x < line.min_x
+        assert isinstance(mismatch.expected.error, KeyError)
+        assert mismatch.actual.value == 34.45
+
+    def test_nan_matches_nan(self):
+        assert compare(lambda x: math.nan, [1, 2], lambda x: math.nan).ok
+        assert not compare(lambda x: math.nan, [1, 2], lambda x: 0.0).ok
+
+    def test_batch(self, limits):
+        assert verify_limits(limits).ok
+        assert verify_limits(limits, candidate=limits.limit_range).ok
+        report = verify_limits(limits, candidate_many=lambda ws: [None] * len(ws))
+        assert not report.ok
+
+    def test_surface(self):
+        surface = PLSurface([0, 1, 2], [0, 10], [[0, 1], [2, 3], [4, 6]])
+        points = [(x / 4, y) for x in range(-1, 10) for y in (0, 2.5, 10)]
+        report = compare(
+            surface.__getitem__,
+            [p for p in points if p in surface],
+            candidate_many=lambda ps: surface.evaluate_many(*zip(*ps)),
+        )
+        assert report.ok
+
+    def test_requires_one_candidate(self, line):
+        with pytest.raises(ValueError, match="exactly one"):
+            compare(line.__getitem__, [1])
+        with pytest.raises(ValueError, match="exactly one"):
+            compare(line.__getitem__, [1], line.__getitem__, line.__getitem__)
+
+    def test_batch_wrong_length_raises(self, line):
+        with pytest.raises(ValueError, match="wrong number"):
+            compare(line.__getitem__, [1, 2], candidate_many=lambda xs: [1])
+
+
+class TestSampledCheck:
+    def test_returns_candidate_results(self, line):
+        frozen = FrozenPLFunction(line.points)
+        check = SampledCheck(frozen.__getitem__, line.__getitem__, rate=0.5, seed=1)
+        assert [check(x) for x in (14000, 15000)] == [line[14000], line[15000]]
+        with pytest.raises(KeyError):
+            check.rate = 1
+            check(0)
+        assert check.report.ok
+
+    def test_reports_mismatches(self, line):
+        found = []
+        check = SampledCheck(
+            lambda x: line[x] + 1, line.__getitem__, rate=1, on_mismatch=found.append
+        )
+        check(14000)
+        assert check.report.mismatches == 1
+        assert found == [check.report.first_mismatch]
+
+    def test_sampling_rate(self, line):
+        check = SampledCheck(line.__getitem__, line.__getitem__, rate=0.1, seed=0)
+        for _ in range(1000):
+            check(15000)
+        assert 50 < check.report.checked < 150
+
+    def test_invalid_rate_raises(self, line):
+        with pytest.raises(ValueError, match="rate must be within"):
+            SampledCheck(line.__getitem__, line.__getitem__, rate=2)